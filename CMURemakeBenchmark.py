@@ -0,0 +1,221 @@
+import argparse
+import gc
+import json
+import os
+import random
+import time
+import tracemalloc
+
+# The module creates a window on import, which must not be a real one while benchmarking
+os.environ.setdefault('CMU_HEADLESS', '1')
+
+from CMURemakeSource import (App, DrawScheduler, HeadlessBackend, Rect, Circle, Polygon, Text, Line,
+                             CircleArray, RectArray, TileGrid)
+
+"""d
+Standard rendering benchmarks for the library. Every benchmark builds a scene on the headless backend, then drives
+App's update loop for a number of frames and reports the frame rate, the draw calls per frame and the cost per shape.
+
+Run with: python CMURemakeBenchmark.py [--frames 30] [--sizes 1000 10000 100000] [--shapes Rect Circle] [--json results.json]
+Add --memory to measure the bytes used per shape with tracemalloc instead.
+"""
+
+def _rects(count):
+    shapes = [Rect(random.uniform(0, 490), random.uniform(0, 490), 10, 10) for _ in range(count)]
+    def mover():
+        for shape in shapes:
+            shape.startX = (shape.startX + 1) % 490
+    return shapes, mover
+
+def _circles(count):
+    shapes = [Circle(random.uniform(0, 500), random.uniform(0, 500), 5) for _ in range(count)]
+    def mover():
+        for shape in shapes:
+            shape.centerX = (shape.centerX + 1) % 500
+    return shapes, mover
+
+def _polygons(count):
+    shapes = []
+    for _ in range(count):
+        x, y = random.uniform(0, 490), random.uniform(0, 490)
+        shapes.append(Polygon((x, y), (x + 10, y), (x + 5, y + 10)))
+    def mover():
+        for shape in shapes:
+            shape.centerX = (shape.centerX + 1) % 500
+    return shapes, mover
+
+def _texts(count):
+    shapes = [Text('text', random.uniform(0, 500), random.uniform(0, 500), 12) for _ in range(count)]
+    def mover():
+        for shape in shapes:
+            shape.centerX = (shape.centerX + 1) % 500
+    return shapes, mover
+
+def _lines(count):
+    shapes = []
+    for _ in range(count):
+        x, y = random.uniform(0, 490), random.uniform(0, 490)
+        shapes.append(Line(x, y, x + 10, y + 10, 1))
+    def mover():
+        for shape in shapes:
+            shape.startX = (shape.startX + 1) % 500
+    return shapes, mover
+
+def _circleArray(count):
+    shapes = CircleArray(count, radius=5)
+    shapes.x = [random.uniform(0, 500) for _ in range(count)]
+    shapes.y = [random.uniform(0, 500) for _ in range(count)]
+    def mover():
+        shapes.move(1, 0)
+    return [shapes], mover
+
+def _rectArray(count):
+    shapes = RectArray(count, width=10, height=10)
+    shapes.x = [random.uniform(0, 490) for _ in range(count)]
+    shapes.y = [random.uniform(0, 490) for _ in range(count)]
+    def mover():
+        shapes.move(1, 0)
+    return [shapes], mover
+
+def _tileGrid(count):
+    side = max(1, int(count ** 0.5))
+    grid = TileGrid(side, side, 500 / side)
+    colors = ['red', 'green', 'blue']
+    for row in range(side):
+        grid.fillCells(0, row, random.randrange(side), 1, random.choice(colors))
+    column = [0]
+    def mover():
+        grid.fillCells(column[0], 0, 1, side, random.choice(colors))
+        column[0] = (column[0] + 1) % side
+    return [grid], mover
+
+"""d
+The scenes that can be benchmarked. Each entry maps a shape type to a function taking in the number of shapes and
+returning the created shapes along with a function that moves all of them once.
+"""
+SCENES = {
+    'Rect': _rects,
+    'Circle': _circles,
+    'Polygon': _polygons,
+    'Text': _texts,
+    'Line': _lines,
+    'CircleArray': _circleArray,
+    'RectArray': _rectArray,
+    'TileGrid': _tileGrid,
+}
+
+"""d
+Runs a single benchmark.
+:param shapeType :- The name of the scene to build, one of the keys of SCENES :- string
+:param count :- The number of shapes in the scene :- int
+:param frames :- The number of frames to draw :- int
+:param moving=True :- [Optional] Whether or not every shape is moved every frame :- bool
+:return The results of the benchmark :- dict
+"""
+def run(shapeType, count, frames, moving=True):
+    DrawScheduler.clear()
+    frame = App.initialize(HeadlessBackend)
+    shapes, mover = SCENES[shapeType](count)
+    App.onUpdate(mover if moving else (lambda : 1 + 1))
+
+    frame.step()
+    calls = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        calls += frame.step().frameCalls
+    elapsed = time.perf_counter() - start
+
+    App.onUpdate(lambda : 1 + 1)
+    del shapes
+    DrawScheduler.clear()
+    return {
+        'shape': shapeType,
+        'count': count,
+        'moving': moving,
+        'frames': frames,
+        'seconds': elapsed,
+        'fps': frames / elapsed if elapsed else float('inf'),
+        'drawCallsPerFrame': calls / frames,
+        'microsecondsPerShape': elapsed * 1e6 / (frames * count),
+    }
+
+"""d
+Runs every combination of the provided scenes and sizes, both with every shape moving and with a static scene.
+:param shapeTypes :- The names of the scenes to build :- list[string]
+:param sizes :- The numbers of shapes to benchmark :- list[int]
+:param frames :- The number of frames to draw per benchmark :- int
+:return The results of every benchmark :- list[dict]
+"""
+def suite(shapeTypes, sizes, frames):
+    results = []
+    for shapeType in shapeTypes:
+        for count in sizes:
+            for moving in (True, False):
+                result = run(shapeType, count, frames, moving)
+                results.append(result)
+                print(f"{shapeType:>12} {count:>7} {'moving' if moving else 'static':>7} "
+                      f"{result['fps']:>10.1f} fps {result['drawCallsPerFrame']:>10.0f} calls/frame "
+                      f"{result['microsecondsPerShape']:>8.3f} us/shape")
+    return results
+
+"""d
+Measures how much memory a scene uses with tracemalloc, including everything the library keeps per shape such as draw order and spatial index entries.
+:param shapeType :- The name of the scene to build, one of the keys of SCENES :- string
+:param count=100000 :- [Optional] The number of shapes in the scene :- int
+:return The results of the benchmark, with the bytes per shape after creating the scene and after drawing it once :- dict
+"""
+def memory(shapeType, count=100000):
+    DrawScheduler.clear()
+    frame = App.initialize(HeadlessBackend)
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    shapes, mover = SCENES[shapeType](count)
+    created = tracemalloc.get_traced_memory()[0]
+    frame.step()
+    drawn = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del shapes, mover
+    DrawScheduler.clear()
+    return {
+        'shape': shapeType,
+        'count': count,
+        'bytesPerShape': (created - start) / count,
+        'bytesPerShapeDrawn': (drawn - start) / count,
+    }
+
+"""d
+Measures the memory used per shape by every provided scene.
+:param shapeTypes :- The names of the scenes to build :- list[string]
+:param count :- The number of shapes in each scene :- int
+:return The results of every benchmark :- list[dict]
+"""
+def memorySuite(shapeTypes, count):
+    results = []
+    for shapeType in shapeTypes:
+        result = memory(shapeType, count)
+        results.append(result)
+        print(f"{shapeType:>12} {count:>7} {result['bytesPerShape']:>10.1f} bytes/shape "
+              f"{result['bytesPerShapeDrawn']:>10.1f} bytes/shape drawn")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rendering benchmarks on the headless backend.")
+    parser.add_argument('--frames', type=int, default=30)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--shapes', nargs='+', default=list(SCENES), choices=list(SCENES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="Also write the results to this file as JSON")
+    parser.add_argument('--memory', action='store_true', help="Measure bytes per shape instead of frame times")
+    parser.add_argument('--memory-count', type=int, default=100000)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    if args.memory:
+        results = memorySuite(args.shapes, args.memory_count)
+    else:
+        results = suite(args.shapes, args.sizes, args.frames)
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=2)
@@ -1,10 +1,82 @@
-import simplegui
 import math
+import array
+import time
+import json
+import collections
+import bisect
+import heapq
+import os
+import multiprocessing
+from multiprocessing import shared_memory
+import struct
+import sys
+import gc
+import colorsys
+import weakref
+
+try:
+    import simplegui
+except ImportError:
+    simplegui = None
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 """d
-Contains useful functions for clamping values for use various color spaces.
+The base of every color type. Contains useful functions for clamping values for use various color spaces, and for converting colors into HTML color strings.
+Also converts many colors between RGB and HSL at once, blends colors and precomputes gradients into lookup tables of HTML color strings.
+Colors are immutable and interned, so constructing the same color twice returns the same object and its HTML color string is only built once.
 """
 class Color:
+    __slots__ = ('css',)
+    
+    CACHE_SIZE = 4096
+    TRANSPARENT = 'rgba(255, 255, 255, 0.0)'
+    NAMED = {
+        'aliceblue': 0xF0F8FF, 'antiquewhite': 0xFAEBD7, 'aqua': 0x00FFFF, 'aquamarine': 0x7FFFD4, 'azure': 0xF0FFFF,
+        'beige': 0xF5F5DC, 'bisque': 0xFFE4C4, 'black': 0x000000, 'blanchedalmond': 0xFFEBCD, 'blue': 0x0000FF,
+        'blueviolet': 0x8A2BE2, 'brown': 0xA52A2A, 'burlywood': 0xDEB887, 'cadetblue': 0x5F9EA0, 'chartreuse': 0x7FFF00,
+        'chocolate': 0xD2691E, 'coral': 0xFF7F50, 'cornflowerblue': 0x6495ED, 'cornsilk': 0xFFF8DC, 'crimson': 0xDC143C,
+        'cyan': 0x00FFFF, 'darkblue': 0x00008B, 'darkcyan': 0x008B8B, 'darkgoldenrod': 0xB8860B, 'darkgray': 0xA9A9A9,
+        'darkgreen': 0x006400, 'darkgrey': 0xA9A9A9, 'darkkhaki': 0xBDB76B, 'darkmagenta': 0x8B008B, 'darkolivegreen': 0x556B2F,
+        'darkorange': 0xFF8C00, 'darkorchid': 0x9932CC, 'darkred': 0x8B0000, 'darksalmon': 0xE9967A, 'darkseagreen': 0x8FBC8F,
+        'darkslateblue': 0x483D8B, 'darkslategray': 0x2F4F4F, 'darkslategrey': 0x2F4F4F, 'darkturquoise': 0x00CED1, 'darkviolet': 0x9400D3,
+        'deeppink': 0xFF1493, 'deepskyblue': 0x00BFFF, 'dimgray': 0x696969, 'dimgrey': 0x696969, 'dodgerblue': 0x1E90FF,
+        'firebrick': 0xB22222, 'floralwhite': 0xFFFAF0, 'forestgreen': 0x228B22, 'fuchsia': 0xFF00FF, 'gainsboro': 0xDCDCDC,
+        'ghostwhite': 0xF8F8FF, 'gold': 0xFFD700, 'goldenrod': 0xDAA520, 'gray': 0x808080, 'green': 0x008000,
+        'greenyellow': 0xADFF2F, 'grey': 0x808080, 'honeydew': 0xF0FFF0, 'hotpink': 0xFF69B4, 'indianred': 0xCD5C5C,
+        'indigo': 0x4B0082, 'ivory': 0xFFFFF0, 'khaki': 0xF0E68C, 'lavender': 0xE6E6FA, 'lavenderblush': 0xFFF0F5,
+        'lawngreen': 0x7CFC00, 'lemonchiffon': 0xFFFACD, 'lightblue': 0xADD8E6, 'lightcoral': 0xF08080, 'lightcyan': 0xE0FFFF,
+        'lightgoldenrodyellow': 0xFAFAD2, 'lightgray': 0xD3D3D3, 'lightgreen': 0x90EE90, 'lightgrey': 0xD3D3D3, 'lightpink': 0xFFB6C1,
+        'lightsalmon': 0xFFA07A, 'lightseagreen': 0x20B2AA, 'lightskyblue': 0x87CEFA, 'lightslategray': 0x778899, 'lightslategrey': 0x778899,
+        'lightsteelblue': 0xB0C4DE, 'lightyellow': 0xFFFFE0, 'lime': 0x00FF00, 'limegreen': 0x32CD32, 'linen': 0xFAF0E6,
+        'magenta': 0xFF00FF, 'maroon': 0x800000, 'mediumaquamarine': 0x66CDAA, 'mediumblue': 0x0000CD, 'mediumorchid': 0xBA55D3,
+        'mediumpurple': 0x9370DB, 'mediumseagreen': 0x3CB371, 'mediumslateblue': 0x7B68EE, 'mediumspringgreen': 0x00FA9A, 'mediumturquoise': 0x48D1CC,
+        'mediumvioletred': 0xC71585, 'midnightblue': 0x191970, 'mintcream': 0xF5FFFA, 'mistyrose': 0xFFE4E1, 'moccasin': 0xFFE4B5,
+        'navajowhite': 0xFFDEAD, 'navy': 0x000080, 'oldlace': 0xFDF5E6, 'olive': 0x808000, 'olivedrab': 0x6B8E23,
+        'orange': 0xFFA500, 'orangered': 0xFF4500, 'orchid': 0xDA70D6, 'palegoldenrod': 0xEEE8AA, 'palegreen': 0x98FB98,
+        'paleturquoise': 0xAFEEEE, 'palevioletred': 0xDB7093, 'papayawhip': 0xFFEFD5, 'peachpuff': 0xFFDAB9, 'peru': 0xCD853F,
+        'pink': 0xFFC0CB, 'plum': 0xDDA0DD, 'powderblue': 0xB0E0E6, 'purple': 0x800080, 'rebeccapurple': 0x663399,
+        'red': 0xFF0000, 'rosybrown': 0xBC8F8F, 'royalblue': 0x4169E1, 'saddlebrown': 0x8B4513, 'salmon': 0xFA8072,
+        'sandybrown': 0xF4A460, 'seagreen': 0x2E8B57, 'seashell': 0xFFF5EE, 'sienna': 0xA0522D, 'silver': 0xC0C0C0,
+        'skyblue': 0x87CEEB, 'slateblue': 0x6A5ACD, 'slategray': 0x708090, 'slategrey': 0x708090, 'snow': 0xFFFAFA,
+        'springgreen': 0x00FF7F, 'steelblue': 0x4682B4, 'tan': 0xD2B48C, 'teal': 0x008080, 'thistle': 0xD8BFD8,
+        'tomato': 0xFF6347, 'turquoise': 0x40E0D0, 'violet': 0xEE82EE, 'wheat': 0xF5DEB3, 'white': 0xFFFFFF,
+        'whitesmoke': 0xF5F5F5, 'yellow': 0xFFFF00, 'yellowgreen': 0x9ACD32
+    }
+    COLORMAPS = {
+        'viridis': ['#440154', '#482878', '#3e4989', '#31688e', '#26828e', '#1f9e89', '#35b779', '#6ece58', '#b5de2b', '#fde725'],
+        'inferno': ['#000004', '#1b0c41', '#4a0c6b', '#781c6d', '#a52c60', '#cf4446', '#ed6925', '#fb9b06', '#f7d13d', '#fcffa4'],
+        'coolwarm': ['#3b4cc0', '#7396f5', '#b0cbfc', '#dddddd', '#f6bfa6', '#ee8468', '#b40426'],
+        'heat': ['#000000', '#ff0000', '#ffff00', '#ffffff'],
+        'grayscale': ['#000000', '#ffffff'],
+    }
+    
+    __cache = {}
+    __strings = {}
+    __gradients = {}
+    
     """d
     Casts values to integers and clamps them between 0 and 255.
     :param value :- The value to clamp :- number
@@ -37,30 +109,310 @@ class Color:
     def clampDegrees(value):
         return max(0, min(value, 360))
     
+    """d
+    Retrieves the interned color of the provided type and values, creating it if it is not cached yet.
+    The cache holds at most Color.CACHE_SIZE colors, evicting the oldest ones first.
+    :param colorType :- The color class to construct, such as RGB :- type
+    :param values :- The already clamped values of the color, in the order of the class' __slots__ :- tuple
+    :return The interned color :- color
+    """
+    def intern(colorType, values):
+        key = (colorType, values)
+        cache = Color.__cache
+        color = cache.get(key)
+        if color is None:
+            if len(cache) >= Color.CACHE_SIZE:
+                del cache[next(iter(cache))]
+            color = object.__new__(colorType)
+            for name, value in zip(colorType.__slots__, values):
+                object.__setattr__(color, name, value)
+            object.__setattr__(color, 'css', colorType.FORMAT.format(*values))
+            cache[key] = color
+        return color
+    
+    """d
+    Parses an HTML color string, such as a color name, a hex code or an rgb(), rgba(), hsl() or hsla() string.
+    Percentages are allowed for the red, green, blue and alpha values, and are scaled into the ranges of the color types.
+    :param string :- The color string to parse :- string
+    :return The matching color, or None if the string could not be parsed :- color
+    """
+    def parse(string):
+        text = string.strip().lower().replace(' ', '')
+        if text in Color.NAMED:
+            value = Color.NAMED[text]
+            return RGB(value >> 16, (value >> 8) & 0xFF, value & 0xFF)
+        if text == 'transparent':
+            return RGBA(0, 0, 0, 0)
+        try:
+            if text.startswith('#'):
+                digits = text[1:]
+                if len(digits) in (3, 4):
+                    digits = ''.join(digit * 2 for digit in digits)
+                if len(digits) == 6:
+                    return RGB(int(digits[0:2], 16), int(digits[2:4], 16), int(digits[4:6], 16))
+                if len(digits) == 8:
+                    return RGBA(int(digits[0:2], 16), int(digits[2:4], 16), int(digits[4:6], 16), round(int(digits[6:8], 16) / 255.0, 3))
+                return None
+            for prefix, colorType in (('rgba(', RGBA), ('rgb(', RGB), ('hsla(', HSLA), ('hsl(', HSL)):
+                if text.startswith(prefix) and text.endswith(')'):
+                    parts = text[len(prefix):-1].split(',')
+                    if len(parts) != len(colorType.__slots__):
+                        return None
+                    values = []
+                    for i, part in enumerate(parts):
+                        if not part.endswith('%'):
+                            values.append(float(part))
+                        elif i == 3:
+                            values.append(float(part[:-1]) / 100)
+                        elif colorType in (RGB, RGBA):
+                            values.append(round(float(part[:-1]) * 255 / 100))
+                        elif i == 0:
+                            return None
+                        else:
+                            values.append(float(part[:-1]))
+                    return colorType(*values)
+        except ValueError:
+            return None
+        return None
+    
+    """d
+    Converts any color value accepted by shapes into the values of the provided color type, converting between RGB and HSL if needed.
+    :param value :- The color to convert. None and colors that cannot be parsed are treated as fully transparent :- color, string
+    :param colorType :- The color class whose values are wanted, such as RGB or HSLA :- type
+    :return The values in the order of the class' __slots__, without clamping or rounding :- tuple
+    """
+    def components(value, colorType):
+        color = value if isinstance(value, Color) else Color.parse(Color.toCSS(value))
+        if color is None:
+            color = RGBA(0, 0, 0, 0)
+        alpha = getattr(color, 'a', 1.0)
+        if isinstance(color, (RGB, RGBA)):
+            values = (color.r, color.g, color.b)
+            if colorType in (HSL, HSLA):
+                h, l, s = colorsys.rgb_to_hls(color.r / 255.0, color.g / 255.0, color.b / 255.0)
+                values = (h * 360, s * 100, l * 100)
+        else:
+            values = (color.h, color.s, color.l)
+            if colorType in (RGB, RGBA):
+                r, g, b = colorsys.hls_to_rgb(color.h / 360.0, color.l / 100.0, color.s / 100.0)
+                values = (r * 255, g * 255, b * 255)
+        return values + (alpha,) if colorType in (RGBA, HSLA) else values
+    
+    """d
+    Converts many RGB colors into HSL at once, vectorized when NumPy is installed.
+    :param r :- The red values, from 0 to 255 :- numpy.ndarray, sequence
+    :param g :- The green values, from 0 to 255 :- numpy.ndarray, sequence
+    :param b :- The blue values, from 0 to 255 :- numpy.ndarray, sequence
+    :return The hues from 0 to 360, and the saturations and luminosities from 0 to 100, in format (h, s, l) :- tuple
+    """
+    def rgbToHsl(r, g, b):
+        if numpy is None:
+            converted = [colorsys.rgb_to_hls(red / 255.0, green / 255.0, blue / 255.0) for red, green, blue in zip(r, g, b)]
+            return ([h * 360 for h, l, s in converted], [s * 100 for h, l, s in converted], [l * 100 for h, l, s in converted])
+        r = numpy.asarray(r, dtype='float64') / 255.0
+        g = numpy.asarray(g, dtype='float64') / 255.0
+        b = numpy.asarray(b, dtype='float64') / 255.0
+        high = numpy.maximum(numpy.maximum(r, g), b)
+        low = numpy.minimum(numpy.minimum(r, g), b)
+        delta = high - low
+        l = (high + low) / 2
+        grey = delta == 0
+        delta = numpy.where(grey, 1.0, delta)
+        s = numpy.where(grey, 0.0, delta / numpy.where(grey, 1.0, 1 - numpy.abs((2 * l) - 1)))
+        h = numpy.where(high == r, ((g - b) / delta) % 6, numpy.where(high == g, ((b - r) / delta) + 2, ((r - g) / delta) + 4))
+        return (numpy.where(grey, 0.0, h * 60), s * 100, l * 100)
+    """d
+    Converts many HSL colors into RGB at once, vectorized when NumPy is installed.
+    :param h :- The hues, from 0 to 360 :- numpy.ndarray, sequence
+    :param s :- The saturations, from 0 to 100 :- numpy.ndarray, sequence
+    :param l :- The luminosities, from 0 to 100 :- numpy.ndarray, sequence
+    :return The red, green and blue values from 0 to 255, without rounding, in format (r, g, b) :- tuple
+    """
+    def hslToRgb(h, s, l):
+        if numpy is None:
+            converted = [colorsys.hls_to_rgb((hue % 360) / 360.0, light / 100.0, saturation / 100.0) for hue, saturation, light in zip(h, s, l)]
+            return ([r * 255 for r, g, b in converted], [g * 255 for r, g, b in converted], [b * 255 for r, g, b in converted])
+        h = numpy.asarray(h, dtype='float64') % 360
+        s = numpy.asarray(s, dtype='float64') / 100
+        l = numpy.asarray(l, dtype='float64') / 100
+        amount = s * numpy.minimum(l, 1 - l)
+        def channel(offset):
+            k = (offset + (h / 30)) % 12
+            return (l - (amount * numpy.clip(numpy.minimum(k - 3, 9 - k), -1, 1))) * 255
+        return (channel(0), channel(8), channel(4))
+    
+    """d
+    Interpolates between two colors.
+    :param start :- The color at t = 0 :- color, string
+    :param end :- The color at t = 1 :- color, string
+    :param t :- How far to interpolate, usually from 0 to 1 :- float
+    :param colorType=None :- [Optional] The color class to interpolate in and return, such as RGB or HSL. Defaults to the type of the end color :- type
+    :return The interpolated color. Hues take the shortest way around the color wheel :- color
+    """
+    def lerp(start, end, t, colorType=None):
+        if colorType is None:
+            colorType = type(end) if isinstance(end, Color) else type(Color.parse(Color.toCSS(end)) or RGBA(0, 0, 0, 0))
+        starts = Color.components(start, colorType)
+        ends = Color.components(end, colorType)
+        values = [a + ((b - a) * t) for a, b in zip(starts, ends)]
+        if colorType in (HSL, HSLA):
+            values[0] = (starts[0] + ((((ends[0] - starts[0]) + 180) % 360) - 180) * t) % 360
+        return colorType(*values)
+    """d
+    Draws one color over another, as the canvas does with transparent colors.
+    :param color :- The color underneath :- color, string
+    :param over :- The color on top :- color, string
+    :return The combined color, which is an RGB color if it is opaque and an RGBA color otherwise :- color
+    """
+    def blend(color, over):
+        r, g, b, a = Color.components(color, RGBA)
+        overR, overG, overB, overA = Color.components(over, RGBA)
+        alpha = overA + (a * (1 - overA))
+        if alpha <= 0:
+            return RGBA(0, 0, 0, 0)
+        under = a * (1 - overA)
+        values = [((top * overA) + (bottom * under)) / alpha for top, bottom in ((overR, r), (overG, g), (overB, b))]
+        if alpha >= 1:
+            return RGB(*(round(value) for value in values))
+        return RGBA(*(round(value) for value in values), round(alpha, 3))
+    
+    """d
+    Precomputes a gradient into a lookup table of HTML color strings, so values can be colored by indexing into it, such as with Color.quantize().
+    Tables are cached, so asking for the same gradient again is free.
+    :param colors :- The evenly spaced colors of the gradient, or the name of a colormap in Color.COLORMAPS :- list, string
+    :param size=256 :- [Optional] The number of entries in the table :- int
+    :param colorType=None :- [Optional] The color class to interpolate in, such as RGB or HSL. RGBA and HSLA also interpolate the alpha. Defaults to RGB :- type
+    :return The HTML color strings, from the first color of the gradient to the last :- list[string]
+    """
+    def gradient(colors, size=256, colorType=None):
+        colorType = RGB if colorType is None else colorType
+        key = (colors if isinstance(colors, str) else tuple(colors), size, colorType)
+        table = Color.__gradients.get(key)
+        if table is not None:
+            return table
+        stops = [Color.components(color, colorType) for color in (Color.COLORMAPS[colors] if isinstance(colors, str) else colors)]
+        if not stops:
+            raise ValueError("A gradient needs at least one color")
+        channels = [list(channel) for channel in zip(*stops)]
+        if colorType in (HSL, HSLA):
+            # Each hue is moved to take the shortest way around the color wheel from the previous stop
+            hues = channels[0]
+            for i in range(1, len(hues)):
+                hues[i] = hues[i - 1] + ((((hues[i] - hues[i - 1]) + 180) % 360) - 180)
+        last = max(len(stops) - 1, 1)
+        if numpy is not None:
+            samples = numpy.linspace(0.0, 1.0, size)
+            positions = numpy.linspace(0.0, 1.0, len(stops)) if len(stops) > 1 else numpy.zeros(1)
+            values = numpy.stack([numpy.interp(samples, positions, channel) for channel in channels], axis=1).tolist()
+        else:
+            values = []
+            for i in range(size):
+                position = (i / max(size - 1, 1)) * last
+                index = min(int(position), len(stops) - 2) if len(stops) > 1 else 0
+                fraction = position - index
+                values.append([channel[index] + ((channel[min(index + 1, len(channel) - 1)] - channel[index]) * fraction) for channel in channels])
+        hsl = colorType in (HSL, HSLA)
+        table = []
+        for entry in values:
+            if hsl:
+                entry = [round(entry[0] % 360, 1), round(entry[1], 1), round(entry[2], 1)] + [round(alpha, 3) for alpha in entry[3:]]
+            else:
+                entry = [round(value) for value in entry[:3]] + [round(alpha, 3) for alpha in entry[3:]]
+            table.append(colorType.FORMAT.format(*Color.__clamped(colorType, entry)))
+        if len(Color.__gradients) >= Color.CACHE_SIZE:
+            del Color.__gradients[next(iter(Color.__gradients))]
+        Color.__gradients[key] = table
+        return table
+    
+    def __clamped(colorType, values):
+        if colorType in (RGB, RGBA):
+            clamped = [Color.clamp8Bit(value) for value in values[:3]]
+        else:
+            clamped = [Color.clampDegrees(values[0]), Color.clampPercent(values[1]), Color.clampPercent(values[2])]
+        return clamped + [Color.clampDecimal(alpha) for alpha in values[3:]]
+    
+    """d
+    Maps values onto indices into a lookup table of the provided size, such as one made by Color.gradient(). Values outside of the range are clamped to its ends.
+    :param values :- The values to map :- numpy.ndarray, sequence
+    :param size :- The number of entries in the lookup table :- int
+    :param low=0.0 :- [Optional] The value mapped onto the first entry :- number
+    :param high=1.0 :- [Optional] The value mapped onto the last entry :- number
+    :return The indices, one per value :- numpy.ndarray, list[int]
+    """
+    def quantize(values, size, low=0.0, high=1.0):
+        scale = (size - 1) / ((high - low) or 1)
+        if numpy is not None:
+            indices = ((numpy.asarray(values, dtype='float64') - low) * scale) + 0.5
+            return numpy.clip(indices, 0, size - 1).astype('int32')
+        return [max(0, min(int(((value - low) * scale) + 0.5), size - 1)) for value in values]
+    
+    """d
+    Converts any color value accepted by shapes into an HTML color string. Strings are parsed and canonicalized once, then cached.
+    :param value :- The color to convert. None is treated as fully transparent :- color, string
+    :return The HTML color string :- string
+    """
+    def toCSS(value):
+        if isinstance(value, Color):
+            return value.css
+        if isinstance(value, str):
+            strings = Color.__strings
+            css = strings.get(value)
+            if css is None:
+                color = Color.parse(value)
+                css = value.strip() if color is None else color.css
+                if len(strings) >= Color.CACHE_SIZE:
+                    del strings[next(iter(strings))]
+                strings[value] = css
+            return css
+        if value is None:
+            return Color.TRANSPARENT
+        return str(value)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+    
+    def __values(self):
+        return tuple(getattr(self, name) for name in type(self).__slots__)
+    
+    def __eq__(self, other):
+        return self is other or (type(self) is type(other) and self.__values() == other.__values())
+    def __hash__(self):
+        return hash((type(self), self.__values()))
+    def __reduce__(self):
+        return (type(self), self.__values())
+    def __repr__(self):
+        return f"{type(self).__name__}{self.__values()}"
+    
+    """d
+    [CAST] Converts the color to a valid HTML color string.
+    """
+    def __str__(self):
+        return self.css
+    
 """d
 Represents a color in the RGB color space.
 """
-class RGB:
+class RGB(Color):
+    __slots__ = ('r', 'g', 'b')
+    FORMAT = "rgb({}, {}, {})"
+    
     """d
     Constructs an RGB color.
     :param r :- The red value of the color, clamped using Color.clamp8Bit() :- number
     :param g :- The greed value of the color, clamped using Color.clamp8Bit() :- number
     :param b :- The blue value of the color, clamped using Color.clamp8Bit() :- number
     """
-    def __init__(self, r, g, b):
-        self.r = Color.clamp8Bit(r)
-        self.g = Color.clamp8Bit(g)
-        self.b = Color.clamp8Bit(b)
-
-    """d
-    [CAST] Converts the color to a valid HTML color string in format rgb(r, g, b)
-    """
-    def __str__(self):
-        return f"rgb({self.r}, {self.g}, {self.b})"
+    def __new__(cls, r, g, b):
+        return Color.intern(cls, (Color.clamp8Bit(r), Color.clamp8Bit(g), Color.clamp8Bit(b)))
 """d
 Represents a color in the RGB color space while allowing for transparency.
 """
-class RGBA:
+class RGBA(Color):
+    __slots__ = ('r', 'g', 'b', 'a')
+    FORMAT = "rgba({}, {}, {}, {})"
+    
     """d
     Constructs an RGBA color.
     :param r :- The red value of the color, clamped using Color.clamp8Bit() :- number
@@ -68,720 +420,4551 @@ class RGBA:
     :param b :- The blue value of the color, clamped using Color.clamp8Bit() :- number
     :param a :- The alpha, or opacity, of the color, clamped using Color.clampDecimal() :- float
     """
-    def __init__(self, r, g, b, a):
-        self.r = Color.clamp8Bit(r)
-        self.g = Color.clamp8Bit(g)
-        self.b = Color.clamp8Bit(b)
-        self.a = Color.clampDecimal(a)
-        
-    """d
-    [CAST] Converts the color to a valid HTML color string in format rgba(r, g, b, a)
-    """
-    def __str__(self):
-        return f"rgba({self.r}, {self.g}, {self.b}, {self.a})"
+    def __new__(cls, r, g, b, a):
+        return Color.intern(cls, (Color.clamp8Bit(r), Color.clamp8Bit(g), Color.clamp8Bit(b), Color.clampDecimal(a)))
 """d
 Represents a color in the HSL color space.
 """
-class HSL:
+class HSL(Color):
+    __slots__ = ('h', 's', 'l')
+    FORMAT = "hsl({}, {}%, {}%)"
+    
     """d
     Constructs an HSL color.
     :param h :- The hue of the color, clamped using Color.clampDegrees() :- number
     :param s :- The saturation of the color, clamped using Color.clampPercent() :- number
     :param l :- The luminosity of the color, clamped using Color.clampPercent() :- number
     """
-    def __init__(self, h, s, l):
-        self.h = Color.clampDegrees(h)
-        self.s = Color.clampPercent(s)
-        self.l = Color.clampPercent(l)
-    """d
-    [CAST] Converts the color to a valid HTML color string in format hsl(h, s, l)
-    """
-    def __str__(self):
-        return f"HSL({self.h}, {self.s}%, {self.l}%)"    
+    def __new__(cls, h, s, l):
+        return Color.intern(cls, (Color.clampDegrees(h), Color.clampPercent(s), Color.clampPercent(l)))
 """d
 Represents a color in the HSL color space while allowing for transparency.
 """
-class HSLA:
+class HSLA(Color):
+    __slots__ = ('h', 's', 'l', 'a')
+    FORMAT = "hsla({}, {}%, {}%, {})"
+    
     """d
-    Constructs an HSL color.
+    Constructs an HSLA color.
     :param h :- The hue of the color, clamped using Color.clampDegrees() :- number
     :param s :- The saturation of the color, clamped using Color.clampPercent() :- number
     :param l :- The luminosity of the color, clamped using Color.clampPercent() :- number
     :param a :- The alpha, or opacity, of the color, clamped using Color.clampDecimal() :- float
     """
-    def __init__(self, h, s, l, a):
-        self.h = Color.clampDegrees(h)
-        self.s = Color.clampPercent(s)
-        self.l = Color.clampPercent(l)
-        self.a = Color.clampDecimal(a)
+    def __new__(cls, h, s, l, a):
+        return Color.intern(cls, (Color.clampDegrees(h), Color.clampPercent(s), Color.clampPercent(l), Color.clampDecimal(a)))
+    
+"""d
+A sorted list of drawers split into small blocks, so inserting and removing a drawer only shifts one block instead of the whole list.
+Each drawer is stored under a unique, comparable key that decides where it is drawn.
+"""
+class DrawOrder:
+    BLOCK_SIZE = 512
+    
     """d
-    [CAST] Converts the color to a valid HTML color string in format hsla(h, s, l, a)
+    Constructs an empty draw order.
     """
-    def __str__(self):
-        return f"hsl({self.h}, {self.s}%, {self.l}%, {self.a})"  
+    def __init__(self):
+        self.__keys = []
+        self.__drawers = []
+        self.__maxes = []
+        self.__count = 0
     
-class DrawScheduler:
-    __drawBuffer = [lambda pos : 1 + 1]
+    def __len__(self):
+        return self.__count
+    
+    """d
+    Adds a drawer under the provided key.
+    :param key :- The key deciding where the drawer is drawn. Must be unique :- tuple
+    :param drawer :- The function that draws the shape :- function
+    """
+    def insert(self, key, drawer):
+        self.__count += 1
+        if not self.__keys:
+            self.__keys.append([key])
+            self.__drawers.append([drawer])
+            self.__maxes.append(key)
+            return
+        index = min(bisect.bisect_left(self.__maxes, key), len(self.__maxes) - 1)
+        keys = self.__keys[index]
+        position = bisect.bisect_left(keys, key)
+        keys.insert(position, key)
+        self.__drawers[index].insert(position, drawer)
+        self.__maxes[index] = keys[-1]
+        if len(keys) > DrawOrder.BLOCK_SIZE * 2:
+            half = DrawOrder.BLOCK_SIZE
+            drawers = self.__drawers[index]
+            self.__keys[index:index + 1] = [keys[:half], keys[half:]]
+            self.__drawers[index:index + 1] = [drawers[:half], drawers[half:]]
+            self.__maxes[index:index + 1] = [keys[half - 1], keys[-1]]
     
-    def registerShape(function):
-        DrawScheduler.__drawBuffer.append(function)
-        return len(DrawScheduler.__drawBuffer) - 1
+    """d
+    Removes the drawer stored under the provided key. Raises a KeyError if no drawer is stored under it.
+    :param key :- The key the drawer was inserted with :- tuple
+    """
+    def remove(self, key):
+        index = bisect.bisect_left(self.__maxes, key)
+        if index == len(self.__maxes):
+            raise KeyError(key)
+        keys = self.__keys[index]
+        position = bisect.bisect_left(keys, key)
+        if keys[position] != key:
+            raise KeyError(key)
+        del keys[position]
+        del self.__drawers[index][position]
+        self.__count -= 1
+        if keys:
+            self.__maxes[index] = keys[-1]
+        else:
+            del self.__keys[index]
+            del self.__drawers[index]
+            del self.__maxes[index]
     
-    def draw(canvas):
-        for drawer in DrawScheduler.__drawBuffer:
-            drawer(canvas)
-            
-    def destroyShape(shapeID):
-        print(f"Destroying: {shapeID} with length {len(DrawScheduler.__drawBuffer)}")
-        DrawScheduler.__drawBuffer[shapeID] = lambda c : 1 + 1
-
-"""d
-Contains functions for interacting with the application window and controls.
-"""
-class App:
-    KEY_MAP = simplegui.KEY_MAP
-    CHAR_MAP = {v : k.lower() for k, v in simplegui.KEY_MAP.items()}
+    """d
+    Finds the smallest key that is at least the provided key.
+    :param key :- The key to search from :- tuple
+    :return The first key at or after the provided key, or None if there is none :- tuple
+    """
+    def after(self, key):
+        index = bisect.bisect_left(self.__maxes, key)
+        if index == len(self.__maxes):
+            return None
+        keys = self.__keys[index]
+        return keys[bisect.bisect_left(keys, key)]
     
-    __guiFrame = None
-    __background = 'white'
-    defaultFill = 'black'
+    """d
+    Finds the largest key that is smaller than the provided key.
+    :param key :- The key to search from :- tuple
+    :return The last key before the provided key, or None if there is none :- tuple
+    """
+    def before(self, key):
+        index = bisect.bisect_left(self.__maxes, key)
+        if index < len(self.__maxes):
+            keys = self.__keys[index]
+            position = bisect.bisect_left(keys, key)
+            if position > 0:
+                return keys[position - 1]
+        return self.__maxes[index - 1] if index > 0 else None
     
-    __downFunction = lambda key : 1 + 1
-    __upFunction = lambda key : 1 + 1
-    __updateFunction = lambda : 1 + 1
+    """d
+    The drawers split into blocks, in the order they should be drawn.
+    :return The blocks of drawers :- list[list[function]]
+    """
+    def blocks(self):
+        return self.__drawers
     
-    heldKeys = []
-    __keyHoldMap = {}
+    """d
+    The keys split into the same blocks as blocks(), so the two can be zipped together.
+    :return The blocks of keys :- list[list[tuple]]
+    """
+    def keyBlocks(self):
+        return self.__keys
     
+    """d
+    Every key in sorted order.
+    :return The keys :- generator
+    """
+    def keys(self):
+        for keys in self.__keys:
+            yield from keys
     
-    def __down(key):
-        App.heldKeys.append(key)
-        App.__downFunction(key)
-    def __up(key):
-        App.heldKeys.remove(key)
-        App.__upFunction(key)
-    def __update(canvas):
-        for key in App.heldKeys:
-            if key in App.__keyHoldMap.keys():
-                App.__keyHoldMap[key]()
-        App.__updateFunction()
-        DrawScheduler.draw(canvas)
+"""d
+Keeps track of every shape that needs to be drawn and draws them from back to front.
+Shapes are drawn in order of their layer, then their z-index, then the order they were registered or brought to the front or back.
+Shapes are stored in reusable slots and identified by generational handles, so destroying a shape frees its slot immediately and stale handles are safely ignored.
+The canvas commands of the last frame are recorded, and frames where nothing was marked dirty replay them instead of running every drawer again. Drawers registered without an owner can't mark themselves dirty, so every drawer runs each frame while any are registered.
+Shapes with bounds that are completely outside of the viewport, plus a margin of DrawScheduler.cullMargin pixels, are skipped.
+"""
+class DrawScheduler:
+    SLOT_BITS = 24
+    SLOT_MASK = (1 << SLOT_BITS) - 1
     
-    def initialize():
-        frame = simplegui.create_frame("Test", 500, 500)
-        frame.set_draw_handler(App.__update)
-        frame.set_canvas_background(App.__background)
-        frame.set_keydown_handler(App.__down)
-        frame.set_keyup_handler(App.__up)
-        App.__guiFrame = frame
-        frame.start()
+    __drawers = []
+    __generations = []
+    __keys = []
+    __frontSequence = 0
+    __backSequence = 0
+    __freeSlots = []
+    __drawOrder = DrawOrder()
+    __layers = {'default': 0}
+    __layerNames = {0: 'default'}
+    __drawing = False
+    __pendingDestroys = []
+    __dirty = True
+    __commands = []
+    __bounded = bytearray()
+    __sites = []
+    __owners = []
+    __unowned = 0
+    __detached = set()
+    __viewport = (500, 500)
+    __cameraX = 0
+    __cameraY = 0
+    
+    dirtyFrames = 0
+    cleanFrames = 0
+    culling = True
+    cullMargin = 32
+    drawnShapes = 0
+    culledShapes = 0
+    trackSites = False
+    weakOwners = False
     
     """d
-    Retrieves the window's background color.
-    :return The background color of the window :- string
+    Registers a function to be called every frame with the canvas to draw on.
+    When an owner is provided, the scheduler keeps it alive until the shape is destroyed. If DrawScheduler.weakOwners is enabled, only a weak reference to it is kept instead, and the owner must destroy the shape when it is collected.
+    :param function :- The function that draws the shape. Must take in the canvas to draw on, or the owner and the canvas if an owner is provided :- function
+    :param bounded=False :- [Optional] Whether or not the shape is added to SpatialIndex, which lets it be skipped while it is outside of the viewport :- bool
+    :param owner=None :- [Optional] The object the shape belongs to, which is passed to the function when drawing :- object
+    :return The handle identifying the registered shape :- int
     """
-    def getBackground():
-        return App.__background
+    def registerShape(function, bounded=False, owner=None):
+        DrawScheduler.__frontSequence += 1
+        if DrawScheduler.__freeSlots:
+            slot = DrawScheduler.__freeSlots.pop()
+        else:
+            slot = len(DrawScheduler.__drawers)
+            DrawScheduler.__drawers.append(None)
+            DrawScheduler.__generations.append(0)
+            DrawScheduler.__keys.append(None)
+            DrawScheduler.__bounded.append(0)
+            DrawScheduler.__sites.append(None)
+            DrawScheduler.__owners.append(None)
+        # Drawers are stored as (function, reference) and called as function(reference(), canvas), skipping owners that were collected
+        if owner is None:
+            drawer = (DrawScheduler.__callDrawer, lambda : function)
+            DrawScheduler.__unowned += 1
+        else:
+            drawer = (function, weakref.ref(owner))
+            if not DrawScheduler.weakOwners:
+                DrawScheduler.__owners[slot] = owner
+            if DrawScheduler.trackSites:
+                DrawScheduler.__sites[slot] = DrawScheduler.__callSite()
+        DrawScheduler.__drawers[slot] = drawer
+        DrawScheduler.__bounded[slot] = bounded
+        key = (0, 0, DrawScheduler.__frontSequence, slot)
+        DrawScheduler.__keys[slot] = key
+        DrawScheduler.__drawOrder.insert(key, drawer)
+        DrawScheduler.__dirty = True
+        return (DrawScheduler.__generations[slot] << DrawScheduler.SLOT_BITS) | slot
+    
+    def __callDrawer(drawer, canvas):
+        drawer(canvas)
+    
+    def __callSite():
+        # The first frame outside of this module is where the user created the shape
+        frame = sys._getframe(2)
+        while frame is not None and frame.f_code.co_filename == __file__:
+            frame = frame.f_back
+        if frame is None:
+            return 'unknown'
+        return f"{frame.f_code.co_filename}:{frame.f_lineno}"
+    
     """d
-    Changes the window's background color to the provided color.
-    :param color :- The desired background color :- color, string
+    Retrieves the object a shape was registered with.
+    :param shapeID :- The handle returned by DrawScheduler.registerShape() :- int
+    :return The owner, or None if the handle is stale or the shape has no owner :- object
     """
-    def setBackground(color):
-        App.__background = str(color)
-        App.__guiFrame.set_canvas_background(str(color))
+    def getOwner(shapeID):
+        if not DrawScheduler.isAlive(shapeID):
+            return None
+        function, reference = DrawScheduler.__drawers[shapeID & DrawScheduler.SLOT_MASK]
+        return None if function is DrawScheduler.__callDrawer else reference()
     
     """d
-    Binds a function to be called whenever the mouse is clicked.
-    :param function :- The function to be executed when the mouse is clicked. Must take in a 2-element tuple for the position in format (x, y) :- function
+    Counts the live shapes that were registered with an owner by the type of their owner.
+    Where each one was created is also counted, for the shapes registered while DrawScheduler.trackSites was enabled.
+    :return The counts in format {typeName: {'count': int, 'sites': {'file:line': int}}} :- dict
     """
-    def onMouseClick(function):
-        App.__guiFrame.set_mouseclick_handler(function)
+    def liveShapes():
+        report = {}
+        sites = DrawScheduler.__sites
+        for slot, drawer in enumerate(DrawScheduler.__drawers):
+            if drawer is None or drawer[0] is DrawScheduler.__callDrawer:
+                continue
+            owner = drawer[1]()
+            if owner is None:
+                continue
+            entry = report.get(type(owner).__name__)
+            if entry is None:
+                entry = report[type(owner).__name__] = {'count': 0, 'sites': {}}
+            entry['count'] += 1
+            site = sites[slot]
+            if site is not None:
+                entry['sites'][site] = entry['sites'].get(site, 0) + 1
+        return report
+    
     """d
-    Binds a function to be called whenever a mouse button is held down and the cursor is moved.
-    :param function :- The function to be executed when the mouse is dragged. Must take in a 2-element tuple for the position in format (x, y) :- function
+    Checks whether the provided handle still refers to a registered shape.
+    :param shapeID :- The handle returned by DrawScheduler.registerShape() :- int
+    :return Whether or not the handle is still live :- bool
     """
-    def onMouseDrag(function):
-        App.__guiFrame.set_mousedrag_handler(function)
-
+    def isAlive(shapeID):
+        slot = shapeID & DrawScheduler.SLOT_MASK
+        return (slot < len(DrawScheduler.__drawers)
+                and DrawScheduler.__drawers[slot] is not None
+                and DrawScheduler.__generations[slot] == shapeID >> DrawScheduler.SLOT_BITS)
+    
     """d
-    Binds a function to be called whenever a key is pressed down.
-    :param function :- The function to be called when a key is pressed. Must take in an int for the key that was pressed, to convert between characters and numbers use App.KEY_MAP :- function
+    Retrieves a key that sorts shapes in the order they are drawn, from back to front.
+    :param shapeID :- The handle returned by DrawScheduler.registerShape() :- int
+    :return The sort key of the shape :- tuple
     """
-    def onKeyDown(function):
-        App.__downFunction = function
+    def drawKey(shapeID):
+        return DrawScheduler.__keys[shapeID & DrawScheduler.SLOT_MASK]
+    
     """d
-    Binds a function to be called whenever a key is released.
-    :param function :- The function to be called when a key is released. Must take in an int for the key that was pressed, to convert between characters and numbers use App.KEY_MAP :- function
+    Adds a named layer that shapes can be placed on. Layers with a higher order are drawn in front of layers with a lower order. The 'default' layer has an order of 0.
+    :param name :- The name of the layer :- string
+    :param order :- Where the layer is drawn relative to the other layers. Must not be used by another layer :- number
     """
-    def onKeyUp(function):
-        App.__upFunction = function
+    def addLayer(name, order):
+        if name in DrawScheduler.__layers:
+            raise ValueError(f"The layer '{name}' already exists")
+        if order in DrawScheduler.__layerNames:
+            raise ValueError(f"The layer '{DrawScheduler.__layerNames[order]}' already has an order of {order}")
+        DrawScheduler.__layers[name] = order
+        DrawScheduler.__layerNames[order] = name
+    
     """d
-    Binds a function to be called while a key is held.
-    :param key :- The key to bind this function to. This string must be only 1 character long :- string
-    :param function :- The function to be called while the provided key is held. This function must accept no arguments :- function
+    Retrieves the names of every layer from back to front.
+    :return The names of the layers :- list[string]
     """
-    def whileKeyDown(key, function):
-        App.__keyHoldMap.update({simplegui.KEY_MAP[key] : function})
-
+    def getLayers():
+        return [DrawScheduler.__layerNames[order] for order in sorted(DrawScheduler.__layerNames)]
+    
     """d
-    Binds a function to be called every time the window is updated. This occurs roughly 60 times a second under ideal conditions.
-    :param function :- The function to be called every update. This function must accept no arguments :- function
+    Retrieves the layer and z-index of a shape.
+    :param shapeID :- The handle returned by DrawScheduler.registerShape() :- int
+    :return The name of the layer and the z-index of the shape in format (layer, zIndex) :- tuple
     """
-    def onUpdate(function):
-        App.__updateFunction = function
+    def getOrder(shapeID):
+        key = DrawScheduler.__keys[shapeID & DrawScheduler.SLOT_MASK]
+        return (DrawScheduler.__layerNames[key[0]], key[1])
     
     """d
-    Calculates the width that a string of text will take up.
-    :param text :- The text to find the width of :- string
-    :param size :- The font size of the text :- number
-    :return The width of the text :- int
+    Moves a shape to another layer and/or z-index. Within the same layer and z-index, the shape is drawn in front of the shapes already there.
+    :param shapeID :- The handle returned by DrawScheduler.registerShape() :- int
+    :param layer=None :- [Optional] The name of the layer to move the shape to. Defaults to its current layer :- string
+    :param zIndex=None :- [Optional] The z-index to give the shape. Defaults to its current z-index :- number
     """
-    def textSize(text, size):
-        return App.__guiFrame.get_canvas_textwidth(text, size)
-
-"""d
-Represents a rectangle in the screenspace of the application window.
-"""
-class Rect:
+    def setOrder(shapeID, layer=None, zIndex=None):
+        if not DrawScheduler.isAlive(shapeID):
+            return
+        slot = shapeID & DrawScheduler.SLOT_MASK
+        key = DrawScheduler.__keys[slot]
+        layerOrder = key[0] if layer is None else DrawScheduler.__layers[layer]
+        zIndex = key[1] if zIndex is None else zIndex
+        DrawScheduler.__frontSequence += 1
+        DrawScheduler.__reorder(slot, (layerOrder, zIndex, DrawScheduler.__frontSequence, slot))
+    
     """d
-    Constructs a rectangle with the provided paramaters.
-    :param startX :- The x-coordinate of the 'top-left' corner of the rectangle :- number
-    :param startY :- The y-coordinate of the 'top-left' corner of the rectangle :- number
-    :param width :- The width, or size along the x-axis, of the rectangle :- number
-    :param height :- The height, or size along the y-axis of the rectangle :- number
-    :param fill=App.defaultFill :- [Optional] The fill color of the rectangle :- color, string
-    :param border=None :- [Optional] The color of the border of the rectangle :- color, string
-    :param borderWidth=2 :- [Optional] The width of the border in pixels :- number
+    Moves a shape in front of every other shape on its layer.
+    :param shapeID :- The handle returned by DrawScheduler.registerShape() :- int
     """
-    def __init__(self, startX, startY, width, height, fill=App.defaultFill, border=None, borderWidth=2):
-        self.__startX = startX
-        self.__startY = startY
-        self.__width = width
-        self.__height = height
-        
-        self.__fill = 'rgba(255, 255, 255, 0)' if fill == None else fill
-        self.__border = 'rgba(255, 255, 255, 0)' if border == None else border
-        self.__borderWidth = borderWidth
-        
-        self.__calculatePoints()
-        
-        self.visible = True
-        
-        self.__id = DrawScheduler.registerShape(self.__draw)
-    
-    def __getStartX(self):
-        return self.__startX
-    def __setStartX(self, startX):
-        self.__startX = startX
-        self.__calculatePoints()
-    def __getStartY(self):
-        return self.__startY
-    def __setStartY(self, startY):
-        self.__startY = startY
-        self.__calculatePoints()
-    def __getWidth(self):
-        return self.__width
-    def __setWidth(self, width):
-        self.__width = width
-        self.__calculatePoints()
-    def __getHeight(self):
-        return self.__height
-    def __setHeight(self, height):
-        self.__height = height
-        self.__calculatePoints()
-    def __getCenterX(self):
-        return self.__startX + (self.__width / 2.0)
-    def __setCenterX(self, centerX):
-        self.startX = centerX - (self.__width / 2.0)
-    def __getCenterY(self):
-        return self.__startY + (self.__height / 2.0)
-    def __setCenterY(self, centerY):
-        self.startY = centerY - (self.__height / 2.0)
-    def __getBorder(self):
-        return self.__border
-    def __setBorder(self, border):
-        self.__border = 'rgba(255, 255, 255, 0)' if border == None else border
-    def __getFill(self):
-        return self.__fill
-    def __setFill(self, fill):
-        self.__fill = 'rgba(255, 255, 255, 0)' if fill == None else fill
-    def __getBorderWidth(self):
-        return self.__borderWidth
-    def __setBorderWidth(self, width):
-        self.__borderWidth = width
-
-
-    def __draw(self, canvas):
-        if not self.visible:
+    def toFront(shapeID):
+        if not DrawScheduler.isAlive(shapeID):
             return
-        canvas.draw_polygon(self.__points, self.borderWidth, str(self.border), str(self.fill))
-
+        slot = shapeID & DrawScheduler.SLOT_MASK
+        key = DrawScheduler.__keys[slot]
+        last = DrawScheduler.__drawOrder.before((key[0], math.inf))
+        # Detached shapes are not in the draw order, so the layer can be empty and the neighbouring key can be on another layer
+        zIndex = key[1] if last is None or last[0] != key[0] else max(key[1], last[1])
+        DrawScheduler.__frontSequence += 1
+        DrawScheduler.__reorder(slot, (key[0], zIndex, DrawScheduler.__frontSequence, slot))
+    
     """d
-    Checks if the provided coordinate is contained within the rectangle.
-    :param x :- The x value of the coordinate to check :- number
-    :param y :- The y value of the coordinate to check :- number
-    :return Whether or not the coordinate is contained within the rectangle :- bool
+    Moves a shape behind every other shape on its layer.
+    :param shapeID :- The handle returned by DrawScheduler.registerShape() :- int
     """
-    def contains(self, x, y):
-        return x >= self.startX and x <= self.points[1][0] and y >= self.startY and y <= self.points[3][1]
+    def toBack(shapeID):
+        if not DrawScheduler.isAlive(shapeID):
+            return
+        slot = shapeID & DrawScheduler.SLOT_MASK
+        key = DrawScheduler.__keys[slot]
+        first = DrawScheduler.__drawOrder.after((key[0],))
+        zIndex = key[1] if first is None or first[0] != key[0] else min(key[1], first[1])
+        DrawScheduler.__backSequence -= 1
+        DrawScheduler.__reorder(slot, (key[0], zIndex, DrawScheduler.__backSequence, slot))
     
-    def __calculatePoints(self):
-        startX = self.startX
-        startY = self.startY
-        width = self.width
-        height = self.height
-        
-        self.__points = [(startX, startY), (startX + width, startY), (startX + width, startY + height), (startX, startY + height)]
+    """d
+    Moves a shape to the same place in the draw order as another shape, such as one drawn in its place after DrawScheduler.detach().
+    :param shapeID :- The handle of the shape to move :- int
+    :param otherID :- The handle of the shape whose place it takes :- int
+    """
+    def matchOrder(shapeID, otherID):
+        if not DrawScheduler.isAlive(shapeID) or not DrawScheduler.isAlive(otherID):
+            return
+        slot = shapeID & DrawScheduler.SLOT_MASK
+        other = DrawScheduler.__keys[otherID & DrawScheduler.SLOT_MASK]
+        DrawScheduler.__reorder(slot, (other[0], other[1], other[2], slot))
     
-    def __area(self):
-        return self.width * self.height
+    def __reorder(slot, key):
+        if slot in DrawScheduler.__detached:
+            DrawScheduler.__keys[slot] = key
+            return
+        DrawScheduler.__drawOrder.remove(DrawScheduler.__keys[slot])
+        DrawScheduler.__keys[slot] = key
+        DrawScheduler.__drawOrder.insert(key, DrawScheduler.__drawers[slot])
+        DrawScheduler.__dirty = True
     
     """d
-    The x-coordinate of the 'top-left' corner of the rectangle.
-    :type number
+    Stops drawing a shape every frame while keeping it registered, so that something else, such as a DisplayList, can draw it instead.
+    :param shapeID :- The handle returned by DrawScheduler.registerShape() :- int
     """
-    startX = property(__getStartX, __setStartX)
+    def detach(shapeID):
+        slot = shapeID & DrawScheduler.SLOT_MASK
+        if not DrawScheduler.isAlive(shapeID) or slot in DrawScheduler.__detached:
+            return
+        DrawScheduler.__drawOrder.remove(DrawScheduler.__keys[slot])
+        DrawScheduler.__detached.add(slot)
+        DrawScheduler.__dirty = True
     """d
-    The y-coordinate of the 'top-left' corner of the rectangle.
-    :type number
+    Starts drawing a shape removed using DrawScheduler.detach() every frame again.
+    :param shapeID :- The handle returned by DrawScheduler.registerShape() :- int
     """
-    startY = property(__getStartY, __setStartY)
+    def attach(shapeID):
+        slot = shapeID & DrawScheduler.SLOT_MASK
+        if not DrawScheduler.isAlive(shapeID) or slot not in DrawScheduler.__detached:
+            return
+        DrawScheduler.__detached.discard(slot)
+        DrawScheduler.__drawOrder.insert(DrawScheduler.__keys[slot], DrawScheduler.__drawers[slot])
+        DrawScheduler.__dirty = True
     """d
-    The width, or size along the x-axis, of the rectangle.
-    :type number
+    Retrieves the function registered to draw a shape.
+    :param shapeID :- The handle returned by DrawScheduler.registerShape() :- int
+    :return The drawing function, which takes in the canvas to draw on, or None if the handle is stale :- function
     """
-    width = property(__getWidth, __setWidth)
+    def getDrawer(shapeID):
+        if not DrawScheduler.isAlive(shapeID):
+            return None
+        function, reference = DrawScheduler.__drawers[shapeID & DrawScheduler.SLOT_MASK]
+        owner = reference()
+        return None if owner is None else function.__get__(owner)
+    
     """d
-    The height, or size along the y-axis, of the rectangle.
-    :type number
+    The number of shapes currently registered.
+    :return The number of live shapes :- int
     """
-    height = property(__getHeight, __setHeight)
+    def count():
+        return len(DrawScheduler.__drawOrder) + len(DrawScheduler.__detached)
+    
     """d
-    The x-coordinate of the center point of the rectangle.
-    :type number
+    Marks the scene as changed so the next frame runs every drawer again. Shapes do this automatically whenever one of their properties is set.
     """
-    centerX = property(__getCenterX, __setCenterX)
+    def markDirty():
+        DrawScheduler.__dirty = True
+    
     """d
-    The y-coordinate of the center point of the rectangle.
-    :type number
+    Checks whether anything has changed since the last frame was drawn.
+    :return Whether or not the next frame needs to run every drawer :- bool
     """
-    centerY = property(__getCenterY, __setCenterY)
+    def isDirty():
+        return DrawScheduler.__dirty
+    
     """d
-    The fill color of rectangle.
-    :type color, string
+    Changes the size of the area that is drawn to, used to skip shapes that are outside of it.
+    :param width :- The width of the canvas :- number
+    :param height :- The height of the canvas :- number
     """
-    fill = property(__getFill, __setFill)
+    def setViewport(width, height):
+        DrawScheduler.__viewport = (width, height)
+        DrawScheduler.__dirty = True
     """d
-    The color of the border of the rectangle.
-    :type color, string
+    Retrieves the size of the area that is drawn to.
+    :return The size in format (width, height) :- tuple
     """
-    border = property(__getBorder, __setBorder)
+    def getViewport():
+        return DrawScheduler.__viewport
+    
     """d
-    The width of the border of the rectangle.
-    :type number
+    Moves the camera so that the provided coordinate is drawn at the 'top-left' corner of the canvas.
+    :param x :- The x-coordinate of the 'top-left' corner of the view :- number
+    :param y :- The y-coordinate of the 'top-left' corner of the view :- number
     """
-    borderWidth = property(__getBorderWidth, __setBorderWidth)
+    def setCamera(x, y):
+        if (x, y) != (DrawScheduler.__cameraX, DrawScheduler.__cameraY):
+            DrawScheduler.__cameraX = x
+            DrawScheduler.__cameraY = y
+            DrawScheduler.__dirty = True
     """d
-    The area encased, or the number of pixels occupied, by this rectangle.
-    :type number
+    Retrieves the coordinate drawn at the 'top-left' corner of the canvas.
+    :return The position of the camera in format (x, y) :- tuple
     """
-    area = property(__area)
+    def getCamera():
+        return (DrawScheduler.__cameraX, DrawScheduler.__cameraY)
     
+    def __visibleSlots():
+        if not DrawScheduler.culling:
+            return None
+        margin = DrawScheduler.cullMargin
+        width, height = DrawScheduler.__viewport
+        cameraX, cameraY = DrawScheduler.__cameraX, DrawScheduler.__cameraY
+        mask = DrawScheduler.SLOT_MASK
+        return {shapeID & mask for shapeID in SpatialIndex.queryView(cameraX - margin, cameraY - margin, cameraX + width + margin, cameraY + height + margin)}
     
-    def __del__(self):
-        DrawScheduler.destroyShape(self.__id)
-"""d
-Represents a circle in the screenspace of the application window
+    """d
+    Draws every registered shape to the canvas, or replays the previous frame if nothing changed.
+    The number of shapes drawn and skipped for being outside of the viewport are kept in DrawScheduler.drawnShapes and DrawScheduler.culledShapes.
+    :param canvas :- The canvas to draw on :- canvas
+    :param shapeTimes=None :- [Optional] A dictionary to add the time, in seconds, spent drawing each type of shape to. Only filled on frames that run every drawer :- dict
+    """
+    def draw(canvas, shapeTimes=None):
+        if not DrawScheduler.__dirty and not DrawScheduler.__unowned:
+            DrawScheduler.cleanFrames += 1
+            for name, args in DrawScheduler.__commands:
+                getattr(canvas, name)(*args)
+            return
+        DrawScheduler.dirtyFrames += 1
+        DrawScheduler.__dirty = False
+        DrawScheduler.__commands = []
+        target = CommandRecorder(canvas, DrawScheduler.__commands)
+        if DrawScheduler.__cameraX or DrawScheduler.__cameraY:
+            target = CameraCanvas(target, DrawScheduler.__cameraX, DrawScheduler.__cameraY)
+        drawOrder = DrawScheduler.__drawOrder
+        visible = DrawScheduler.__visibleSlots()
+        bounded = DrawScheduler.__bounded
+        culled = 0
+        DrawScheduler.__drawing = True
+        try:
+            if shapeTimes is None and visible is None:
+                for block in drawOrder.blocks():
+                    for function, reference in block:
+                        owner = reference()
+                        if owner is not None:
+                            function(owner, target)
+            elif shapeTimes is None:
+                for keys, block in zip(drawOrder.keyBlocks(), drawOrder.blocks()):
+                    for key, (function, reference) in zip(keys, block):
+                        if bounded[key[3]] and key[3] not in visible:
+                            culled += 1
+                            continue
+                        owner = reference()
+                        if owner is not None:
+                            function(owner, target)
+            else:
+                clock = time.perf_counter
+                for keys, block in zip(drawOrder.keyBlocks(), drawOrder.blocks()):
+                    for key, (function, reference) in zip(keys, block):
+                        if visible is not None and bounded[key[3]] and key[3] not in visible:
+                            culled += 1
+                            continue
+                        owner = reference()
+                        if owner is None:
+                            continue
+                        start = clock()
+                        function(owner, target)
+                        kind = type(getattr(owner, '__self__', owner)).__name__
+                        shapeTimes[kind] = shapeTimes.get(kind, 0.0) + clock() - start
+        finally:
+            DrawScheduler.drawnShapes = len(drawOrder) - culled
+            DrawScheduler.culledShapes = culled
+            DrawScheduler.__drawing = False
+            pending = DrawScheduler.__pendingDestroys
+            while pending:
+                DrawScheduler.destroyShape(pending.pop())
+    
+    """d
+    Destroys every registered shape, invalidating all of their handles.
+    """
+    def clear():
+        if DrawScheduler.__drawing:
+            DrawScheduler.__pendingDestroys.extend(DrawScheduler.__handles())
+        else:
+            for shapeID in DrawScheduler.__handles():
+                DrawScheduler.destroyShape(shapeID)
+        SpatialIndex.clear()
+        Collisions.clear()
+        Tweens.clear()
+        TaskScheduler.clear()
+    
+    def __handles():
+        slots = [key[3] for key in DrawScheduler.__drawOrder.keys()]
+        slots.extend(DrawScheduler.__detached)
+        return [(DrawScheduler.__generations[slot] << DrawScheduler.SLOT_BITS) | slot for slot in slots]
+    
+    """d
+    Stops drawing the shape with the provided handle and frees its slot for reuse. Stale handles are ignored.
+    :param shapeID :- The handle returned by DrawScheduler.registerShape() :- int
+    :return Whether or not a shape was destroyed :- bool
+    """
+    def destroyShape(shapeID):
+        if not DrawScheduler.isAlive(shapeID):
+            return False
+        if DrawScheduler.__drawing:
+            DrawScheduler.__pendingDestroys.append(shapeID)
+            return True
+        slot = shapeID & DrawScheduler.SLOT_MASK
+        if DrawScheduler.__drawers[slot][0] is DrawScheduler.__callDrawer:
+            DrawScheduler.__unowned -= 1
+        DrawScheduler.__drawers[slot] = None
+        DrawScheduler.__sites[slot] = None
+        DrawScheduler.__owners[slot] = None
+        DrawScheduler.__generations[slot] = (DrawScheduler.__generations[slot] + 1) & 0xFFFFFFFF
+        if slot in DrawScheduler.__detached:
+            DrawScheduler.__detached.discard(slot)
+        else:
+            DrawScheduler.__drawOrder.remove(DrawScheduler.__keys[slot])
+        DrawScheduler.__keys[slot] = None
+        DrawScheduler.__freeSlots.append(slot)
+        DrawScheduler.__dirty = True
+        return True
+
+"""d
+Wraps a canvas, forwarding every draw call to it while keeping a list of the calls so they can be replayed later.
+"""
+class CommandRecorder:
+    """d
+    Constructs a recorder around the provided canvas.
+    :param canvas :- The canvas to forward draw calls to :- canvas
+    :param commands :- The list to append (methodName, args) pairs to :- list
+    """
+    def __init__(self, canvas, commands):
+        self.__canvas = canvas
+        self.__commands = commands
+    
+    def __getattr__(self, name):
+        method = getattr(self.__canvas, name)
+        commands = self.__commands
+        def record(*args):
+            commands.append((name, args))
+            return method(*args)
+        setattr(self, name, record)
+        return record
+
+"""d
+Wraps a canvas, shifting the position of every draw call by a camera offset before forwarding it.
+"""
+class CameraCanvas:
+    """d
+    Constructs a camera around the provided canvas.
+    :param canvas :- The canvas to forward draw calls to :- canvas
+    :param offsetX :- The x-coordinate drawn at the left edge of the canvas :- number
+    :param offsetY :- The y-coordinate drawn at the top edge of the canvas :- number
+    """
+    def __init__(self, canvas, offsetX, offsetY):
+        self.__canvas = canvas
+        self.__offsetX = offsetX
+        self.__offsetY = offsetY
+    
+    def __point(self, point):
+        return (point[0] - self.__offsetX, point[1] - self.__offsetY)
+    
+    def draw_polygon(self, points, *args):
+        self.__canvas.draw_polygon([self.__point(point) for point in points], *args)
+    def draw_polyline(self, points, *args):
+        self.__canvas.draw_polyline([self.__point(point) for point in points], *args)
+    def draw_circle(self, center, *args):
+        self.__canvas.draw_circle(self.__point(center), *args)
+    def draw_point(self, point, *args):
+        self.__canvas.draw_point(self.__point(point), *args)
+    def draw_text(self, text, point, *args):
+        self.__canvas.draw_text(text, self.__point(point), *args)
+    def draw_line(self, start, end, *args):
+        self.__canvas.draw_line(self.__point(start), self.__point(end), *args)
+    def draw_image(self, image, centerSource, sizeSource, centerDest, *args):
+        self.__canvas.draw_image(image, centerSource, sizeSource, self.__point(centerDest), *args)
+    
+    def __getattr__(self, name):
+        return getattr(self.__canvas, name)
+
+"""d
+A canvas that draws nothing and instead counts, and optionally records, every call made to it. Used by HeadlessBackend.
+"""
+class HeadlessCanvas:
+    """d
+    Constructs an empty headless canvas.
+    :param record=False :- [Optional] Whether or not to keep the (methodName, args) of every call made during the current frame :- bool
+    """
+    def __init__(self, record=False):
+        self.record = record
+        self.commands = []
+        self.counts = {}
+        self.frameCalls = 0
+    
+    """d
+    Clears the calls recorded during the previous frame. Called by HeadlessFrame before every frame.
+    """
+    def beginFrame(self):
+        self.commands = []
+        self.frameCalls = 0
+    
+    def __call(self, name, args):
+        self.frameCalls += 1
+        self.counts[name] = self.counts.get(name, 0) + 1
+        if self.record:
+            self.commands.append((name, args))
+    
+    def draw_polygon(self, point_list, line_width, line_color, fill_color=None):
+        self.__call('draw_polygon', (point_list, line_width, line_color, fill_color))
+    def draw_circle(self, center_point, radius, line_width, line_color, fill_color=None):
+        self.__call('draw_circle', (center_point, radius, line_width, line_color, fill_color))
+    def draw_text(self, text, point, font_size, font_color, font_face='serif'):
+        self.__call('draw_text', (text, point, font_size, font_color, font_face))
+    def draw_line(self, point1, point2, line_width, line_color):
+        self.__call('draw_line', (point1, point2, line_width, line_color))
+    def draw_polyline(self, point_list, line_width, line_color):
+        self.__call('draw_polyline', (point_list, line_width, line_color))
+    def draw_point(self, point, color):
+        self.__call('draw_point', (point, color))
+    def draw_image(self, *args):
+        self.__call('draw_image', args)
+    
+    """d
+    Estimates the width of a string of text without a real font, assuming every character is slightly wider than half the font size.
+    :param text :- The text to find the width of :- string
+    :param size :- The font size of the text :- number
+    :param face='serif' :- [Optional] The font face of the text :- string
+    :return The estimated width of the text :- int
+    """
+    def get_canvas_textwidth(self, text, size, face='serif'):
+        return int(len(text) * size * 0.55)
+"""d
+A frame with the same interface as the frames created by simplegui.create_frame() that never opens a window.
+Frames are advanced manually using step(), and input can be simulated through the methods mirroring the handlers.
+"""
+class HeadlessFrame:
+    """d
+    Constructs a headless frame.
+    :param title :- The title of the frame :- string
+    :param width :- The width of the canvas :- number
+    :param height :- The height of the canvas :- number
+    """
+    def __init__(self, title, width, height):
+        self.title = title
+        self.width = width
+        self.height = height
+        self.background = 'black'
+        self.canvas = HeadlessCanvas()
+        self.frames = 0
+        self.running = False
+        
+        self.__draw = lambda canvas : 1 + 1
+        self.__keyDown = lambda key : 1 + 1
+        self.__keyUp = lambda key : 1 + 1
+        self.__click = lambda pos : 1 + 1
+        self.__drag = lambda pos : 1 + 1
+    
+    def set_draw_handler(self, function):
+        self.__draw = function
+    def set_keydown_handler(self, function):
+        self.__keyDown = function
+    def set_keyup_handler(self, function):
+        self.__keyUp = function
+    def set_mouseclick_handler(self, function):
+        self.__click = function
+    def set_mousedrag_handler(self, function):
+        self.__drag = function
+    def set_canvas_background(self, color):
+        self.background = color
+    def get_canvas_textwidth(self, text, size, face='serif'):
+        return self.canvas.get_canvas_textwidth(text, size, face)
+    def start(self):
+        self.running = True
+    def stop(self):
+        self.running = False
+    
+    """d
+    Draws the provided number of frames by calling the draw handler with the headless canvas.
+    :param frames=1 :- [Optional] The number of frames to draw :- int
+    :return The canvas the frames were drawn to :- HeadlessCanvas
+    """
+    def step(self, frames=1):
+        canvas = self.canvas
+        for _ in range(frames):
+            canvas.beginFrame()
+            self.__draw(canvas)
+            self.frames += 1
+        return canvas
+    
+    """d
+    Simulates a key being pressed.
+    :param key :- The key code, as found in App.KEY_MAP :- int
+    """
+    def keyDown(self, key):
+        self.__keyDown(key)
+    """d
+    Simulates a key being released.
+    :param key :- The key code, as found in App.KEY_MAP :- int
+    """
+    def keyUp(self, key):
+        self.__keyUp(key)
+    """d
+    Simulates a mouse click.
+    :param pos :- The position of the click in format (x, y) :- tuple
+    """
+    def click(self, pos):
+        self.__click(pos)
+    """d
+    Simulates the mouse being dragged.
+    :param pos :- The position of the cursor in format (x, y) :- tuple
+    """
+    def drag(self, pos):
+        self.__drag(pos)
+"""d
+A backend with the same interface as the simplegui module that creates HeadlessFrames, for running apps and benchmarks without a window.
+Pass it to App.initialize() to use it. It is used automatically when simplegui can't be imported.
+"""
+class HeadlessBackend:
+    KEY_MAP = dict({chr(code).lower() : code for code in range(ord('A'), ord('Z') + 1)},
+                   **{str(digit) : ord('0') + digit for digit in range(10)},
+                   space=32, left=37, up=38, right=39, down=40)
+    
+    """d
+    Creates a headless frame.
+    :param title :- The title of the frame :- string
+    :param width :- The width of the canvas :- number
+    :param height :- The height of the canvas :- number
+    :param control_width=200 :- [Optional] Ignored, kept for compatibility with simplegui :- number
+    :return The new frame :- HeadlessFrame
+    """
+    def create_frame(title, width, height, control_width=200):
+        return HeadlessFrame(title, width, height)
+
+"""d
+Buckets the bounding boxes of shapes into a uniform grid so that point and area queries only look at nearby shapes.
+Shapes that move are only marked as stale, and are rebucketed the next time the index is queried.
+"""
+class SpatialIndex:
+    CELL_SIZE = 32
+    MAX_CELLS = 256
+    
+    __shapes = {}
+    __ranges = {}
+    __cells = {}
+    __oversized = set()
+    __stale = set()
+    
+    """d
+    Adds a shape to the index. The shape must provide a bounds property. Only a weak reference to the shape is kept, and it must be removed before it is collected.
+    :param shapeID :- The handle of the shape from DrawScheduler.registerShape() :- int
+    :param shape :- The shape to index :- shape
+    """
+    def insert(shapeID, shape):
+        SpatialIndex.__shapes[shapeID] = weakref.ref(shape)
+        SpatialIndex.__stale.add(shapeID)
+    
+    """d
+    Marks a shape as moved so that it is rebucketed before the next query. Shapes that are not indexed are ignored.
+    :param shapeID :- The handle of the shape from DrawScheduler.registerShape() :- int
+    """
+    def touch(shapeID):
+        if shapeID in SpatialIndex.__shapes:
+            SpatialIndex.__stale.add(shapeID)
+    
+    """d
+    Removes a shape from the index.
+    :param shapeID :- The handle of the shape from DrawScheduler.registerShape() :- int
+    """
+    def remove(shapeID):
+        SpatialIndex.__shapes.pop(shapeID, None)
+        SpatialIndex.__stale.discard(shapeID)
+        SpatialIndex.__unbucket(shapeID)
+    
+    """d
+    Finds every indexed shape whose bounds contain the provided coordinate.
+    :param x :- The x value of the coordinate to check :- number
+    :param y :- The y value of the coordinate to check :- number
+    :return The handles of the candidate shapes :- list[int]
+    """
+    def queryPoint(x, y):
+        SpatialIndex.__flush()
+        size = SpatialIndex.CELL_SIZE
+        found = list(SpatialIndex.__cells.get((int(x // size), int(y // size)), ()))
+        found.extend(SpatialIndex.__oversized)
+        return found
+    
+    """d
+    Finds every indexed shape whose bounds may overlap the provided area.
+    :param minX :- The smallest x value of the area :- number
+    :param minY :- The smallest y value of the area :- number
+    :param maxX :- The largest x value of the area :- number
+    :param maxY :- The largest y value of the area :- number
+    :return The handles of the candidate shapes :- set[int]
+    """
+    def queryRect(minX, minY, maxX, maxY):
+        SpatialIndex.__flush()
+        size = SpatialIndex.CELL_SIZE
+        cells = SpatialIndex.__cells
+        found = set(SpatialIndex.__oversized)
+        cellX0, cellX1 = int(minX // size), int(maxX // size)
+        cellY0, cellY1 = int(minY // size), int(maxY // size)
+        if (cellX1 - cellX0 + 1) * (cellY1 - cellY0 + 1) > len(cells):
+            for (cellX, cellY), bucket in cells.items():
+                if cellX0 <= cellX <= cellX1 and cellY0 <= cellY <= cellY1:
+                    found.update(bucket)
+            return found
+        for cellX in range(cellX0, cellX1 + 1):
+            for cellY in range(cellY0, cellY1 + 1):
+                bucket = cells.get((cellX, cellY))
+                if bucket:
+                    found.update(bucket)
+        return found
+    
+    """d
+    Finds every indexed shape that may be visible within the provided area, for culling shapes outside of the view.
+    When most shapes have moved since the last query, the moved shapes are checked against their bounds directly instead of being rebucketed.
+    :param minX :- The smallest x value of the area :- number
+    :param minY :- The smallest y value of the area :- number
+    :param maxX :- The largest x value of the area :- number
+    :param maxY :- The largest y value of the area :- number
+    :return The handles of the candidate shapes :- set[int]
+    """
+    def queryView(minX, minY, maxX, maxY):
+        stale = SpatialIndex.__stale
+        if len(stale) * 4 < len(SpatialIndex.__shapes):
+            return SpatialIndex.queryRect(minX, minY, maxX, maxY)
+        SpatialIndex.__stale = set()
+        found = SpatialIndex.queryRect(minX, minY, maxX, maxY)
+        SpatialIndex.__stale = stale
+        found -= stale
+        shapes = SpatialIndex.__shapes
+        for shapeID in stale:
+            shapeMinX, shapeMinY, shapeMaxX, shapeMaxY = shapes[shapeID]().bounds
+            if shapeMinX <= maxX and shapeMaxX >= minX and shapeMinY <= maxY and shapeMaxY >= minY:
+                found.add(shapeID)
+        return found
+    
+    """d
+    Removes every shape from the index.
+    """
+    def clear():
+        SpatialIndex.__shapes.clear()
+        SpatialIndex.__ranges.clear()
+        SpatialIndex.__cells.clear()
+        SpatialIndex.__oversized.clear()
+        SpatialIndex.__stale.clear()
+    
+    """d
+    Retrieves the shape that was indexed under the provided handle.
+    :param shapeID :- The handle of the shape from DrawScheduler.registerShape() :- int
+    :return The indexed shape, or None if it is not indexed :- shape
+    """
+    def get(shapeID):
+        reference = SpatialIndex.__shapes.get(shapeID)
+        return None if reference is None else reference()
+    
+    def __flush():
+        stale = SpatialIndex.__stale
+        if not stale:
+            return
+        size = SpatialIndex.CELL_SIZE
+        cells = SpatialIndex.__cells
+        ranges = SpatialIndex.__ranges
+        shapes = SpatialIndex.__shapes
+        for shapeID in stale:
+            minX, minY, maxX, maxY = shapes[shapeID]().bounds
+            newRange = (int(minX // size), int(minY // size), int(maxX // size), int(maxY // size))
+            if ranges.get(shapeID) == newRange:
+                continue
+            SpatialIndex.__unbucket(shapeID)
+            ranges[shapeID] = newRange
+            cellX0, cellY0, cellX1, cellY1 = newRange
+            if (cellX1 - cellX0 + 1) * (cellY1 - cellY0 + 1) > SpatialIndex.MAX_CELLS:
+                SpatialIndex.__oversized.add(shapeID)
+                continue
+            for cellX in range(cellX0, cellX1 + 1):
+                for cellY in range(cellY0, cellY1 + 1):
+                    bucket = cells.get((cellX, cellY))
+                    if bucket is None:
+                        cells[(cellX, cellY)] = {shapeID}
+                    else:
+                        bucket.add(shapeID)
+        stale.clear()
+    
+    def __unbucket(shapeID):
+        oldRange = SpatialIndex.__ranges.pop(shapeID, None)
+        if oldRange is None:
+            return
+        if shapeID in SpatialIndex.__oversized:
+            SpatialIndex.__oversized.discard(shapeID)
+            return
+        cells = SpatialIndex.__cells
+        cellX0, cellY0, cellX1, cellY1 = oldRange
+        for cellX in range(cellX0, cellX1 + 1):
+            for cellY in range(cellY0, cellY1 + 1):
+                bucket = cells[(cellX, cellY)]
+                bucket.discard(shapeID)
+                if not bucket:
+                    del cells[(cellX, cellY)]
+
+"""d
+Detects overlapping shapes once per frame and calls the handlers bound with App.onCollision().
+Candidate pairs are found by sorting the bounding boxes of every body along the x-axis and sweeping over them, then checked exactly:
+rectangles and circles directly, and polygons and lines using the separating axis theorem.
+"""
+class Collisions:
+    __groups = {None: 1}
+    __bodies = weakref.WeakValueDictionary()
+    __bodyGroups = {}
+    __bodyMasks = {}
+    __handlers = {}
+    __handled = set()
+    
+    """d
+    Retrieves the bit used for a collision group, creating the group if it does not exist yet. Shapes without a group are in the None group.
+    :param group :- The name of the group :- string
+    :return The bit of the group :- int
+    """
+    def groupBit(group):
+        bit = Collisions.__groups.get(group)
+        if bit is None:
+            bit = Collisions.__groups[group] = 1 << len(Collisions.__groups)
+        return bit
+    
+    """d
+    Adds a shape to the shapes checked for collisions every frame. Shapes are added automatically when they are given a collision group or bound directly with App.onCollision().
+    :param shapeID :- The handle of the shape from DrawScheduler.registerShape() :- int
+    :param shape :- The shape to check for collisions :- shape
+    """
+    def addBody(shapeID, shape):
+        Collisions.__bodies[shapeID] = shape
+    
+    """d
+    Stops checking a shape for collisions and forgets its group, mask and handlers.
+    :param shapeID :- The handle of the shape from DrawScheduler.registerShape() :- int
+    """
+    def remove(shapeID):
+        Collisions.__bodies.pop(shapeID, None)
+        Collisions.__bodyGroups.pop(shapeID, None)
+        Collisions.__bodyMasks.pop(shapeID, None)
+        if shapeID in Collisions.__handled:
+            Collisions.__handled.discard(shapeID)
+            for key in [key for key in Collisions.__handlers if shapeID in key]:
+                del Collisions.__handlers[key]
+    
+    """d
+    Retrieves the collision group of a shape.
+    :param shapeID :- The handle of the shape from DrawScheduler.registerShape() :- int
+    :return The name of the group, or None if the shape has no group :- string
+    """
+    def getGroup(shapeID):
+        return Collisions.__bodyGroups.get(shapeID)
+    
+    """d
+    Puts a shape in a collision group, adding it to the shapes checked for collisions.
+    :param shapeID :- The handle of the shape from DrawScheduler.registerShape() :- int
+    :param shape :- The shape to put in the group :- shape
+    :param group :- The name of the group, or None to remove the shape from its group :- string
+    """
+    def setGroup(shapeID, shape, group):
+        Collisions.groupBit(group)
+        Collisions.__bodyGroups[shapeID] = group
+        Collisions.addBody(shapeID, shape)
+    
+    """d
+    Retrieves the groups a shape can collide with.
+    :param shapeID :- The handle of the shape from DrawScheduler.registerShape() :- int
+    :return The names of the groups, or None if the shape collides with every group :- tuple
+    """
+    def getMask(shapeID):
+        mask = Collisions.__bodyMasks.get(shapeID)
+        if mask is None:
+            return None
+        return tuple(group for group, bit in Collisions.__groups.items() if mask & bit)
+    
+    """d
+    Limits which groups a shape can collide with.
+    :param shapeID :- The handle of the shape from DrawScheduler.registerShape() :- int
+    :param shape :- The shape to limit :- shape
+    :param groups :- The names of the groups the shape can collide with, or None to collide with every group :- list[string]
+    """
+    def setMask(shapeID, shape, groups):
+        if groups is None:
+            Collisions.__bodyMasks.pop(shapeID, None)
+        else:
+            mask = 0
+            for group in groups:
+                mask |= Collisions.groupBit(group)
+            Collisions.__bodyMasks[shapeID] = mask
+        Collisions.addBody(shapeID, shape)
+    
+    """d
+    Binds a function to be called every frame that two shapes, or shapes from two groups, overlap.
+    :param a :- A shape, or the name of a collision group :- shape, string
+    :param b :- A shape, or the name of a collision group :- shape, string
+    :param function :- The function to call. Must take in the two overlapping shapes, in the same order as a and b :- function
+    """
+    def addHandler(a, b, function):
+        keys = []
+        for side in (a, b):
+            if isinstance(side, str) or side is None:
+                Collisions.groupBit(side)
+                keys.append(side)
+            else:
+                shapeID = side._handle
+                Collisions.addBody(shapeID, side)
+                Collisions.__handled.add(shapeID)
+                keys.append(shapeID)
+        Collisions.__handlers.setdefault(tuple(keys), []).append(function)
+    
+    """d
+    Finds every pair of overlapping bodies that has a handler and calls the handlers. Called by App once per frame.
+    """
+    def step():
+        handlers = Collisions.__handlers
+        if not handlers:
+            return
+        groups = Collisions.__groups
+        bodyGroups = Collisions.__bodyGroups
+        bodyMasks = Collisions.__bodyMasks
+        
+        entries = []
+        for shapeID, shape in list(Collisions.__bodies.items()):
+            if not shape.visible:
+                continue
+            minX, minY, maxX, maxY = shape.bounds
+            group = bodyGroups.get(shapeID)
+            entries.append((minX, maxX, minY, maxY, shapeID, group, groups[group], bodyMasks.get(shapeID, -1), shape))
+        entries.sort(key=Collisions.__sortKey)
+        
+        calls = []
+        active = []
+        for entry in entries:
+            minX, maxX, minY, maxY, shapeID, group, bit, mask, shape = entry
+            active = [other for other in active if other[1] >= minX]
+            for other in active:
+                if other[2] > maxY or other[3] < minY or not (other[7] & bit and mask & other[6]):
+                    continue
+                matches = []
+                for keyA in (other[4], other[5]):
+                    for keyB in (shapeID, group):
+                        for function in handlers.get((keyA, keyB), ()):
+                            matches.append((function, other[8], shape))
+                        if (keyB, keyA) != (keyA, keyB):
+                            for function in handlers.get((keyB, keyA), ()):
+                                matches.append((function, shape, other[8]))
+                if matches and Collisions.overlaps(other[8], shape):
+                    calls.extend(matches)
+            active.append(entry)
+        
+        for function, a, b in calls:
+            function(a, b)
+    
+    def __sortKey(entry):
+        return entry[0]
+    
+    """d
+    Forgets every body and collision handler. Group names keep their bits.
+    """
+    def clear():
+        Collisions.__bodies.clear()
+        Collisions.__bodyGroups.clear()
+        Collisions.__bodyMasks.clear()
+        Collisions.__handlers.clear()
+        Collisions.__handled.clear()
+    
+    """d
+    Checks whether two shapes overlap exactly. Text and shape arrays are treated as their bounding boxes.
+    :param a :- The first shape :- shape
+    :param b :- The second shape :- shape
+    :return Whether or not the shapes overlap :- bool
+    """
+    def overlaps(a, b):
+        kindA, geometryA = Collisions.__geometry(a)
+        kindB, geometryB = Collisions.__geometry(b)
+        if kindA > kindB:
+            kindA, geometryA, kindB, geometryB = kindB, geometryB, kindA, geometryA
+        
+        if kindA == 'circle':
+            centerX, centerY, radius = geometryA
+            if kindB == 'circle':
+                return (centerX - geometryB[0]) ** 2 + (centerY - geometryB[1]) ** 2 <= (radius + geometryB[2]) ** 2
+            if kindB == 'rect':
+                minX, minY, maxX, maxY = geometryB
+                closestX = min(max(centerX, minX), maxX)
+                closestY = min(max(centerY, minY), maxY)
+                return (centerX - closestX) ** 2 + (centerY - closestY) ** 2 <= radius ** 2
+            return Collisions.__circlePolygon(centerX, centerY, radius, geometryB)
+        
+        if kindA == 'polygon':
+            if kindB == 'rect':
+                geometryB = Collisions.__rectPolygon(geometryB)
+            return Collisions.__polygonPolygon(geometryA, geometryB)
+        
+        minX, minY, maxX, maxY = geometryA
+        return geometryB[0] <= maxX and geometryB[2] >= minX and geometryB[1] <= maxY and geometryB[3] >= minY
+    
+    def __geometry(shape):
+        if isinstance(shape, Circle):
+            return ('circle', (shape.centerX, shape.centerY, abs(shape.radius)))
+        if isinstance(shape, Polygon):
+            return ('polygon', (shape.points, shape.convex))
+        if isinstance(shape, Line):
+            return ('polygon', ([(shape.startX, shape.startY), (shape.endX, shape.endY)], True))
+        return ('rect', shape.bounds)
+    
+    def __rectPolygon(bounds):
+        minX, minY, maxX, maxY = bounds
+        return ([(minX, minY), (maxX, minY), (maxX, maxY), (minX, maxY)], True)
+    
+    def __axes(points):
+        return [(points[i - 1][1] - points[i][1], points[i][0] - points[i - 1][0]) for i in range(len(points))]
+    
+    def __project(points, axis):
+        projections = [(x * axis[0]) + (y * axis[1]) for x, y in points]
+        return min(projections), max(projections)
+    
+    def __polygonPolygon(a, b):
+        pointsA, convexA = a
+        pointsB, convexB = b
+        if convexA and convexB:
+            for axis in Collisions.__axes(pointsA) + Collisions.__axes(pointsB):
+                if axis == (0, 0):
+                    continue
+                minA, maxA = Collisions.__project(pointsA, axis)
+                minB, maxB = Collisions.__project(pointsB, axis)
+                if maxA < minB or maxB < minA:
+                    return False
+            return True
+        # Concave polygons overlap if their edges cross or one is completely inside the other
+        for i in range(len(pointsA)):
+            for j in range(len(pointsB)):
+                if Collisions.__segmentsCross(pointsA[i - 1], pointsA[i], pointsB[j - 1], pointsB[j]):
+                    return True
+        return Collisions.__pointInPolygon(pointsA[0], pointsB) or Collisions.__pointInPolygon(pointsB[0], pointsA)
+    
+    def __circlePolygon(centerX, centerY, radius, polygon):
+        points, convex = polygon
+        if convex:
+            closest = min(points, key=lambda point : (point[0] - centerX) ** 2 + (point[1] - centerY) ** 2)
+            axes = Collisions.__axes(points) + [(closest[0] - centerX, closest[1] - centerY)]
+            for axisX, axisY in axes:
+                length = math.hypot(axisX, axisY)
+                if length == 0:
+                    continue
+                minP, maxP = Collisions.__project(points, (axisX / length, axisY / length))
+                center = ((centerX * axisX) + (centerY * axisY)) / length
+                if maxP < center - radius or center + radius < minP:
+                    return False
+            return True
+        if Collisions.__pointInPolygon((centerX, centerY), points):
+            return True
+        for i in range(len(points)):
+            if Collisions.__segmentDistance(centerX, centerY, points[i - 1], points[i]) <= radius:
+                return True
+        return False
+    
+    def __segmentsCross(a, b, c, d):
+        def orientation(p, q, r):
+            value = ((q[0] - p[0]) * (r[1] - p[1])) - ((q[1] - p[1]) * (r[0] - p[0]))
+            return (value > 0) - (value < 0)
+        def onSegment(p, q, r):
+            return min(p[0], r[0]) <= q[0] <= max(p[0], r[0]) and min(p[1], r[1]) <= q[1] <= max(p[1], r[1])
+        o1, o2, o3, o4 = orientation(a, b, c), orientation(a, b, d), orientation(c, d, a), orientation(c, d, b)
+        if o1 != o2 and o3 != o4:
+            return True
+        return ((o1 == 0 and onSegment(a, c, b)) or (o2 == 0 and onSegment(a, d, b))
+                or (o3 == 0 and onSegment(c, a, d)) or (o4 == 0 and onSegment(c, b, d)))
+    
+    def __segmentDistance(x, y, a, b):
+        segmentX, segmentY = b[0] - a[0], b[1] - a[1]
+        lengthSquared = (segmentX ** 2) + (segmentY ** 2)
+        t = 0 if lengthSquared == 0 else max(0, min(1, (((x - a[0]) * segmentX) + ((y - a[1]) * segmentY)) / lengthSquared))
+        return math.hypot(x - (a[0] + (t * segmentX)), y - (a[1] + (t * segmentY)))
+    
+    def __pointInPolygon(point, points):
+        x, y = point
+        inside = False
+        for i in range(len(points)):
+            x0, y0 = points[i - 1]
+            x1, y1 = points[i]
+            if (y0 > y) != (y1 > y) and x < x0 + ((y - y0) * (x1 - x0) / (y1 - y0)):
+                inside = not inside
+        return inside
+
+"""d
+Contains functions for interacting with the application window and controls.
+"""
+class App:
+    KEY_MAP = HeadlessBackend.KEY_MAP if simplegui is None else simplegui.KEY_MAP
+    CHAR_MAP = {v : k.lower() for k, v in KEY_MAP.items()}
+    
+    __guiFrame = None
+    __background = 'white'
+    defaultFill = 'black'
+    
+    __updateFunction = lambda : 1 + 1
+    __clickFunction = lambda pos : 1 + 1
+    __dragFunction = lambda pos : 1 + 1
+    
+    __profile = None
+    __lastProfile = ()
+    __profileShapes = False
+    frameBudget = 1000 / 60.0
+    
+    __tickFunction = None
+    __tickStep = 1 / 60.0
+    __tickAccumulator = 0.0
+    __lastTickTime = None
+    clock = time.perf_counter
+    maxTicksPerFrame = 5
+    droppedTicks = 0
+    taskBudget = 4
+    
+    heldKeys = set()
+    __keyEvents = []
+    __downHandlers = {}
+    __upHandlers = {}
+    __keyHoldMap = {}
+    
+    
+    def __down(key):
+        if InputLog.recording:
+            InputLog.add(InputLog.KEY_DOWN, key)
+        App.__keyEvents.append((True, key))
+    def __up(key):
+        if InputLog.recording:
+            InputLog.add(InputLog.KEY_UP, key)
+        App.__keyEvents.append((False, key))
+    def __keys():
+        if App.__keyEvents:
+            events = App.__keyEvents
+            App.__keyEvents = []
+            for down, key in events:
+                if down:
+                    App.heldKeys.add(key)
+                    handlers = App.__downHandlers
+                else:
+                    App.heldKeys.discard(key)
+                    handlers = App.__upHandlers
+                for function in handlers.get(None, ()):
+                    function(key)
+                for function in handlers.get(key, ()):
+                    function(key)
+        holdMap = App.__keyHoldMap
+        if holdMap:
+            for key in App.heldKeys & holdMap.keys():
+                for function in holdMap[key]:
+                    function()
+    def __keyCode(key):
+        return key if isinstance(key, int) else App.KEY_MAP[key]
+    def __click(pos):
+        if InputLog.recording:
+            InputLog.add(InputLog.CLICK, *pos)
+        App.__clickFunction(App.__world(pos))
+    def __drag(pos):
+        if InputLog.recording:
+            InputLog.add(InputLog.DRAG, *pos)
+        App.__dragFunction(App.__world(pos))
+    def __world(pos):
+        cameraX, cameraY = DrawScheduler.getCamera()
+        if cameraX or cameraY:
+            return (pos[0] + cameraX, pos[1] + cameraY)
+        return pos
+    def __update(canvas):
+        if InputLog.recording:
+            InputLog.addFrame()
+        App.__keys()
+        if App.__tickFunction is not None:
+            App.__tick()
+        TaskScheduler.runTimers()
+        App.__updateFunction()
+        Tweens.step()
+        Collisions.step()
+        TaskScheduler.runTasks()
+        DrawScheduler.draw(canvas)
+    def __profiledUpdate(canvas):
+        clock = time.perf_counter
+        phases = {}
+        start = clock()
+        if InputLog.recording:
+            InputLog.addFrame()
+        App.__keys()
+        phases['keys'] = clock()
+        if App.__tickFunction is not None:
+            App.__tick()
+        phases['ticks'] = clock()
+        TaskScheduler.runTimers()
+        phases['timers'] = clock()
+        App.__updateFunction()
+        phases['update'] = clock()
+        Tweens.step()
+        phases['tweens'] = clock()
+        Collisions.step()
+        phases['collisions'] = clock()
+        TaskScheduler.runTasks()
+        phases['tasks'] = clock()
+        shapeTimes = {} if App.__profileShapes else None
+        DrawScheduler.draw(canvas, shapeTimes)
+        phases['draw'] = clock()
+        
+        previous = start
+        for name, end in phases.items():
+            phases[name] = end - previous
+            previous = end
+        App.__profile.append((previous - start, phases, shapeTimes))
+    def __tick():
+        now = App.clock()
+        if App.__lastTickTime is None:
+            App.__lastTickTime = now
+            return
+        App.__tickAccumulator += now - App.__lastTickTime
+        App.__lastTickTime = now
+        
+        step = App.__tickStep
+        ticks = 0
+        while App.__tickAccumulator >= step and ticks < App.maxTicksPerFrame:
+            App.__tickFunction(step)
+            App.__tickAccumulator -= step
+            ticks += 1
+        if App.__tickAccumulator >= step:
+            # Too far behind to catch up, so the simulation slows down instead of stalling every later frame
+            dropped = int(App.__tickAccumulator // step)
+            App.droppedTicks += dropped
+            App.__tickAccumulator -= dropped * step
+    
+    def _clockState():
+        return (App.__lastTickTime, App.__tickAccumulator, Tweens._getClock())
+    def _setClockState(lastTickTime, tickAccumulator, tweenClock):
+        App.__lastTickTime = lastTickTime
+        App.__tickAccumulator = tickAccumulator
+        Tweens._setClock(tweenClock)
+    
+    def __headlessRequested():
+        return os.environ.get('CMU_HEADLESS', '').strip().lower() not in ('', '0', 'false')
+    
+    def _useFrame(frame, width, height):
+        App.__guiFrame = frame
+        DrawScheduler.setViewport(width, height)
+        TextMetrics.clear()
+        DrawScheduler.markDirty()
+    
+    """d
+    Creates the application window and starts drawing to it. Calling this again replaces the window, keeping every shape and handler.
+    :param backend=None :- [Optional] The module or class used to create the window, such as simplegui or HeadlessBackend. Defaults to simplegui, or HeadlessBackend if simplegui is not installed or the CMU_HEADLESS environment variable is set to anything other than an empty string, 0 or false, as it should be for tests and CI :- module
+    :param width=500 :- [Optional] The width of the canvas :- number
+    :param height=500 :- [Optional] The height of the canvas :- number
+    :return The created frame :- frame
+    """
+    def initialize(backend=None, width=500, height=500):
+        if backend is None:
+            backend = HeadlessBackend if simplegui is None or App.__headlessRequested() else simplegui
+        frame = backend.create_frame("Test", width, height)
+        frame.set_draw_handler(App.__update if App.__profile is None else App.__profiledUpdate)
+        frame.set_canvas_background(App.__background)
+        frame.set_keydown_handler(App.__down)
+        frame.set_keyup_handler(App.__up)
+        frame.set_mouseclick_handler(App.__click)
+        frame.set_mousedrag_handler(App.__drag)
+        App._useFrame(frame, width, height)
+        frame.start()
+        return frame
+    
+    """d
+    Retrieves the window's background color.
+    :return The background color of the window :- string
+    """
+    def getBackground():
+        return App.__background
+    """d
+    Changes the window's background color to the provided color.
+    :param color :- The desired background color :- color, string
+    """
+    def setBackground(color):
+        App.__background = Color.toCSS(color)
+        DrawScheduler.markDirty()
+        App.__guiFrame.set_canvas_background(App.__background)
+    
+    """d
+    Binds a function to be called whenever the mouse is clicked.
+    :param function :- The function to be executed when the mouse is clicked. Must take in a 2-element tuple for the position in format (x, y), which includes the camera offset :- function
+    """
+    def onMouseClick(function):
+        App.__clickFunction = function
+    """d
+    Binds a function to be called whenever a mouse button is held down and the cursor is moved.
+    :param function :- The function to be executed when the mouse is dragged. Must take in a 2-element tuple for the position in format (x, y), which includes the camera offset :- function
+    """
+    def onMouseDrag(function):
+        App.__dragFunction = function
+
+    """d
+    Binds a function to be called whenever a key is pressed down. Any number of functions can be bound, and they are called in the order they were bound.
+    Key presses are queued as they happen and delivered together at the start of the next frame.
+    :param function :- The function to be called when a key is pressed. Must take in an int for the key that was pressed, to convert between characters and numbers use App.KEY_MAP :- function
+    :param key=None :- [Optional] Only call the function when this key is pressed. Either a key name from App.KEY_MAP or a key code :- string, int
+    """
+    def onKeyDown(function, key=None):
+        App.__downHandlers.setdefault(None if key is None else App.__keyCode(key), []).append(function)
+    """d
+    Binds a function to be called whenever a key is released. Any number of functions can be bound, and they are called in the order they were bound.
+    Key releases are queued as they happen and delivered together at the start of the next frame.
+    :param function :- The function to be called when a key is released. Must take in an int for the key that was pressed, to convert between characters and numbers use App.KEY_MAP :- function
+    :param key=None :- [Optional] Only call the function when this key is released. Either a key name from App.KEY_MAP or a key code :- string, int
+    """
+    def onKeyUp(function, key=None):
+        App.__upHandlers.setdefault(None if key is None else App.__keyCode(key), []).append(function)
+    """d
+    Binds a function to be called every frame while a key is held. Any number of functions can be bound to the same key.
+    :param key :- The key to bind this function to. Either a key name from App.KEY_MAP or a key code :- string, int
+    :param function :- The function to be called while the provided key is held. This function must accept no arguments :- function
+    """
+    def whileKeyDown(key, function):
+        App.__keyHoldMap.setdefault(App.__keyCode(key), []).append(function)
+    """d
+    Unbinds a function bound using App.onKeyDown(), App.onKeyUp() or App.whileKeyDown(). Functions that are not bound are ignored.
+    :param function :- The function to unbind :- function
+    """
+    def removeKeyHandler(function):
+        for handlers in (App.__downHandlers, App.__upHandlers, App.__keyHoldMap):
+            for key in list(handlers):
+                functions = [bound for bound in handlers[key] if bound is not function]
+                if functions:
+                    handlers[key] = functions
+                else:
+                    del handlers[key]
+    """d
+    Checks whether or not a key is currently held down.
+    :param key :- The key to check. Either a key name from App.KEY_MAP or a key code :- string, int
+    :return Whether or not the key is held :- bool
+    """
+    def isKeyDown(key):
+        return App.__keyCode(key) in App.heldKeys
+
+    """d
+    Binds a function to be called every time the window is updated. This occurs roughly 60 times a second under ideal conditions.
+    :param function :- The function to be called every update. This function must accept no arguments :- function
+    """
+    def onUpdate(function):
+        App.__updateFunction = function
+    
+    """d
+    Binds a function to be called at a fixed rate, independent of how fast the window is drawn. After a slow frame the function is called several times to catch up, up to App.maxTicksPerFrame times, and any ticks beyond that are skipped and counted in App.droppedTicks.
+    Ticks run before the App.onUpdate() function each frame, measuring time with App.clock, which can be replaced to run a simulation deterministically. Use App.getTickAlpha() to draw shapes between their last two simulated positions.
+    :param function :- The function to be called every tick, or None to stop ticking. Must take in a float for the seconds of time simulated by the tick :- function
+    :param hz=60 :- [Optional] The number of ticks per second :- number
+    """
+    def onTick(function, hz=60):
+        App.__tickFunction = function
+        App.__tickStep = 1.0 / hz
+        App.__tickAccumulator = 0.0
+        App.__lastTickTime = None
+    """d
+    Calls a function once after a delay. Timers are checked once per frame, before App.onUpdate(), so the function is called on the first frame after the delay has passed.
+    :param ms :- The delay in milliseconds :- number
+    :param function :- The function to call. Must accept no arguments :- function
+    :return The timer, which can be cancelled using its cancel() method :- Timer
+    """
+    def after(ms, function):
+        timer = Timer(function, (App.clock() * 1000) + ms)
+        TaskScheduler.schedule(timer)
+        return timer
+    """d
+    Calls a function repeatedly, every time the provided interval passes. If frames are too slow to keep up, missed calls are skipped.
+    :param ms :- The interval in milliseconds :- number
+    :param function :- The function to call. Must accept no arguments :- function
+    :return The timer, which can be stopped using its cancel() method :- Timer
+    """
+    def every(ms, function):
+        if ms <= 0:
+            raise ValueError("The interval must be greater than 0")
+        timer = Timer(function, (App.clock() * 1000) + ms, ms)
+        TaskScheduler.schedule(timer)
+        return timer
+    """d
+    Runs a generator or coroutine a little every frame, so long work such as pathfinding does not freeze the window. Tasks share App.taskBudget milliseconds of every frame.
+    A generator gives up its turn every time it yields, and a coroutine every time it awaits App.pause().
+    :param routine :- The generator or coroutine to run :- generator, coroutine
+    :return The task, which has done and result attributes and can be stopped using its cancel() method :- Task
+    """
+    def spawn(routine):
+        task = Task(routine)
+        TaskScheduler.start(task)
+        return task
+    """d
+    Gives up the rest of a coroutine task's turn when awaited, as in await App.pause(). Generators use yield instead.
+    :return Something to await :- awaitable
+    """
+    def pause():
+        return _Pause()
+    
+    """d
+    Retrieves how far the current frame is between the last tick and the next one, for interpolating drawn positions between ticks.
+    :return The fraction of a tick that has passed since the last tick, from 0 to 1 :- float
+    """
+    def getTickAlpha():
+        return App.__tickAccumulator / App.__tickStep
+    
+    """d
+    Calculates the width that a string of text will take up. Widths are cached using TextMetrics.
+    :param text :- The text to find the width of :- string
+    :param size :- The font size of the text :- number
+    :param font='serif' :- [Optional] The font face of the text :- string
+    :return The width of the text :- int
+    """
+    def textSize(text, size, font='serif'):
+        return TextMetrics.measure(text, size, font)
+    
+    """d
+    Retrieves the frame created by App.initialize().
+    :return The frame of the application window :- frame
+    """
+    def getFrame():
+        return App.__guiFrame
+    
+    """d
+    Counts how many frames had to run every drawer and how many replayed the previous frame because nothing changed.
+    :return The frame counts in format {'dirty': int, 'clean': int} :- dict
+    """
+    def frameCounts():
+        return {'dirty': DrawScheduler.dirtyFrames, 'clean': DrawScheduler.cleanFrames}
+    """d
+    Counts how many shapes were drawn in the last frame that ran every drawer, and how many were skipped for being outside of the view.
+    :return The shape counts in format {'drawn': int, 'culled': int} :- dict
+    """
+    def cullCounts():
+        return {'drawn': DrawScheduler.drawnShapes, 'culled': DrawScheduler.culledShapes}
+    
+    """d
+    Moves the camera so that the provided coordinate is drawn at the 'top-left' corner of the window. Shapes keep their coordinates, and are drawn shifted by the camera.
+    :param x :- The x-coordinate of the 'top-left' corner of the view :- number
+    :param y :- The y-coordinate of the 'top-left' corner of the view :- number
+    """
+    def setCamera(x, y):
+        DrawScheduler.setCamera(x, y)
+    """d
+    Retrieves the coordinate drawn at the 'top-left' corner of the window.
+    :return The position of the camera in format (x, y) :- tuple
+    """
+    def getCamera():
+        return DrawScheduler.getCamera()
+    
+    """d
+    Starts timing every frame and each phase of it: calling the held key handlers, App.onTick(), timers, App.onUpdate(), advancing tweens, checking collisions, running tasks and drawing. While profiling is disabled it has no cost at all.
+    :param shapeTypes=False :- [Optional] Whether or not to also time how long each type of shape takes to draw, which slows drawing down slightly :- bool
+    :param capacity=600 :- [Optional] The number of most recent frames to keep :- int
+    """
+    def enableProfiling(shapeTypes=False, capacity=600):
+        App.__profile = collections.deque(maxlen=capacity)
+        App.__profileShapes = shapeTypes
+        if App.__guiFrame is not None:
+            App.__guiFrame.set_draw_handler(App.__profiledUpdate)
+    """d
+    Stops timing frames. The frames recorded so far are kept until profiling is enabled again.
+    """
+    def disableProfiling():
+        if App.__guiFrame is not None:
+            App.__guiFrame.set_draw_handler(App.__update)
+        App.__profileShapes = False
+        if App.__profile is not None:
+            App.__lastProfile = App.__profile
+        App.__profile = None
+    
+    def __samples():
+        return App.__lastProfile if App.__profile is None else App.__profile
+    
+    """d
+    Summarizes the frames recorded since profiling was enabled. Times are in milliseconds, and a frame is dropped if it took longer than App.frameBudget.
+    :return The statistics in format {'frames', 'p50', 'p95', 'max', 'droppedFrames', 'phases', 'shapeTypes', 'dirty', 'clean'}, where phases and shapeTypes hold the mean time of each :- dict
+    """
+    def frameStats():
+        samples = App.__samples()
+        count = len(samples)
+        frameTimes = sorted(sample[0] * 1000 for sample in samples)
+        def percentile(fraction):
+            return frameTimes[min(count - 1, int(fraction * count))] if count else 0.0
+        phases = {}
+        shapeTypes = {}
+        for sample in samples:
+            for name, seconds in sample[1].items():
+                phases[name] = phases.get(name, 0.0) + seconds * 1000
+            for kind, seconds in (sample[2] or {}).items():
+                shapeTypes[kind] = shapeTypes.get(kind, 0.0) + seconds * 1000
+        return {
+            'frames': count,
+            'p50': percentile(0.5),
+            'p95': percentile(0.95),
+            'max': frameTimes[-1] if count else 0.0,
+            'droppedFrames': sum(1 for frameTime in frameTimes if frameTime > App.frameBudget),
+            'phases': {name: total / count for name, total in phases.items()},
+            'shapeTypes': {kind: total / count for kind, total in shapeTypes.items()},
+            'dirty': DrawScheduler.dirtyFrames,
+            'clean': DrawScheduler.cleanFrames,
+        }
+    """d
+    Exports the frame statistics along with every recorded frame as JSON.
+    :param path=None :- [Optional] The file to write the JSON to :- string
+    :return The JSON string :- string
+    """
+    def exportFrameStats(path=None):
+        samples = App.__samples()
+        frames = [{'frame': sample[0] * 1000,
+                   'phases': {name: seconds * 1000 for name, seconds in sample[1].items()},
+                   'shapeTypes': {kind: seconds * 1000 for kind, seconds in (sample[2] or {}).items()}} for sample in samples]
+        text = json.dumps({'stats': App.frameStats(), 'frames': frames}, indent=2)
+        if path is not None:
+            with open(path, 'w') as file:
+                file.write(text)
+        return text
+    
+    """d
+    Starts or stops remembering the file and line every shape is created on, which App.leakReport() groups the live shapes by. Creating shapes is slower while enabled.
+    :param enabled=True :- [Optional] Whether or not to remember where shapes are created :- bool
+    """
+    def trackAllocations(enabled=True):
+        DrawScheduler.trackSites = enabled
+    """d
+    Reports the shapes that are still alive, for finding shapes that are kept around by mistake. Every shape that has not been removed is counted, since shapes stay in the window until remove() is called.
+    Shapes created while DrawScheduler.weakOwners was enabled are only counted if something still refers to them, as garbage is collected first.
+    The places shapes were created on are only known for the shapes created while App.trackAllocations() was enabled.
+    :param top=5 :- [Optional] The number of places to list for each type of shape, starting with the one that created the most :- int
+    :return The report in format {'total': int, 'types': {typeName: {'count': int, 'sites': [('file:line', int)]}}}, with the most common types first :- dict
+    """
+    def leakReport(top=5):
+        gc.collect()
+        live = DrawScheduler.liveShapes()
+        types = {}
+        for name, entry in sorted(live.items(), key=lambda item : -item[1]['count']):
+            sites = sorted(entry['sites'].items(), key=lambda item : -item[1])[:top]
+            types[name] = {'count': entry['count'], 'sites': sites}
+        return {'total': sum(entry['count'] for entry in live.values()), 'types': types}
+    
+    """d
+    Binds a function to be called once every frame that two shapes overlap. Either side can also be the name of a collision group, set using a shape's collisionGroup, to handle every shape in that group.
+    :param a :- A shape, or the name of a collision group :- shape, string
+    :param b :- A shape, or the name of a collision group :- shape, string
+    :param function :- The function to be called while the shapes overlap. Must take in the two overlapping shapes, in the same order as a and b :- function
+    """
+    def onCollision(a, b, function):
+        Collisions.addHandler(a, b, function)
+    
+    """d
+    Starts recording every key press, key release, mouse click, mouse drag and frame into an InputLog, which can later be replayed using App.replay().
+    """
+    def startRecording():
+        InputLog.start()
+    """d
+    Stops recording input.
+    :param path=None :- [Optional] The file to write the recording to :- string
+    :return The recording :- bytes
+    """
+    def stopRecording(path=None):
+        return InputLog.stop(path)
+    """d
+    Replays a recording made using App.startRecording() on a headless window, as fast as possible, timing every frame. The shapes and handlers the recording depends on must be created first.
+    :param recording :- The recording, or the path of a file containing it :- bytes, string
+    :return The results in format {'frames', 'seconds', 'p50', 'p95', 'max', 'frameTimes'}, with frame times in milliseconds :- dict
+    """
+    def replay(recording):
+        return InputLog.replay(recording)
+    
+    """d
+    Animates properties of a shape from their current values to the provided values. Every tween advances once per frame, after App.onUpdate().
+    Numbers, colors and the columns of shape arrays, such as x or radius, can be animated. Colors are blended in the color space of the target color.
+    :param shape :- The shape to animate :- shape
+    :param duration=1000 :- [Optional] How long the animation takes in milliseconds :- number
+    :param easing='linear' :- [Optional] The name of an easing in Tweens.EASINGS, or a function mapping progress from 0 to 1 onto 0 to 1 :- string, function
+    :param properties :- The properties to animate as keyword arguments, such as centerX=100 or fill=RGB(255, 0, 0) :- any
+    :return The started tween, which can be used to chain more tweens with then() :- Tween
+    """
+    def animate(shape, duration=1000, easing='linear', **properties):
+        tween = Tween(shape, duration, easing, properties)
+        Tweens.start(tween)
+        return tween
+    
+    """d
+    Compiles shapes that rarely change, such as scenery, into a single DisplayList that replays their draw calls every frame instead of drawing each shape.
+    The shapes can still be changed as normal, and the list is recompiled the next frame after one of them changes.
+    :param shapes :- The shapes to freeze. Each shape can only be in one display list :- list
+    :return The display list drawing the shapes. Call its release() method to draw the shapes normally again :- DisplayList
+    """
+    def freeze(shapes):
+        return DisplayList(shapes)
+    
+    """d
+    Adds a named layer that shapes can be placed on using their layer property. Layers with a higher order are drawn in front of layers with a lower order. Shapes start on the 'default' layer, which has an order of 0.
+    :param name :- The name of the layer :- string
+    :param order :- Where the layer is drawn relative to the other layers. Must not be used by another layer :- number
+    """
+    def addLayer(name, order):
+        DrawScheduler.addLayer(name, order)
+    
+    """d
+    Finds every visible shape that contains the provided coordinate, such as the position passed to App.onMouseClick().
+    :param x :- The x value of the coordinate to check :- number
+    :param y :- The y value of the coordinate to check :- number
+    :return The shapes containing the coordinate in the order they are drawn, so the top-most shape is last :- list
+    """
+    def shapesAt(x, y):
+        hits = []
+        for shapeID in SpatialIndex.queryPoint(x, y):
+            shape = SpatialIndex.get(shapeID)
+            if shape.visible and shape.contains(x, y):
+                hits.append(shapeID)
+        hits.sort(key=DrawScheduler.drawKey)
+        return [SpatialIndex.get(shapeID) for shapeID in hits]
+    """d
+    Finds every visible shape whose bounding box overlaps the provided rectangle.
+    :param startX :- The x-coordinate of the 'top-left' corner of the rectangle :- number
+    :param startY :- The y-coordinate of the 'top-left' corner of the rectangle :- number
+    :param width :- The width, or size along the x-axis, of the rectangle :- number
+    :param height :- The height, or size along the y-axis of the rectangle :- number
+    :return The overlapping shapes in the order they are drawn, so the top-most shape is last :- list
+    """
+    def shapesInRect(startX, startY, width, height):
+        minX, maxX = min(startX, startX + width), max(startX, startX + width)
+        minY, maxY = min(startY, startY + height), max(startY, startY + height)
+        hits = []
+        for shapeID in SpatialIndex.queryRect(minX, minY, maxX, maxY):
+            shape = SpatialIndex.get(shapeID)
+            if not shape.visible:
+                continue
+            shapeMinX, shapeMinY, shapeMaxX, shapeMaxY = shape.bounds
+            if shapeMinX <= maxX and shapeMaxX >= minX and shapeMinY <= maxY and shapeMaxY >= minY:
+                hits.append(shapeID)
+        hits.sort(key=DrawScheduler.drawKey)
+        return [SpatialIndex.get(shapeID) for shapeID in hits]
+
+"""d
+Caches the widths of strings of text, so that the window only has to measure each string once.
+Also keeps a table of the width of every character of each font, used to quickly estimate the width of strings that were never measured.
+"""
+class TextMetrics:
+    CACHE_SIZE = 2048
+    GLYPH_SIZE = 100
+    
+    """d
+    Whether or not to estimate the width of strings that aren't cached using the character width table instead of asking the window, which is faster but less exact.
+    :type bool
+    """
+    estimateMisses = False
+    
+    __widths = collections.OrderedDict()
+    __glyphs = {}
+    
+    """d
+    Calculates the width that a string of text will take up, asking the window only if the string has not been measured recently.
+    :param text :- The text to find the width of :- string
+    :param size :- The font size of the text :- number
+    :param font='serif' :- [Optional] The font face of the text :- string
+    :return The width of the text :- number
+    """
+    def measure(text, size, font='serif'):
+        key = (text, size, font)
+        widths = TextMetrics.__widths
+        width = widths.get(key)
+        if width is not None:
+            widths.move_to_end(key)
+            return width
+        if TextMetrics.estimateMisses:
+            width = TextMetrics.estimate(text, size, font)
+        else:
+            width = App.getFrame().get_canvas_textwidth(text, size, font)
+        widths[key] = width
+        if len(widths) > TextMetrics.CACHE_SIZE:
+            widths.popitem(last=False)
+        return width
+    
+    """d
+    Estimates the width of a string of text by adding up the widths of its characters. Each character is only measured once per font.
+    :param text :- The text to find the width of :- string
+    :param size :- The font size of the text :- number
+    :param font='serif' :- [Optional] The font face of the text :- string
+    :return The estimated width of the text :- float
+    """
+    def estimate(text, size, font='serif'):
+        glyphs = TextMetrics.__glyphs.get(font)
+        if glyphs is None:
+            glyphs = TextMetrics.__glyphs[font] = {}
+        total = 0
+        for character in text:
+            width = glyphs.get(character)
+            if width is None:
+                width = glyphs[character] = App.getFrame().get_canvas_textwidth(character, TextMetrics.GLYPH_SIZE, font)
+            total += width
+        return total * size / TextMetrics.GLYPH_SIZE
+    
+    """d
+    Forgets every measured width. Must be called when the window, and therefore the way text is measured, changes.
+    """
+    def clear():
+        TextMetrics.__widths.clear()
+        TextMetrics.__glyphs.clear()
+
+"""d
+An animation of one or more properties of a shape from their current values to target values, created using App.animate().
+Tweens can be chained using then(), and every active tween is advanced together once per frame by Tweens.
+"""
+class Tween:
+    """d
+    Constructs a tween. Tweens are usually created using App.animate() or Tween.then() instead.
+    :param shape :- The shape to animate :- shape
+    :param duration :- How long the animation takes in milliseconds :- number
+    :param easing :- The name of an easing in Tweens.EASINGS, or a function mapping progress from 0 to 1 onto 0 to 1 :- string, function
+    :param properties :- The names of the properties to animate and the values to animate them to :- dict
+    """
+    def __init__(self, shape, duration, easing, properties):
+        self.shape = shape
+        self.duration = max(float(duration), 0.0)
+        self.properties = properties
+        self.finished = False
+        self._row = Tweens.easingRow(easing)
+        self._startTime = None
+        self._next = []
+        self._finishFunctions = []
+    
+    """d
+    Adds a tween that starts once this one finishes, animating from wherever the properties are at that point.
+    :param shape=None :- [Optional] The shape to animate. Defaults to the shape of this tween :- shape
+    :param duration=1000 :- [Optional] How long the animation takes in milliseconds :- number
+    :param easing='linear' :- [Optional] The name of an easing in Tweens.EASINGS, or a function mapping progress from 0 to 1 onto 0 to 1 :- string, function
+    :param properties :- The properties to animate as keyword arguments, such as centerX=100 or fill=RGB(255, 0, 0) :- any
+    :return The new tween, so that more tweens can be chained after it :- Tween
+    """
+    def then(self, shape=None, duration=1000, easing='linear', **properties):
+        tween = Tween(self.shape if shape is None else shape, duration, easing, properties)
+        if self.finished:
+            Tweens.start(tween)
+        else:
+            self._next.append(tween)
+        return tween
+    
+    """d
+    Binds a function to be called when the tween finishes. Cancelled tweens do not finish.
+    :param function :- The function to call. Must take in the tween that finished :- function
+    :return This tween :- Tween
+    """
+    def onFinish(self, function):
+        self._finishFunctions.append(function)
+        return self
+    
+    """d
+    Stops the tween where it is, without finishing it or starting the tweens chained after it.
+    """
+    def cancel(self):
+        Tweens.cancel(self)
+
+"""d
+Advances every active tween once per frame in a single pass. Easings are precomputed into lookup tables of Tweens.TABLE_SIZE entries.
+Numbers are interpolated directly, colors are interpolated in the color space of the target color, taking the shortest way around the hue for HSL,
+and the columns of shape arrays are interpolated as whole arrays. When NumPy is installed the progress of every tween is computed at once.
+"""
+class Tweens:
+    TABLE_SIZE = 1024
+    EASINGS = {
+        'linear': lambda t : t,
+        'easeIn': lambda t : t * t,
+        'easeOut': lambda t : t * (2 - t),
+        'easeInOut': lambda t : 2 * t * t if t < 0.5 else 1 - ((-2 * t + 2) ** 2) / 2,
+        'easeInCubic': lambda t : t ** 3,
+        'easeOutCubic': lambda t : 1 - ((1 - t) ** 3),
+        'easeInOutCubic': lambda t : 4 * (t ** 3) if t < 0.5 else 1 - ((-2 * t + 2) ** 3) / 2,
+        'easeInSine': lambda t : 1 - math.cos(t * math.pi / 2),
+        'easeOutSine': lambda t : math.sin(t * math.pi / 2),
+        'easeInOutSine': lambda t : (1 - math.cos(t * math.pi)) / 2,
+        'easeOutBack': lambda t : 1 + (2.70158 * ((t - 1) ** 3)) + (1.70158 * ((t - 1) ** 2)),
+        'easeOutBounce': lambda t : Tweens.bounce(t),
+    }
+    
+    __rows = {}
+    __tables = []
+    __matrix = None
+    __active = []
+    __layout = None
+    __time = 0.0
+    __lastClock = None
+    
+    """d
+    The bounce easing, which bounces against its end value like a dropped ball.
+    :param t :- The progress of the animation, from 0 to 1 :- float
+    :return The eased progress :- float
+    """
+    def bounce(t):
+        if t < 1 / 2.75:
+            return 7.5625 * t * t
+        if t < 2 / 2.75:
+            t -= 1.5 / 2.75
+            return (7.5625 * t * t) + 0.75
+        if t < 2.5 / 2.75:
+            t -= 2.25 / 2.75
+            return (7.5625 * t * t) + 0.9375
+        t -= 2.625 / 2.75
+        return (7.5625 * t * t) + 0.984375
+    
+    """d
+    Retrieves the row of the lookup table for an easing, precomputing it the first time the easing is used.
+    :param easing :- The name of an easing in Tweens.EASINGS, or a function mapping progress from 0 to 1 onto 0 to 1 :- string, function
+    :return The row of the easing :- int
+    """
+    def easingRow(easing):
+        row = Tweens.__rows.get(easing)
+        if row is None:
+            function = Tweens.EASINGS.get(easing) if isinstance(easing, str) else easing
+            if function is None:
+                raise ValueError(f"Unknown easing '{easing}', expected one of {', '.join(Tweens.EASINGS)}")
+            last = Tweens.TABLE_SIZE - 1
+            table = [float(function(i / last)) for i in range(Tweens.TABLE_SIZE)]
+            row = Tweens.__rows[easing] = len(Tweens.__tables)
+            Tweens.__tables.append(table)
+            Tweens.__matrix = None
+        return row
+    
+    """d
+    Starts a tween from the current values of its properties.
+    :param tween :- The tween to start :- Tween
+    """
+    def start(tween):
+        if tween._startTime is not None:
+            return
+        tween._startTime = Tweens.__time
+        shape = tween.shape
+        channels = []
+        for name, end in tween.properties.items():
+            start = getattr(shape, name)
+            if isinstance(end, (Color, str)):
+                colorType = type(end) if isinstance(end, Color) else type(Color.parse(end) or RGBA(0, 0, 0, 0))
+                startValues = Color.components(start, colorType)
+                endValues = Color.components(end, colorType)
+                deltas = [b - a for a, b in zip(startValues, endValues)]
+                if colorType in (HSL, HSLA):
+                    deltas[0] = ((deltas[0] + 180) % 360) - 180
+                channels.append(('color', name, (colorType, startValues, deltas), end))
+            elif numpy is not None and isinstance(start, numpy.ndarray):
+                startValues = start.astype('float64')
+                channels.append(('array', name, (startValues, numpy.broadcast_to(end, start.shape) - startValues), end))
+            elif isinstance(start, array.array):
+                ends = end if hasattr(end, '__len__') else [end] * len(start)
+                channels.append(('array', name, (start.tolist(), [b - a for a, b in zip(start, ends)]), end))
+            else:
+                channels.append(('number', name, (start, end - start), end))
+        tween._channels = channels
+        Tweens.__active.append(tween)
+        Tweens.__layout = None
+    
+    """d
+    Stops a tween without finishing it. Tweens that are not active are ignored.
+    :param tween :- The tween to stop :- Tween
+    """
+    def cancel(tween):
+        if tween in Tweens.__active:
+            Tweens.__active.remove(tween)
+            Tweens.__layout = None
+    
+    """d
+    Stops every tween animating the provided shape, without finishing them.
+    :param shape :- The shape to stop animating :- shape
+    """
+    def cancelShape(shape):
+        active = [tween for tween in Tweens.__active if tween.shape is not shape]
+        if len(active) != len(Tweens.__active):
+            Tweens.__active = active
+            Tweens.__layout = None
+    
+    """d
+    The number of tweens currently animating.
+    :return The number of active tweens :- int
+    """
+    def count():
+        return len(Tweens.__active)
+    
+    """d
+    Stops every tween.
+    """
+    def clear():
+        Tweens.__active = []
+        Tweens.__layout = None
+    
+    def _getClock():
+        return Tweens.__lastClock
+    def _setClock(clock):
+        Tweens.__lastClock = clock
+    
+    def __compile():
+        # Number channels are gathered into columns so they can be interpolated together
+        active = Tweens.__active
+        # Property setters are looked up once here, and shapes are only notified of a move once per step however many of their properties are animated
+        owners, shapes, setters, starts, deltas, others = [], [], [], [], [], []
+        for index, tween in enumerate(active):
+            for channel in tween._channels:
+                if channel[0] == 'number':
+                    shape, name = tween.shape, channel[1]
+                    setter = getattr(type(shape), name, None)
+                    owners.append(index)
+                    shapes.append(shape)
+                    setters.append(setter.fset if isinstance(setter, property) and setter.fset is not None else lambda shape, value, name=name : setattr(shape, name, value))
+                    starts.append(channel[2][0])
+                    deltas.append(channel[2][1])
+                else:
+                    others.append((index, tween.shape, channel))
+        startTimes = [tween._startTime for tween in active]
+        durations = [tween.duration for tween in active]
+        rows = [tween._row for tween in active]
+        if numpy is not None:
+            if Tweens.__matrix is None:
+                Tweens.__matrix = numpy.array(Tweens.__tables)
+            owners, starts, deltas = numpy.array(owners, dtype='int64'), numpy.array(starts, dtype='float64'), numpy.array(deltas, dtype='float64')
+            startTimes, durations, rows = numpy.array(startTimes), numpy.array(durations), numpy.array(rows, dtype='int64')
+        Tweens.__layout = (startTimes, durations, rows, owners, shapes, setters, starts, deltas, others)
+    
+    """d
+    Advances every active tween to the current time, finishing the ones that are done and starting the tweens chained after them. Called by App once per frame.
+    """
+    def step():
+        now = App.clock()
+        if Tweens.__lastClock is not None:
+            Tweens.__time += (now - Tweens.__lastClock) * 1000
+        Tweens.__lastClock = now
+        if not Tweens.__active:
+            return
+        if Tweens.__layout is None:
+            Tweens.__compile()
+        startTimes, durations, rows, owners, shapes, setters, starts, deltas, others = Tweens.__layout
+        last = Tweens.TABLE_SIZE - 1
+        
+        if numpy is not None:
+            progress = numpy.clip((Tweens.__time - startTimes) / numpy.maximum(durations, 1e-9), 0.0, 1.0)
+            eased = Tweens.__matrix[rows, (progress * last + 0.5).astype('int64')]
+            values = (starts + (deltas * eased[owners])).tolist()
+            eased = eased.tolist()
+            done = numpy.flatnonzero(progress >= 1.0).tolist()
+        else:
+            tables = Tweens.__tables
+            progress = [min(max((Tweens.__time - start) / max(duration, 1e-9), 0.0), 1.0) for start, duration in zip(startTimes, durations)]
+            eased = [tables[row][int(t * last + 0.5)] for row, t in zip(rows, progress)]
+            values = [start + (delta * eased[owner]) for owner, start, delta in zip(owners, starts, deltas)]
+            done = [index for index, t in enumerate(progress) if t >= 1.0]
+        
+        Shape._holdMoves()
+        try:
+            for setter, shape, value in zip(setters, shapes, values):
+                setter(shape, value)
+        finally:
+            Shape._releaseMoves()
+        for index, shape, channel in others:
+            Tweens.__apply(shape, channel, eased[index])
+        
+        if done:
+            active = Tweens.__active
+            finished = [active[index] for index in done]
+            for index in reversed(done):
+                del active[index]
+            Tweens.__layout = None
+            for tween in finished:
+                Tweens.__finish(tween)
+    
+    def __apply(shape, channel, eased):
+        kind, name, data, end = channel
+        if kind == 'color':
+            colorType, starts, deltas = data
+            values = [round(start + (delta * eased), 1) for start, delta in zip(starts, deltas)]
+            if colorType in (HSL, HSLA):
+                values[0] %= 360
+            if colorType in (RGBA, HSLA):
+                values[3] = round(starts[3] + (deltas[3] * eased), 3)
+            setattr(shape, name, colorType(*values))
+        elif numpy is not None and isinstance(data[0], numpy.ndarray):
+            getattr(shape, name)[:] = data[0] + (data[1] * eased)
+            shape.markChanged()
+        else:
+            column = getattr(shape, name)
+            for i, (start, delta) in enumerate(zip(*data)):
+                column[i] = type(column[i])(start + (delta * eased))
+            shape.markChanged()
+    
+    def __finish(tween):
+        shape = tween.shape
+        for kind, name, data, end in tween._channels:
+            if kind == 'array':
+                ShapeArray.copyInto(getattr(shape, name), end if hasattr(end, '__len__') else [end] * len(shape))
+                shape.markChanged()
+            else:
+                setattr(shape, name, end)
+        tween.finished = True
+        # Chained tweens start exactly when this one ended, so chains do not drift by a frame each step
+        for following in tween._next:
+            Tweens.start(following)
+            following._startTime = tween._startTime + tween.duration
+        for function in tween._finishFunctions:
+            function(tween)
+
+"""d
+Records the input App receives, along with the time of every frame, into a compact binary log that can be replayed headlessly.
+Every entry is one byte for its kind followed by its values: an int for key events, two floats for mouse events and a double for the time of a frame, in seconds since recording started.
+Replaying drives App.clock from the recorded times, so fixed-timestep ticks and tweens advance exactly as they did while recording.
+The header also stores how far the tick and tween clocks were into their step when recording started, which replaying starts from.
+"""
+class InputLog:
+    MAGIC = b'CMUI'
+    VERSION = 2
+    CLOCKS = struct.Struct('<ddd')
+    KEY_DOWN = 1
+    KEY_UP = 2
+    CLICK = 3
+    DRAG = 4
+    FRAME = 5
+    STRUCTS = {
+        KEY_DOWN: struct.Struct('<Bi'),
+        KEY_UP: struct.Struct('<Bi'),
+        CLICK: struct.Struct('<Bff'),
+        DRAG: struct.Struct('<Bff'),
+        FRAME: struct.Struct('<Bd'),
+    }
+    
+    recording = False
+    __buffer = None
+    __start = 0.0
+    
+    """d
+    Starts recording input, discarding anything recorded before.
+    """
+    def start():
+        InputLog.__start = App.clock()
+        lastTickTime, tickAccumulator, tweenClock = App._clockState()
+        InputLog.__buffer = bytearray(InputLog.MAGIC)
+        InputLog.__buffer.append(InputLog.VERSION)
+        InputLog.__buffer += InputLog.CLOCKS.pack(math.nan if lastTickTime is None else lastTickTime - InputLog.__start, tickAccumulator,
+                                                  math.nan if tweenClock is None else tweenClock - InputLog.__start)
+        InputLog.recording = True
+    
+    """d
+    Stops recording input.
+    :param path=None :- [Optional] The file to write the log to :- string
+    :return The recorded log :- bytes
+    """
+    def stop(path=None):
+        data = bytes(InputLog.__buffer or b'')
+        InputLog.__buffer = None
+        InputLog.recording = False
+        if path is not None:
+            with open(path, 'wb') as file:
+                file.write(data)
+        return data
+    
+    """d
+    Adds an entry to the log while recording. Called by App as input arrives.
+    :param kind :- The kind of entry, such as InputLog.KEY_DOWN :- int
+    :param values :- The values of the entry :- number
+    """
+    def add(kind, *values):
+        InputLog.__buffer += InputLog.STRUCTS[kind].pack(kind, *values)
+    """d
+    Adds a frame entry with the current time to the log while recording. Called by App at the start of every frame.
+    """
+    def addFrame():
+        InputLog.__buffer += InputLog.STRUCTS[InputLog.FRAME].pack(InputLog.FRAME, App.clock() - InputLog.__start)
+    
+    """d
+    Reads the entries of a log.
+    :param data :- The log, or the path of a file containing it :- bytes, string
+    :return The entries in format (kind, values) :- generator
+    """
+    def read(data):
+        data, offset, clocks = InputLog.__open(data)
+        while offset < len(data):
+            entry = InputLog.STRUCTS.get(data[offset])
+            if entry is None:
+                raise ValueError(f"Unknown entry kind {data[offset]} at byte {offset}")
+            values = entry.unpack_from(data, offset)
+            offset += entry.size
+            yield values[0], values[1:]
+    
+    def __open(data):
+        if isinstance(data, str):
+            with open(data, 'rb') as file:
+                data = file.read()
+        header = len(InputLog.MAGIC) + 1
+        if data[:len(InputLog.MAGIC)] != InputLog.MAGIC or len(data) < header:
+            raise ValueError("Not an input log")
+        version = data[len(InputLog.MAGIC)]
+        if version == 1:
+            return data, header, (None, 0.0, None)
+        if version != InputLog.VERSION or len(data) < header + InputLog.CLOCKS.size:
+            raise ValueError(f"Unsupported input log version {version}")
+        lastTickTime, tickAccumulator, tweenClock = InputLog.CLOCKS.unpack_from(data, header)
+        clocks = (None if math.isnan(lastTickTime) else lastTickTime, tickAccumulator, None if math.isnan(tweenClock) else tweenClock)
+        return data, header + InputLog.CLOCKS.size, clocks
+    
+    """d
+    Replays a log on a headless window as fast as possible, timing every frame.
+    The tick and tween clocks start where they were when recording started, and timers keep the time they had left.
+    Afterwards the clocks continue from where they were before replaying, and the previous window is used again.
+    :param data :- The log, or the path of a file containing it :- bytes, string
+    :param backend=HeadlessBackend :- [Optional] The backend to create the window with. Must create frames with a step() method :- module
+    :return The results in format {'frames', 'seconds', 'p50', 'p95', 'max', 'frameTimes'}, with frame times in milliseconds :- dict
+    """
+    def replay(data, backend=HeadlessBackend):
+        data, offset, clocks = InputLog.__open(data)
+        now = [0.0]
+        clock = App.clock
+        replayStart = clock()
+        state = App._clockState()
+        previousFrame = App.getFrame()
+        viewport = DrawScheduler.getViewport()
+        App.clock = lambda : now[0]
+        TaskScheduler.rebase(-replayStart * 1000)
+        App._setClockState(*clocks)
+        frameTimes = []
+        try:
+            frame = App.initialize(backend)
+            timer = time.perf_counter
+            for kind, values in InputLog.read(data):
+                if kind == InputLog.FRAME:
+                    now[0] = values[0]
+                    start = timer()
+                    frame.step()
+                    frameTimes.append((timer() - start) * 1000)
+                elif kind == InputLog.KEY_DOWN:
+                    frame.keyDown(values[0])
+                elif kind == InputLog.KEY_UP:
+                    frame.keyUp(values[0])
+                elif kind == InputLog.CLICK:
+                    frame.click(values)
+                else:
+                    frame.drag(values)
+        finally:
+            # Time spent replaying does not count for the app, so every clock continues from where it was
+            replayEnd = clock()
+            App.clock = clock
+            TaskScheduler.rebase(replayEnd * 1000)
+            elapsed = replayEnd - replayStart
+            lastTickTime, tickAccumulator, tweenClock = state
+            App._setClockState(None if lastTickTime is None else lastTickTime + elapsed, tickAccumulator,
+                               None if tweenClock is None else tweenClock + elapsed)
+            if previousFrame is not None:
+                App._useFrame(previousFrame, *viewport)
+        ordered = sorted(frameTimes)
+        count = len(ordered)
+        return {
+            'frames': count,
+            'seconds': sum(frameTimes) / 1000,
+            'p50': ordered[min(count - 1, int(0.5 * count))] if count else 0.0,
+            'p95': ordered[min(count - 1, int(0.95 * count))] if count else 0.0,
+            'max': ordered[-1] if count else 0.0,
+            'frameTimes': frameTimes,
+        }
+
+"""d
+A function scheduled to be called later using App.after() or App.every().
+"""
+class Timer:
+    """d
+    Constructs a timer. Timers are usually created using App.after() or App.every() instead.
+    :param function :- The function to call. Must accept no arguments :- function
+    :param due :- The time to call the function at, in milliseconds of App.clock :- float
+    :param interval=None :- [Optional] How often to call the function again in milliseconds, or None to only call it once :- number
+    """
+    def __init__(self, function, due, interval=None):
+        self.function = function
+        self.due = due
+        self.interval = interval
+        self.cancelled = False
+    
+    """d
+    Stops the timer from calling its function again.
+    """
+    def cancel(self):
+        self.cancelled = True
+
+"""d
+A generator or coroutine being run a little every frame, created using App.spawn().
+"""
+class Task:
+    """d
+    Constructs a task. Tasks are usually created using App.spawn() instead.
+    :param routine :- The generator or coroutine to run :- generator, coroutine
+    """
+    def __init__(self, routine):
+        self.routine = routine
+        self.done = False
+        self.result = None
+    
+    """d
+    Stops running the task. It is not finished, so its result stays None.
+    """
+    def cancel(self):
+        if not self.done:
+            self.done = True
+            self.routine.close()
+
+class _Pause:
+    def __await__(self):
+        yield
+
+"""d
+Runs timers and tasks. Timers are kept in a heap ordered by when they are due, so each frame only looks at the timers that are due.
+Tasks are resumed one after another, round robin, until App.taskBudget milliseconds have been used in the frame, so long-running work is spread over many frames.
+A task gives up its turn every time it yields, or awaits App.pause() if it is a coroutine.
+"""
+class TaskScheduler:
+    __timers = []
+    __sequence = 0
+    __tasks = collections.deque()
+    
+    """d
+    Schedules a timer.
+    :param timer :- The timer to schedule :- Timer
+    """
+    def schedule(timer):
+        TaskScheduler.__sequence += 1
+        heapq.heappush(TaskScheduler.__timers, (timer.due, TaskScheduler.__sequence, timer))
+    
+    """d
+    Starts running a task from the next frame.
+    :param task :- The task to run :- Task
+    """
+    def start(task):
+        TaskScheduler.__tasks.append(task)
+    
+    """d
+    The number of timers and tasks waiting to run.
+    :return The counts in format {'timers': int, 'tasks': int} :- dict
+    """
+    def count():
+        return {'timers': sum(1 for entry in TaskScheduler.__timers if not entry[2].cancelled),
+                'tasks': sum(1 for task in TaskScheduler.__tasks if not task.done)}
+    
+    """d
+    Cancels every timer and task.
+    """
+    def clear():
+        for task in TaskScheduler.__tasks:
+            task.cancel()
+        TaskScheduler.__timers = []
+        TaskScheduler.__tasks = collections.deque()
+    
+    """d
+    Shifts when every timer is due, such as when App.clock is replaced.
+    :param offset :- The number of milliseconds to add to the time of every timer :- float
+    """
+    def rebase(offset):
+        for due, sequence, timer in TaskScheduler.__timers:
+            timer.due += offset
+        TaskScheduler.__timers = [(due + offset, sequence, timer) for due, sequence, timer in TaskScheduler.__timers]
+    
+    """d
+    Calls every timer that is due. Called by App once per frame.
+    """
+    def runTimers():
+        timers = TaskScheduler.__timers
+        if not timers:
+            return
+        now = App.clock() * 1000
+        # Timers scheduled while this runs wait for the next frame, so a timer that keeps scheduling itself cannot stall the frame
+        last = TaskScheduler.__sequence
+        later = []
+        try:
+            while timers and timers[0][0] <= now:
+                entry = heapq.heappop(timers)
+                if entry[1] > last:
+                    later.append(entry)
+                    continue
+                timer = entry[2]
+                if timer.cancelled:
+                    continue
+                if timer.interval is not None:
+                    # Repeating timers keep their rhythm, but skip the calls they missed instead of firing them all at once
+                    timer.due += timer.interval
+                    if timer.due <= now:
+                        timer.due = now + timer.interval
+                    TaskScheduler.schedule(timer)
+                timer.function()
+        finally:
+            for entry in later:
+                heapq.heappush(TaskScheduler.__timers, entry)
+    
+    """d
+    Resumes tasks until App.taskBudget milliseconds have passed, always resuming at least one. Called by App once per frame.
+    """
+    def runTasks():
+        tasks = TaskScheduler.__tasks
+        if not tasks:
+            return
+        clock = time.perf_counter
+        end = clock() + (App.taskBudget / 1000)
+        while tasks:
+            task = tasks.popleft()
+            if task.done:
+                continue
+            try:
+                task.routine.send(None)
+            except StopIteration as stop:
+                task.done = True
+                task.result = stop.value
+            except BaseException:
+                task.done = True
+                raise
+            else:
+                tasks.append(task)
+            if clock() >= end:
+                break
+
+"""d
+Contains the functionality shared by every shape, such as registering with the DrawScheduler and the SpatialIndex.
+Shapes stay in the window until remove() is called, even when nothing else refers to them. If DrawScheduler.weakOwners is enabled before they are created, the library only keeps weak references to them instead, so they also disappear once nothing refers to them.
+"""
+class Shape:
+    __slots__ = ('_visible', '_displayList', '__id', '__weakref__')
+    __holds = 0
+    __heldMoves = set()
+    
+    def _register(self, drawer):
+        self._visible = True
+        self._displayList = None
+        bounded = hasattr(type(self), 'bounds')
+        self.__id = DrawScheduler.registerShape(drawer.__func__, bounded, self)
+        if bounded:
+            SpatialIndex.insert(self.__id, self)
+    
+    def _moved(self):
+        if Shape.__holds:
+            Shape.__heldMoves.add(self)
+            return
+        SpatialIndex.touch(self.__id)
+        DrawScheduler.markDirty()
+        if self._displayList is not None:
+            self._displayList.markStale()
+    
+    """d
+    Holds back move notifications until _releaseMoves() is called, so that a shape with several properties written in one pass is only rebucketed and marked once. Calls can be nested, and must always be paired with _releaseMoves(), such as in a finally block.
+    """
+    def _holdMoves():
+        Shape.__holds += 1
+    
+    """d
+    Ends a call to _holdMoves(). Once the outermost one ends, each shape moved while notifications were held is notified once.
+    """
+    def _releaseMoves():
+        Shape.__holds -= 1
+        if Shape.__holds or not Shape.__heldMoves:
+            return
+        moved = Shape.__heldMoves
+        Shape.__heldMoves = set()
+        for shape in moved:
+            SpatialIndex.touch(shape.__id)
+            if shape._displayList is not None:
+                shape._displayList.markStale()
+        DrawScheduler.markDirty()
+    
+    def _changed(self):
+        DrawScheduler.markDirty()
+        if self._displayList is not None:
+            self._displayList.markStale()
+    
+    """d
+    Moves the shape in front of every other shape on its layer.
+    """
+    def toFront(self):
+        DrawScheduler.toFront(self.__id)
+        self._changed()
+    """d
+    Moves the shape behind every other shape on its layer.
+    """
+    def toBack(self):
+        DrawScheduler.toBack(self.__id)
+        self._changed()
+    """d
+    Removes the shape from the window right away, so it is no longer drawn, animated or checked for collisions. Removing a shape more than once does nothing.
+    """
+    def remove(self):
+        if self._displayList is not None:
+            self._displayList.discard(self)
+        Tweens.cancelShape(self)
+        SpatialIndex.remove(self.__id)
+        Collisions.remove(self.__id)
+        DrawScheduler.destroyShape(self.__id)
+    
+    def __getVisible(self):
+        return self._visible
+    def __setVisible(self, visible):
+        self._visible = visible
+        self._changed()
+    def __getZIndex(self):
+        return DrawScheduler.getOrder(self.__id)[1]
+    def __setZIndex(self, zIndex):
+        DrawScheduler.setOrder(self.__id, zIndex=zIndex)
+        self._changed()
+    def __getLayer(self):
+        return DrawScheduler.getOrder(self.__id)[0]
+    def __setLayer(self, layer):
+        DrawScheduler.setOrder(self.__id, layer=layer)
+        self._changed()
+    def __getCollisionGroup(self):
+        return Collisions.getGroup(self.__id)
+    def __setCollisionGroup(self, group):
+        Collisions.setGroup(self.__id, self, group)
+    def __getCollisionMask(self):
+        return Collisions.getMask(self.__id)
+    def __setCollisionMask(self, groups):
+        Collisions.setMask(self.__id, self, groups)
+    def __getAlive(self):
+        return DrawScheduler.isAlive(self.__id)
+    def __getHandle(self):
+        return self.__id
+    
+    """d
+    Whether or not the shape is drawn.
+    :type bool
+    """
+    visible = property(__getVisible, __setVisible)
+    """d
+    Where the shape is drawn within its layer. Shapes with a higher z-index are drawn in front of shapes with a lower one.
+    :type number
+    """
+    zIndex = property(__getZIndex, __setZIndex)
+    """d
+    The name of the layer the shape is drawn on. Layers are added using App.addLayer().
+    :type string
+    """
+    layer = property(__getLayer, __setLayer)
+    """d
+    The name of the collision group the shape is in, used by App.onCollision(). Shapes start without a group.
+    :type string
+    """
+    collisionGroup = property(__getCollisionGroup, __setCollisionGroup)
+    """d
+    The names of the collision groups this shape can collide with, or None to collide with every group. Shapes without a group are in the None group.
+    :type list[string]
+    """
+    collisionMask = property(__getCollisionMask, __setCollisionMask)
+    """d
+    Whether or not the shape is still in the window, which is False once it has been removed.
+    :type bool
+    """
+    alive = property(__getAlive)
+    """d
+    The handle identifying the shape in DrawScheduler, SpatialIndex and Collisions, for use within the library.
+    :type int
+    """
+    _handle = property(__getHandle)
+    
+    def __del__(self):
+        try:
+            shapeID = self.__id
+        except AttributeError:
+            # __init__ failed before the shape was registered
+            return
+        SpatialIndex.remove(shapeID)
+        Collisions.remove(shapeID)
+        DrawScheduler.destroyShape(shapeID)
+
+"""d
+Represents a rectangle in the screenspace of the application window.
+"""
+class Rect(Shape):
+    __slots__ = ('__startX', '__startY', '__width', '__height', '__points', '__box', '__fill', '__fillCSS', '__border', '__borderCSS', '__borderWidth')
+    
+    """d
+    Constructs a rectangle with the provided paramaters.
+    :param startX :- The x-coordinate of the 'top-left' corner of the rectangle :- number
+    :param startY :- The y-coordinate of the 'top-left' corner of the rectangle :- number
+    :param width :- The width, or size along the x-axis, of the rectangle :- number
+    :param height :- The height, or size along the y-axis of the rectangle :- number
+    :param fill=App.defaultFill :- [Optional] The fill color of the rectangle :- color, string
+    :param border=None :- [Optional] The color of the border of the rectangle :- color, string
+    :param borderWidth=2 :- [Optional] The width of the border in pixels :- number
+    """
+    def __init__(self, startX, startY, width, height, fill=App.defaultFill, border=None, borderWidth=2):
+        self.__startX = startX
+        self.__startY = startY
+        self.__width = width
+        self.__height = height
+        
+        self.__fill = Color.TRANSPARENT if fill == None else fill
+        
+        self.__fillCSS = Color.toCSS(self.__fill)
+        self.__border = Color.TRANSPARENT if border == None else border
+        self.__borderCSS = Color.toCSS(self.__border)
+        self.__borderWidth = borderWidth
+        
+        self.__points = None
+        self.__box = None
+        
+        self._register(self.__draw)
+    
+    def __getStartX(self):
+        return self.__startX
+    def __setStartX(self, startX):
+        self.__startX = startX
+        self.__reshaped()
+    def __getStartY(self):
+        return self.__startY
+    def __setStartY(self, startY):
+        self.__startY = startY
+        self.__reshaped()
+    def __getWidth(self):
+        return self.__width
+    def __setWidth(self, width):
+        self.__width = width
+        self.__reshaped()
+    def __getHeight(self):
+        return self.__height
+    def __setHeight(self, height):
+        self.__height = height
+        self.__reshaped()
+    def __getCenterX(self):
+        return self.__startX + (self.__width / 2.0)
+    def __setCenterX(self, centerX):
+        self.startX = centerX - (self.__width / 2.0)
+    def __getCenterY(self):
+        return self.__startY + (self.__height / 2.0)
+    def __setCenterY(self, centerY):
+        self.startY = centerY - (self.__height / 2.0)
+    def __getBorder(self):
+        return self.__border
+    def __setBorder(self, border):
+        self.__border = Color.TRANSPARENT if border == None else border
+        self.__borderCSS = Color.toCSS(self.__border)
+        self._changed()
+    def __getFill(self):
+        return self.__fill
+    def __setFill(self, fill):
+        self.__fill = Color.TRANSPARENT if fill == None else fill
+        self.__fillCSS = Color.toCSS(self.__fill)
+        self._changed()
+    def __getBorderWidth(self):
+        return self.__borderWidth
+    def __setBorderWidth(self, width):
+        self.__borderWidth = width
+        self._changed()
+
+
+    def __draw(self, canvas):
+        if not self._visible:
+            return
+        canvas.draw_polygon(self.__points or self.__calculatePoints(), self.__borderWidth, self.__borderCSS, self.__fillCSS)
+
+    """d
+    Checks if the provided coordinate is contained within the rectangle.
+    :param x :- The x value of the coordinate to check :- number
+    :param y :- The y value of the coordinate to check :- number
+    :return Whether or not the coordinate is contained within the rectangle :- bool
+    """
+    def contains(self, x, y):
+        minX, minY, maxX, maxY = self.__box or self.__bounds()
+        return x >= minX and x <= maxX and y >= minY and y <= maxY
+    
+    """d
+    Changes any of the position and size of the rectangle at once, updating its geometry only once.
+    :param startX=None :- [Optional] The new x-coordinate of the 'top-left' corner :- number
+    :param startY=None :- [Optional] The new y-coordinate of the 'top-left' corner :- number
+    :param width=None :- [Optional] The new width :- number
+    :param height=None :- [Optional] The new height :- number
+    """
+    def set(self, startX=None, startY=None, width=None, height=None):
+        if startX is not None:
+            self.__startX = startX
+        if startY is not None:
+            self.__startY = startY
+        if width is not None:
+            self.__width = width
+        if height is not None:
+            self.__height = height
+        self.__reshaped()
+    
+    """d
+    Moves the rectangle by the provided offsets.
+    :param dx :- The offset along the x-axis :- number
+    :param dy :- The offset along the y-axis :- number
+    """
+    def move(self, dx, dy):
+        self.__startX += dx
+        self.__startY += dy
+        self.__reshaped()
+    
+    def __reshaped(self):
+        # Points and bounds are rebuilt the next time they are needed, so several changes in a frame only rebuild them once
+        self.__points = None
+        self.__box = None
+        self._moved()
+    
+    def __calculatePoints(self):
+        startX = self.__startX
+        startY = self.__startY
+        endX = startX + self.__width
+        endY = startY + self.__height
+        
+        self.__points = [(startX, startY), (endX, startY), (endX, endY), (startX, endY)]
+        return self.__points
+    
+    def __getPoints(self):
+        return list(self.__points or self.__calculatePoints())
+    def __area(self):
+        return self.__width * self.__height
+    def __bounds(self):
+        if self.__box is None:
+            startX, startY = self.__startX, self.__startY
+            endX, endY = startX + self.__width, startY + self.__height
+            self.__box = (min(startX, endX), min(startY, endY), max(startX, endX), max(startY, endY))
+        return self.__box
+
+    """d
+    The x-coordinate of the 'top-left' corner of the rectangle.
+    :type number
+    """
+    startX = property(__getStartX, __setStartX)
+    """d
+    The y-coordinate of the 'top-left' corner of the rectangle.
+    :type number
+    """
+    startY = property(__getStartY, __setStartY)
+    """d
+    The width, or size along the x-axis, of the rectangle.
+    :type number
+    """
+    width = property(__getWidth, __setWidth)
+    """d
+    The height, or size along the y-axis, of the rectangle.
+    :type number
+    """
+    height = property(__getHeight, __setHeight)
+    """d
+    The x-coordinate of the center point of the rectangle.
+    :type number
+    """
+    centerX = property(__getCenterX, __setCenterX)
+    """d
+    The y-coordinate of the center point of the rectangle.
+    :type number
+    """
+    centerY = property(__getCenterY, __setCenterY)
+    """d
+    The fill color of rectangle.
+    :type color, string
+    """
+    fill = property(__getFill, __setFill)
+    """d
+    The color of the border of the rectangle.
+    :type color, string
+    """
+    border = property(__getBorder, __setBorder)
+    """d
+    The width of the border of the rectangle.
+    :type number
+    """
+    borderWidth = property(__getBorderWidth, __setBorderWidth)
+    """d
+    The corners of the rectangle, starting at (startX, startY) and going through (startX + width, startY).
+    :type list[tuple]
+    """
+    points = property(__getPoints)
+    """d
+    The area encased, or the number of pixels occupied, by this rectangle.
+    :type number
+    """
+    area = property(__area)
+    """d
+    The bounding box of the rectangle in format (minX, minY, maxX, maxY).
+    :type tuple
+    """
+    bounds = property(__bounds)
+
+"""d
+Represents a circle in the screenspace of the application window
+"""
+class Circle(Shape):
+    __slots__ = ('__centerX', '__centerY', '__radius', '__fill', '__fillCSS', '__border', '__borderCSS', '__borderWidth')
+    
+    """d
+    Constructs a circle with the provided parameters.
+    :param centerX :- The center of the circle along the x-axis :- number
+    :param centerY :- The center of the circle along the y- axis :- number
+    :param radius :- The radius of the circle :- number
+    :param fill=App.defaultFill :- [Optional] The fill color of the rectangle :- color, string
+    :param border=None :- [Optional] The color of the border of the rectangle :- color, string
+    :param borderWidth=2 :- [Optional] The width of the border in pixels :- number
+    """
+    def __init__(self, centerX, centerY, radius, fill=App.defaultFill, border=None, borderWidth=2):
+        self.__centerX = centerX
+        self.__centerY = centerY
+        self.__radius = radius
+        
+        self.__fill = Color.TRANSPARENT if fill == None else fill
+        
+        self.__fillCSS = Color.toCSS(self.__fill)
+        self.__border = Color.TRANSPARENT if border == None else border
+        self.__borderCSS = Color.toCSS(self.__border)
+        self.__borderWidth = borderWidth
+        
+        self._register(self.__draw)
+    
+    def __draw(self, canvas):
+        if not self._visible:
+            return
+        canvas.draw_circle((self.__centerX, self.__centerY), self.__radius, self.__borderWidth, self.__borderCSS, self.__fillCSS)
+    
+    """d
+    Checks if the provided coordinate is contained within the circle.
+    :param x :- The x value of the coordinate to check :- number
+    :param y :- The y value of the coordinate to check :- number
+    :return Whether or not the coordinate is contained within the circle :- bool
+    """
+    def contains(self, x, y):
+        return math.sqrt(((x - self.centerX) ** 2) + ((y - self.centerY) ** 2)) <= self.radius
+    
+    """d
+    Moves the circle by the provided offsets.
+    :param dx :- The offset along the x-axis :- number
+    :param dy :- The offset along the y-axis :- number
+    """
+    def move(self, dx, dy):
+        self.__centerX += dx
+        self.__centerY += dy
+        self._moved()
+    
+    def __getCenterX(self):
+        return self.__centerX
+    def __setCenterX(self, centerX):
+        self.__centerX = centerX
+        self._moved()
+    def __getCenterY(self):
+        return self.__centerY
+    def __setCenterY(self, centerY):
+        self.__centerY = centerY
+        self._moved()
+    def __getRadius(self):
+        return self.__radius
+    def __setRadius(self, radius):
+        self.__radius = radius
+        self._moved()
+    def __getBorder(self):
+        return self.__border
+    def __setBorder(self, border):
+        self.__border = Color.TRANSPARENT if border == None else border
+        self.__borderCSS = Color.toCSS(self.__border)
+        self._changed()
+    def __getFill(self):
+        return self.__fill
+    def __setFill(self, fill):
+        self.__fill = Color.TRANSPARENT if fill == None else fill
+        self.__fillCSS = Color.toCSS(self.__fill)
+        self._changed()
+    def __getBorderWidth(self):
+        return self.__borderWidth
+    def __setBorderWidth(self, width):
+        self.__borderWidth = width
+        self._changed()
+
+    def __area(self):
+        return math.pi * (self.radius ** 2.0)
+    def __bounds(self):
+        radius = abs(self.__radius)
+        return (self.__centerX - radius, self.__centerY - radius, self.__centerX + radius, self.__centerY + radius)
+
+    """d
+    The x-coordinate of the center point of the circle.
+    :type number
+    """
+    centerX = property(__getCenterX, __setCenterX)
+    """d
+    The y-coordinate of the center point of the circle.
+    :type number
+    """
+    centerY = property(__getCenterY, __setCenterY)
+    """d
+    The radius of the circle.
+    :type number
+    """
+    radius = property(__getRadius, __setRadius)
+    """d
+    The fill color of circle.
+    :type color, string
+    """
+    fill = property(__getFill, __setFill)
+    """d
+    The color of the border of the circle.
+    :type color, string
+    """
+    border = property(__getBorder, __setBorder)
+    """d
+    The width of the border of the circle.
+    :type number
+    """
+    borderWidth = property(__getBorderWidth, __setBorderWidth)
+    """d
+    The area encased, or the number of pixels occupied, by this circle.
+    :type float
+    """
+    area = property(__area)
+    """d
+    The bounding box of the circle in format (minX, minY, maxX, maxY).
+    :type tuple
+    """
+    bounds = property(__bounds)
+    
+"""d
+Represents a polygon in the screenspace of the application window
+"""
+class Polygon(Shape):
+    __slots__ = ('__basePoints', '__centerX', '__centerY', '__rotateAngle', '__scale', '__local', '__points', '__localBounds', '__edges', '__localCentroid', '__area', '__convex',
+                 '__fill', '__fillCSS', '__border', '__borderCSS', '__borderWidth')
+    
+    """d
+    Constructs a polygon with the provided parameters.
+    :param points :- The points to describe the polygon :- list[tuple]
+    :param fill=App.defaultFill :- [Optional] The fill color of the rectangle :- color, string
+    :param border=None :- [Optional] The color of the border of the rectangle :- color, string
+    :param borderWidth=2 :- [Optional] The width of the border in pixels :- number
+    """
+    def __init__(self, *args, fill=App.defaultFill, border=None, borderWidth=2):
+        xs = [point[0] for point in args]
+        ys = [point[1] for point in args]
+        self.__centerX = int(sum(xs) / len(args))
+        self.__centerY = int(sum(ys) / len(args))
+        self.__basePoints = [(x - self.__centerX, y - self.__centerY) for x, y in zip(xs, ys)]
+        self.__rotateAngle = 0
+        self.__scale = 1
+        self.__local = None
+        self.__points = None
+        
+        self.__fill = Color.TRANSPARENT if fill == None else fill
+        
+        self.__fillCSS = Color.toCSS(self.__fill)
+        self.__border = Color.TRANSPARENT if border == None else border
+        self.__borderCSS = Color.toCSS(self.__border)
+        self.__borderWidth = borderWidth
+
+        self._register(self.__draw)
+    
+    # The base points are rotated and scaled around the center into local points, which are only rebuilt when the
+    # rotation or scale changes. Moving the polygon only changes the center, so the edge tables built from the local
+    # points stay valid and points are tested by offsetting them into local space instead.
+    def __buildLocal(self):
+        radians = math.radians(self.__rotateAngle)
+        cos = math.cos(radians) * self.__scale
+        sin = math.sin(radians) * self.__scale
+        if self.__rotateAngle == 0 and self.__scale == 1:
+            points = list(self.__basePoints)
+        else:
+            points = [((cos * x) - (sin * y), (sin * x) + (cos * y)) for x, y in self.__basePoints]
+        
+        xs = [point[0] for point in points]
+        ys = [point[1] for point in points]
+        self.__localBounds = (min(xs), min(ys), max(xs), max(ys))
+        
+        edges = []
+        area = 0.0
+        centroidX = 0.0
+        centroidY = 0.0
+        turns = 0
+        turning = 0.0
+        for i in range(len(points)):
+            x0, y0 = points[i - 1]
+            x1, y1 = points[i]
+            cross = (x0 * y1) - (x1 * y0)
+            area += cross
+            centroidX += (x0 + x1) * cross
+            centroidY += (y0 + y1) * cross
+            
+            x2, y2 = points[(i + 1) % len(points)]
+            turn = ((x1 - x0) * (y2 - y1)) - ((y1 - y0) * (x2 - x1))
+            turning += math.atan2(turn, ((x1 - x0) * (x2 - x1)) + ((y1 - y0) * (y2 - y1)))
+            if turn > 0:
+                turns |= 1
+            elif turn < 0:
+                turns |= 2
+            
+            # Horizontal edges can never be crossed by a horizontal ray
+            if y0 != y1:
+                edges.append((x0, y0, x1, y1, (x1 - x0) / (y1 - y0)))
+        
+        area /= 2.0
+        if area == 0:
+            self.__localCentroid = (sum(xs) / len(points), sum(ys) / len(points))
+        else:
+            self.__localCentroid = (centroidX / (6.0 * area), centroidY / (6.0 * area))
+        self.__area = abs(area)
+        self.__edges = edges
+        
+        # Convex polygons only ever turn one way, and turn exactly once around in total, which rules out stars that wind around more than once.
+        # A point is then inside if it is on the same side of every edge
+        self.__convex = None
+        if turns != 3 and len(points) >= 3 and abs(abs(turning) - (2 * math.pi)) < 1e-6:
+            sign = 1 if area > 0 else -1
+            self.__convex = [(points[i - 1][0], points[i - 1][1], (points[i][0] - points[i - 1][0]) * sign, (points[i][1] - points[i - 1][1]) * sign)
+                             for i in range(len(points))]
+        self.__local = points
+    
+    def __worldPoints(self):
+        if self.__points is None:
+            if self.__local is None:
+                self.__buildLocal()
+            centerX, centerY = self.__centerX, self.__centerY
+            self.__points = [(centerX + x, centerY + y) for x, y in self.__local]
+        return self.__points
+    
+    def __transformed(self):
+        self.__local = None
+        self.__points = None
+        self._moved()
+    
+    def __translated(self):
+        self.__points = None
+        self._moved()
+
+    def __draw(self, canvas):
+        if not self._visible:
+            return
+        canvas.draw_polygon(self.__worldPoints(), self.__borderWidth, self.__borderCSS, self.__fillCSS)
+
+    """d
+    Checks if the provided coordinate is contained within the polygon.
+    :param x :- The x value of the coordinate to check :- number
+    :param y :- The y value of the coordinate to check :- number
+    :return Whether or not the coordinate is contained within the polygon :- bool
+    """
+    def contains(self, x, y):
+        if self.__local is None:
+            self.__buildLocal()
+        x -= self.__centerX
+        y -= self.__centerY
+        minX, minY, maxX, maxY = self.__localBounds
+        
+        # Major bounding box
+        if x < minX or x > maxX or y < minY or y > maxY:
+            return False
+        
+        if self.__convex is not None:
+            for startX, startY, edgeX, edgeY in self.__convex:
+                if (edgeX * (y - startY)) - (edgeY * (x - startX)) < 0:
+                    return False
+            return True
+        
+        inside = False
+        for x0, y0, x1, y1, inverseSlope in self.__edges:
+            if (y0 > y) != (y1 > y) and x < x0 + ((y - y0) * inverseSlope):
+                inside = not inside
+        return inside
+    
+    """d
+    Checks which of the provided coordinates are contained within the polygon, testing all of them at once.
+    :param points :- The coordinates to check, each in format (x, y) :- list[tuple]
+    :return Whether or not each coordinate is contained within the polygon, in the same order :- list[bool]
+    """
+    def containsMany(self, points):
+        if numpy is None:
+            return [self.contains(x, y) for x, y in points]
+        
+        if self.__local is None:
+            self.__buildLocal()
+        coordinates = numpy.asarray(points, dtype=float).reshape(-1, 2)
+        xs = coordinates[:, 0] - self.__centerX
+        ys = coordinates[:, 1] - self.__centerY
+        minX, minY, maxX, maxY = self.__localBounds
+        inside = (xs >= minX) & (xs <= maxX) & (ys >= minY) & (ys <= maxY)
+        if not inside.any():
+            return inside.tolist()
+        
+        if self.__convex is not None:
+            for startX, startY, edgeX, edgeY in self.__convex:
+                inside &= (edgeX * (ys - startY)) - (edgeY * (xs - startX)) >= 0
+            return inside.tolist()
+        
+        crossings = numpy.zeros(len(xs), dtype=bool)
+        for x0, y0, x1, y1, inverseSlope in self.__edges:
+            crossings ^= ((y0 > ys) != (y1 > ys)) & (xs < x0 + ((ys - y0) * inverseSlope))
+        return (inside & crossings).tolist()
+    
+    """d
+    Moves the polygon by the provided offsets.
+    :param dx :- The offset along the x-axis :- number
+    :param dy :- The offset along the y-axis :- number
+    """
+    def move(self, dx, dy):
+        self.__centerX += dx
+        self.__centerY += dy
+        self.__translated()
+            
+    def __getBorder(self):
+        return self.__border
+    def __setBorder(self, border):
+        self.__border = Color.TRANSPARENT if border == None else border
+        self.__borderCSS = Color.toCSS(self.__border)
+        self._changed()
+    def __getFill(self):
+        return self.__fill
+    def __setFill(self, fill):
+        self.__fill = Color.TRANSPARENT if fill == None else fill
+        self.__fillCSS = Color.toCSS(self.__fill)
+        self._changed()
+    def __getBorderWidth(self):
+        return self.__borderWidth
+    def __setBorderWidth(self, width):
+        self.__borderWidth = width
+        self._changed()
+    def __getCenterX(self):
+        return self.__centerX
+    def __setCenterX(self, centerX):
+        self.__centerX = centerX
+        self.__translated()
+    def __getCenterY(self):
+        return self.__centerY
+    def __setCenterY(self, centerY):
+        self.__centerY = centerY
+        self.__translated()
+    def __getRotateAngle(self):
+        return self.__rotateAngle
+    def __setRotateAngle(self, rotateAngle):
+        self.__rotateAngle = rotateAngle
+        self.__transformed()
+    def __getScale(self):
+        return self.__scale
+    def __setScale(self, scale):
+        self.__scale = scale
+        self.__transformed()
+    def __getPoints(self):
+        return self.__worldPoints()
+    def __getBounds(self):
+        if self.__local is None:
+            self.__buildLocal()
+        minX, minY, maxX, maxY = self.__localBounds
+        return (self.__centerX + minX, self.__centerY + minY, self.__centerX + maxX, self.__centerY + maxY)
+    def __getArea(self):
+        if self.__local is None:
+            self.__buildLocal()
+        return self.__area
+    def __getCentroid(self):
+        if self.__local is None:
+            self.__buildLocal()
+        return (self.__centerX + self.__localCentroid[0], self.__centerY + self.__localCentroid[1])
+    def __getConvex(self):
+        if self.__local is None:
+            self.__buildLocal()
+        return self.__convex is not None
+
+    """d
+    The fill color of polygon.
+    :type color, string
+    """
+    fill = property(__getFill, __setFill)
+    """d
+    The color of the border of the polygon.
+    :type color, string
+    """
+    border = property(__getBorder, __setBorder)
+    """d
+    The width of the border of the polygon.
+    :type number
+    """
+    borderWidth = property(__getBorderWidth, __setBorderWidth)
+    """d
+    The x-coordinate of the center of the polygon, which it is rotated and scaled around.
+    :type number
+    """
+    centerX = property(__getCenterX, __setCenterX)
+    """d
+    The y-coordinate of the center of the polygon, which it is rotated and scaled around.
+    :type number
+    """
+    centerY = property(__getCenterY, __setCenterY)
+    """d
+    How far the polygon is rotated clockwise around its center, in degrees.
+    :type number
+    """
+    rotateAngle = property(__getRotateAngle, __setRotateAngle)
+    """d
+    How much the polygon is scaled around its center, where 1 is its original size.
+    :type number
+    """
+    scale = property(__getScale, __setScale)
+    """d
+    The points that describe the polygon after it has been moved, rotated and scaled.
+    :type list[tuple]
+    """
+    points = property(__getPoints)
+    """d
+    The bounding box of the polygon in format (minX, minY, maxX, maxY).
+    :type tuple
+    """
+    bounds = property(__getBounds)
+    """d
+    The area encased, or the number of pixels occupied, by this polygon.
+    :type float
+    """
+    area = property(__getArea)
+    """d
+    The center of mass of the area of the polygon in format (x, y). Unlike centerX and centerY, this is not skewed by where the points are.
+    :type tuple
+    """
+    centroid = property(__getCentroid)
+    """d
+    Whether or not the polygon is convex, meaning every line between two points inside of it stays inside of it.
+    :type bool
+    """
+    convex = property(__getConvex)
+    
+"""d
+Represents a string of text in the screenspace of the application window
 """
-class Circle:
+class Text(Shape):
+    __slots__ = ('__text', '__centerX', '__centerY', '__size', '__font', '__lines', '__lineWidths', '__width', '__height', '__layout', '__fill', '__fillCSS')
+    
+    LINE_SPACING = 1.2
+    
     """d
-    Constructs a circle with the provided parameters.
-    :param centerX :- The center of the circle along the x-axis :- number
-    :param centerY :- The center of the circle along the y- axis :- number
-    :param radius :- The radius of the circle :- number
+    Constructs a text object with the provided parameters. The text may span multiple lines separated by '\\n', each centered horizontally.
+    :param text :- The text for this shape to display :- string
+    :param centerX :- The x-coordinate of the center of this shape :- number
+    :param centerY :- The y-coordinate of the center of this shape :- number
+    :param size :- The size of the font to render the text :- number
     :param fill=App.defaultFill :- [Optional] The fill color of the rectangle :- color, string
-    :param border=None :- [Optional] The color of the border of the rectangle :- color, string
-    :param borderWidth=2 :- [Optional] The width of the border in pixels :- number
+    :param font='serif' :- [Optional] The font face of the text, either 'serif', 'sans-serif' or 'monospace' :- string
     """
-    def __init__(self, centerX, centerY, radius, fill=App.defaultFill, border=None, borderWidth=2):
+    def __init__(self, text, centerX, centerY, size, fill=App.defaultFill, font='serif'):
+        self.__text = str(text)
         self.__centerX = centerX
         self.__centerY = centerY
-        self.__radius = radius
+        self.__size = size
+        self.__font = font
         
-        self.__fill = 'rgba(255, 255, 255, 0)' if fill == None else fill
-        self.__border = 'rgba(255, 255, 255, 0)' if border == None else border
-        self.__borderWidth = borderWidth
+        self.__fill = Color.TRANSPARENT if fill == None else fill
         
-        self.visible = True
+        self.__fillCSS = Color.toCSS(self.__fill)
+        
+        self.__measure()
+        
+        self._register(self.__draw)
         
-        self.__id = DrawScheduler.registerShape(self.__draw)
-    
     def __draw(self, canvas):
-        if not self.visible:
+        if not self._visible:
             return
-        canvas.draw_circle((self.centerX, self.centerY), self.radius, self.borderWidth, str(self.border), str(self.fill))
+        size, fill, font = self.__size, self.__fillCSS, self.__font
+        for line, point in self.__layout:
+            canvas.draw_text(line, point, size, fill, font)
+    
+    def __measure(self):
+        self.__lines = self.__text.split('\n')
+        self.__lineWidths = [TextMetrics.measure(line, self.__size, self.__font) for line in self.__lines]
+        self.__width = max(self.__lineWidths)
+        self.__height = self.__size + (len(self.__lines) - 1) * self.__size * Text.LINE_SPACING
+        self.__arrange()
+    
+    def __arrange(self):
+        lineHeight = self.__size * Text.LINE_SPACING
+        baseline = self.__centerY - (self.__height / 2.0) + (self.__size * 0.75)
+        self.__layout = [(line, (self.__centerX - (width / 2.0), baseline + (i * lineHeight)))
+                         for i, (line, width) in enumerate(zip(self.__lines, self.__lineWidths))]
+    
+    def __getWidth(self):
+        return self.__width
+    def __getHeight(self):
+        return self.__height
+    def __bounds(self):
+        halfWidth = self.__width / 2.0
+        halfHeight = self.__height / 2.0
+        return (self.__centerX - halfWidth, self.__centerY - halfHeight, self.__centerX + halfWidth, self.__centerY + halfHeight)
     
     """d
-    Checks if the provided coordinate is contained within the circle.
-    :param x :- The x value of the coordinate to check :- number
-    :param y :- The y value of the coordinate to check :- number
-    :return Whether or not the coordinate is contained within the circle :- bool
+    Moves the text by the provided offsets.
+    :param dx :- The offset along the x-axis :- number
+    :param dy :- The offset along the y-axis :- number
     """
-    def contains(self, x, y):
-        return math.sqrt(((x - self.centerX) ** 2) + ((y - self.centerY) ** 2)) <= self.radius
+    def move(self, dx, dy):
+        self.__centerX += dx
+        self.__centerY += dy
+        self.__arrange()
+        self._moved()
     
+    def __getText(self):
+        return self.__text
+    def __setText(self, text):
+        text = str(text)
+        if text == self.__text:
+            return
+        self.__text = text
+        self.__measure()
+        self._moved()
     def __getCenterX(self):
         return self.__centerX
     def __setCenterX(self, centerX):
         self.__centerX = centerX
+        self.__arrange()
+        self._moved()
     def __getCenterY(self):
         return self.__centerY
     def __setCenterY(self, centerY):
         self.__centerY = centerY
-    def __getRadius(self):
-        return self.__radius
-    def __setRadius(self, radius):
-        self.__radius = radius
-    def __getBorder(self):
-        return self.__border
-    def __setBorder(self, border):
-        self.__border = 'rgba(255, 255, 255, 0)' if border == None else border
+        self.__arrange()
+        self._moved()
+    def __getSize(self):
+        return self.__size
+    def __setSize(self, size):
+        self.__size = size
+        self.__measure()
+        self._moved()
+    def __getFont(self):
+        return self.__font
+    def __setFont(self, font):
+        self.__font = font
+        self.__measure()
+        self._moved()
+    def __getFill(self):
+        return self.__fill
+    def __setFill(self, fill):
+        self.__fill = Color.TRANSPARENT if fill == None else fill
+        self.__fillCSS = Color.toCSS(self.__fill)
+        self._changed()
+    
+    """d
+    The text displayed by this shape.
+    :type string
+    """
+    text = property(__getText, __setText)
+    """d
+    The x-coordinate of the center of this shape.
+    :type number
+    """
+    centerX = property(__getCenterX, __setCenterX)
+    """d
+    The y-coordinate of the center of this shape.
+    :type number
+    """
+    centerY = property(__getCenterY, __setCenterY)
+    """d
+    The size of the font for the text.
+    :type number
+    """
+    size = property(__getSize, __setSize)
+    """d
+    The font face of the text.
+    :type string
+    """
+    font = property(__getFont, __setFont)
+    """d
+    The fill color of the text.
+    :type color, string
+    """
+    fill = property(__getFill, __setFill)
+    """d
+    The width, or size along the x-axis, of the text. For multiple lines, this is the width of the widest line.
+    :type number
+    """
+    width = property(__getWidth)
+    """d
+    The height, or size along the y-axis, of the text, including every line.
+    :type number
+    """
+    height = property(__getHeight)
+    """d
+    The bounding box of the text in format (minX, minY, maxX, maxY).
+    :type tuple
+    """
+    bounds = property(__bounds)
+    
+    """d
+    Checks if the provided coordinate is contained within the box taken up by the text.
+    :param x :- The x value of the coordinate to check :- number
+    :param y :- The y value of the coordinate to check :- number
+    :return Whether or not the coordinate is contained within the text :- bool
+    """
+    def contains(self, x, y):
+        minX, minY, maxX, maxY = self.__bounds()
+        return minX <= x <= maxX and minY <= y <= maxY
+    
+"""d
+Represents a line in the screenspace of the application window
+"""
+class Line(Shape):
+    __slots__ = ('__startX', '__startY', '__endX', '__endY', '__lineWidth', '__fill', '__fillCSS')
+    
+    """d
+    Constructs a line with the provided parameters.
+    :param startX :- The x-coordinate of the start of the line :- number
+    :param startY :- The y-coordinate of the start of the line :- number
+    :param endX :- The x-coordinate of the end of the line :- number
+    :param endY :- The y-coordinate of the end of the line :- number
+    :param lineWidth :- The width of the line in pixels :- number
+    :param fill=App.defaultFill :- [Optional] The color of the line :- color, string
+    """
+    def __init__(self, startX, startY, endX, endY, lineWidth, fill=App.defaultFill):
+        self.__startX = startX
+        self.__startY = startY
+        self.__endX = endX
+        self.__endY = endY
+        
+        self.__lineWidth = lineWidth
+        
+        self.__fill = Color.TRANSPARENT if fill == None else fill
+        
+        self.__fillCSS = Color.toCSS(self.__fill)
+        
+        self._register(self.__draw)
+        
+    def __draw(self, canvas):
+        if not self._visible:
+            return
+        canvas.draw_line((self.__startX, self.__startY), (self.__endX, self.__endY), self.__lineWidth, self.__fillCSS)
+    
+    """d
+    Checks if the provided coordinate is on the line, within half of its line width of it.
+    :param x :- The x value of the coordinate to check :- number
+    :param y :- The y value of the coordinate to check :- number
+    :return Whether or not the coordinate is on the line :- bool
+    """
+    def contains(self, x, y):
+        dx = self.__endX - self.__startX
+        dy = self.__endY - self.__startY
+        length = (dx * dx) + (dy * dy)
+        # Finds the closest point on the line to the coordinate, clamped to the ends of the line
+        t = 0 if length == 0 else max(0, min(1, (((x - self.__startX) * dx) + ((y - self.__startY) * dy)) / length))
+        return math.hypot(x - (self.__startX + (t * dx)), y - (self.__startY + (t * dy))) <= abs(self.__lineWidth) / 2
+    
+    """d
+    Moves both ends of the line by the provided offsets.
+    :param dx :- The offset along the x-axis :- number
+    :param dy :- The offset along the y-axis :- number
+    """
+    def move(self, dx, dy):
+        self.__startX += dx
+        self.__startY += dy
+        self.__endX += dx
+        self.__endY += dy
+        self._moved()
+    
+    def __getStartX(self):
+        return self.__startX
+    def __setStartX(self, startX):
+        self.__startX = startX
+        self._moved()
+    def __getStartY(self):
+        return self.__startY
+    def __setStartY(self, startY):
+        self.__startY = startY
+        self._moved()
+    def __getEndX(self):
+        return self.__endX
+    def __setEndX(self, endX):
+        self.__endX = endX
+        self._moved()
+    def __getEndY(self):
+        return self.__endY
+    def __setEndY(self, endY):
+        self.__endY = endY
+        self._moved()
+    def __getLineWidth(self):
+        return self.__lineWidth
+    def __setLineWidth(self, lineWidth):
+        self.__lineWidth = lineWidth
+        self._moved()
     def __getFill(self):
         return self.__fill
     def __setFill(self, fill):
-        self.__fill = 'rgba(255, 255, 255, 0)' if fill == None else fill
+        self.__fill = Color.TRANSPARENT if fill == None else fill
+        self.__fillCSS = Color.toCSS(self.__fill)
+        self._changed()
+    def __bounds(self):
+        padding = abs(self.__lineWidth) / 2
+        return (min(self.__startX, self.__endX) - padding, min(self.__startY, self.__endY) - padding,
+                max(self.__startX, self.__endX) + padding, max(self.__startY, self.__endY) + padding)
+    
+    """d
+    The x-coordinate of the start of the line.
+    :type number
+    """
+    startX = property(__getStartX, __setStartX)
+    """d
+    The y-coordinate of the start of the line.
+    :type number
+    """
+    startY = property(__getStartY, __setStartY)
+    """d
+    The x-coordinate of the end of the line.
+    :type number
+    """
+    endX = property(__getEndX, __setEndX)
+    """d
+    The y-coordinate of the end of the line.
+    :type number
+    """
+    endY = property(__getEndY, __setEndY)
+    """d
+    The width of the line in pixels.
+    :type number
+    """
+    lineWidth = property(__getLineWidth, __setLineWidth)
+    """d
+    The color of the line.
+    :type color, string
+    """
+    fill = property(__getFill, __setFill)
+    """d
+    The bounding box of the line, including its width, in format (minX, minY, maxX, maxY).
+    :type tuple
+    """
+    bounds = property(__bounds)
+
+
+"""d
+The base of shapes that store many homogeneous shapes as columns of numbers instead of one object per shape.
+Columns are NumPy arrays when NumPy is installed, and array.array objects otherwise. The whole set is registered as a single drawer.
+After writing directly into a column, such as array.x[3] = 10, call markChanged() so the change is drawn.
+"""
+class ShapeArray(Shape):
+    __slots__ = ('__count', '__x', '__y', '__fillIndex', '__shown', '__palette', '__paletteCSS', '__border', '__borderCSS', '__borderWidth')
+    
+    TYPECODES = {'d': 'float64', 'i': 'int32', 'B': 'bool'}
+    
+    """d
+    Creates a column of zeros.
+    :param count :- The number of entries in the column :- int
+    :param typecode='d' :- [Optional] The array.array typecode of the column. Either 'd', 'i' or 'B' :- string
+    :return The new column :- numpy.ndarray, array.array
+    """
+    def allocate(count, typecode='d'):
+        if numpy is not None:
+            return numpy.zeros(count, dtype=ShapeArray.TYPECODES[typecode])
+        return array.array(typecode, bytes(array.array(typecode).itemsize * count))
+    
+    """d
+    Copies values into a column. A single number is copied into every entry.
+    :param column :- The column to copy into :- numpy.ndarray, array.array
+    :param values :- The values to copy. Must have the same length as the column :- number, sequence
+    """
+    def copyInto(column, values):
+        if values is column:
+            return
+        if numpy is not None:
+            column[:] = values
+            return
+        if isinstance(values, (int, float)):
+            values = array.array(column.typecode, [values]) * len(column)
+        elif not isinstance(values, array.array) or values.typecode != column.typecode:
+            values = array.array(column.typecode, values)
+        if len(values) != len(column):
+            raise ValueError(f"Expected {len(column)} values but got {len(values)}")
+        column[:] = values
+    
+    """d
+    Converts a column into something that is fast to iterate over in Python.
+    :param column :- The column to convert :- numpy.ndarray, array.array
+    :return The values of the column :- list, array.array
+    """
+    def values(column):
+        if numpy is not None:
+            return column.tolist()
+        return column
+    
+    """d
+    Constructs the shared parts of an array of shapes.
+    :param count :- The number of shapes in the array :- int
+    :param fill :- The fill color of every shape :- color, string
+    :param border :- The color of the border of every shape :- color, string
+    :param borderWidth :- The width of the border of every shape in pixels :- number
+    """
+    def __init__(self, count, fill, border, borderWidth):
+        self.__count = count
+        self.__x = ShapeArray.allocate(count)
+        self.__y = ShapeArray.allocate(count)
+        self.__fillIndex = ShapeArray.allocate(count, 'i')
+        self.__shown = ShapeArray.allocate(count, 'B')
+        ShapeArray.copyInto(self.__shown, 1)
+        
+        self.__palette = [Color.TRANSPARENT if fill == None else fill]
+        self.__paletteCSS = [Color.toCSS(self.__palette[0])]
+        
+        self.__border = Color.TRANSPARENT if border == None else border
+        self.__borderCSS = Color.toCSS(self.__border)
+        self.__borderWidth = borderWidth
+        
+        self._register(self._drawArray)
+    
+    def __len__(self):
+        return self.__count
+    
+    """d
+    Replaces one of the columns of the array with the provided column, such as one in shared memory, copying the current values into it.
+    :param name :- The name of the column, such as 'x' or 'radius' :- string
+    :param column :- The column to use from now on. Must have the same length and type as the current one :- numpy.ndarray, array.array
+    """
+    def bindColumn(self, name, column):
+        current = getattr(self, name)
+        if len(column) != len(current):
+            raise ValueError(f"Expected a column of {len(current)} values but got {len(column)}")
+        column[:] = current
+        self._setColumn(name, column)
+        self._moved()
+    
+    def _setColumn(self, name, column):
+        if name == 'x':
+            self.__x = column
+        elif name == 'y':
+            self.__y = column
+        elif name == 'fillIndex':
+            self.__fillIndex = column
+        elif name == 'visibleMask':
+            self.__shown = column
+        else:
+            raise AttributeError(f"{type(self).__name__} has no column '{name}'")
+    
+    """d
+    Marks the array as changed. Must be called after writing into a column directly.
+    """
+    def markChanged(self):
+        self._moved()
+    
+    """d
+    Moves every shape, or the selected shapes, by the provided offsets.
+    :param dx :- The offset along the x-axis, either one number or one per shape :- number, sequence
+    :param dy :- The offset along the y-axis, either one number or one per shape :- number, sequence
+    """
+    def move(self, dx, dy):
+        if numpy is not None:
+            self.__x += dx
+            self.__y += dy
+        else:
+            ShapeArray.__offset(self.__x, dx)
+            ShapeArray.__offset(self.__y, dy)
+        self._moved()
+    
+    def __offset(column, delta):
+        if isinstance(delta, (int, float)):
+            for i in range(len(column)):
+                column[i] += delta
+        else:
+            for i, value in enumerate(delta):
+                column[i] += value
+    
+    """d
+    Sets the fill color of the selected shapes.
+    :param color :- The new fill color :- color, string
+    :param indices=None :- [Optional] The shapes to recolor, as an index, a slice, a list of indices or a mask with one bool per shape. Defaults to every shape :- int, slice, sequence
+    """
+    def setFill(self, color, indices=None):
+        color = Color.TRANSPARENT if color == None else color
+        css = Color.toCSS(color)
+        if css in self.__paletteCSS:
+            index = self.__paletteCSS.index(css)
+        else:
+            index = len(self.__palette)
+            self.__palette.append(color)
+            self.__paletteCSS.append(css)
+        self.__assign(self.__fillIndex, indices, index)
+        self._changed()
+    
+    """d
+    Replaces the palette, keeping the index of every shape, so that shapes can be recolored by writing into fillIndex, such as with a table from Color.gradient().
+    :param colors :- The new fill colors. Must have an entry for every index in fillIndex :- list
+    """
+    def setPalette(self, colors):
+        if not colors:
+            raise ValueError("The palette needs at least one color")
+        self.__palette = [Color.TRANSPARENT if color == None else color for color in colors]
+        self.__paletteCSS = [Color.toCSS(color) for color in self.__palette]
+        self._changed()
+    
+    """d
+    Shows or hides the selected shapes.
+    :param visible :- Whether or not the selected shapes are drawn :- bool
+    :param indices=None :- [Optional] The shapes to change, as an index, a slice, a list of indices or a mask with one bool per shape. Defaults to every shape :- int, slice, sequence
+    """
+    def setVisible(self, visible, indices=None):
+        self.__assign(self.__shown, indices, 1 if visible else 0)
+        self._moved()
+    
+    def __assign(self, column, indices, value):
+        if indices is None:
+            ShapeArray.copyInto(column, value)
+            return
+        if numpy is not None:
+            column[indices] = value
+            return
+        if isinstance(indices, int):
+            column[indices] = value
+            return
+        if isinstance(indices, slice):
+            indices = range(*indices.indices(self.__count))
+        indices = list(indices)
+        if len(indices) == self.__count and all(isinstance(index, bool) for index in indices):
+            indices = [i for i, selected in enumerate(indices) if selected]
+        for i in indices:
+            column[i] = value
+    
+    def _drawArray(self, canvas):
+        if not self._visible:
+            return
+        self._drawShapes(canvas, self.__paletteCSS, self.__borderCSS, self.__borderWidth)
+    
+    def _selected(self, hits):
+        if numpy is not None:
+            return numpy.flatnonzero(hits & self.__shown).tolist()
+        return [i for i, (hit, shown) in enumerate(zip(hits, self.__shown)) if hit and shown]
+    
+    def __getX(self):
+        return self.__x
+    def __setX(self, x):
+        ShapeArray.copyInto(self.__x, x)
+        self._moved()
+    def __getY(self):
+        return self.__y
+    def __setY(self, y):
+        ShapeArray.copyInto(self.__y, y)
+        self._moved()
+    def __getFillIndex(self):
+        return self.__fillIndex
+    def __setFillIndex(self, fillIndex):
+        ShapeArray.copyInto(self.__fillIndex, fillIndex)
+        self._changed()
+    def __getShown(self):
+        return self.__shown
+    def __setShown(self, shown):
+        ShapeArray.copyInto(self.__shown, shown)
+        self._moved()
+    def __getPalette(self):
+        return tuple(self.__palette)
+    def __getBorder(self):
+        return self.__border
+    def __setBorder(self, border):
+        self.__border = Color.TRANSPARENT if border == None else border
+        self.__borderCSS = Color.toCSS(self.__border)
+        self._changed()
     def __getBorderWidth(self):
         return self.__borderWidth
     def __setBorderWidth(self, width):
         self.__borderWidth = width
-
-    def __area(self):
-        return math.PI * (self.radius ** 2.0)  
-
+        self._changed()
+    
     """d
-    The x-coordinate of the center point of the circle.
+    The x-coordinates of the shapes, one per shape.
+    :type numpy.ndarray, array.array
+    """
+    x = property(__getX, __setX)
+    """d
+    The y-coordinates of the shapes, one per shape.
+    :type numpy.ndarray, array.array
+    """
+    y = property(__getY, __setY)
+    """d
+    The index into palette of the fill color of each shape.
+    :type numpy.ndarray, array.array
+    """
+    fillIndex = property(__getFillIndex, __setFillIndex)
+    """d
+    Whether or not each shape is drawn, one entry per shape. Shapes are only drawn if the whole array is also visible.
+    :type numpy.ndarray, array.array
+    """
+    visibleMask = property(__getShown, __setShown)
+    """d
+    The fill colors used by the shapes, indexed by fillIndex. Add colors to it using setFill(), or replace it using setPalette().
+    :type tuple
+    """
+    palette = property(__getPalette)
+    """d
+    The color of the border of every shape.
+    :type color, string
+    """
+    border = property(__getBorder, __setBorder)
+    """d
+    The width of the border of every shape in pixels.
     :type number
     """
-    centerX = property(__getCenterX, __setCenterX)
+    borderWidth = property(__getBorderWidth, __setBorderWidth)
+"""d
+Represents many circles stored as columns, which is much faster and smaller than creating a Circle for each of them.
+The circle at index i is centered at (x[i], y[i]) with a radius of radius[i].
+"""
+class CircleArray(ShapeArray):
+    __slots__ = ('__radius',)
+    
+    """d
+    Constructs an array of circles, all centered at (0, 0).
+    :param count :- The number of circles :- int
+    :param radius=1 :- [Optional] The starting radius of every circle :- number
+    :param fill=App.defaultFill :- [Optional] The fill color of every circle :- color, string
+    :param border=None :- [Optional] The color of the border of every circle :- color, string
+    :param borderWidth=2 :- [Optional] The width of the border in pixels :- number
+    """
+    def __init__(self, count, radius=1, fill=App.defaultFill, border=None, borderWidth=2):
+        self.__radius = ShapeArray.allocate(count)
+        ShapeArray.copyInto(self.__radius, radius)
+        ShapeArray.__init__(self, count, fill, border, borderWidth)
+    
+    def _setColumn(self, name, column):
+        if name == 'radius':
+            self.__radius = column
+        else:
+            ShapeArray._setColumn(self, name, column)
+    
+    def _drawShapes(self, canvas, palette, border, borderWidth):
+        draw = canvas.draw_circle
+        values = ShapeArray.values
+        for x, y, radius, fillIndex, shown in zip(values(self.x), values(self.y), values(self.__radius), values(self.fillIndex), values(self.visibleMask)):
+            if shown:
+                draw((x, y), radius, borderWidth, border, palette[fillIndex])
+    
+    """d
+    Finds every visible circle that contains the provided coordinate.
+    :param x :- The x value of the coordinate to check :- number
+    :param y :- The y value of the coordinate to check :- number
+    :return The indices of the circles containing the coordinate, in the order they are drawn :- list[int]
+    """
+    def contains(self, x, y):
+        if numpy is not None:
+            return self._selected((self.x - x) ** 2 + (self.y - y) ** 2 <= self.__radius ** 2)
+        return self._selected([(cx - x) ** 2 + (cy - y) ** 2 <= radius ** 2 for cx, cy, radius in zip(self.x, self.y, self.__radius)])
+    
+    def __getRadius(self):
+        return self.__radius
+    def __setRadius(self, radius):
+        ShapeArray.copyInto(self.__radius, radius)
+        self._moved()
+    def __bounds(self):
+        if len(self) == 0:
+            return (0, 0, 0, 0)
+        if numpy is not None:
+            radius = numpy.abs(self.__radius)
+            return (float((self.x - radius).min()), float((self.y - radius).min()), float((self.x + radius).max()), float((self.y + radius).max()))
+        radius = [abs(r) for r in self.__radius]
+        return (min(x - r for x, r in zip(self.x, radius)), min(y - r for y, r in zip(self.y, radius)),
+                max(x + r for x, r in zip(self.x, radius)), max(y + r for y, r in zip(self.y, radius)))
+    
+    """d
+    The radius of each circle.
+    :type numpy.ndarray, array.array
+    """
+    radius = property(__getRadius, __setRadius)
     """d
-    The y-coordinate of the center point of the circle.
-    :type number
+    The bounding box of every circle in the array in format (minX, minY, maxX, maxY).
+    :type tuple
     """
-    centerY = property(__getCenterY, __setCenterY)
+    bounds = property(__bounds)
+"""d
+Represents many rectangles stored as columns, which is much faster and smaller than creating a Rect for each of them.
+The rectangle at index i has its 'top-left' corner at (x[i], y[i]) and a size of width[i] by height[i].
+"""
+class RectArray(ShapeArray):
+    __slots__ = ('__width', '__height')
+    
     """d
-    The radius of the circle.
-    :type number
+    Constructs an array of rectangles, all with their 'top-left' corner at (0, 0).
+    :param count :- The number of rectangles :- int
+    :param width=1 :- [Optional] The starting width of every rectangle :- number
+    :param height=1 :- [Optional] The starting height of every rectangle :- number
+    :param fill=App.defaultFill :- [Optional] The fill color of every rectangle :- color, string
+    :param border=None :- [Optional] The color of the border of every rectangle :- color, string
+    :param borderWidth=2 :- [Optional] The width of the border in pixels :- number
     """
-    radius = property(__getRadius, __setRadius)
+    def __init__(self, count, width=1, height=1, fill=App.defaultFill, border=None, borderWidth=2):
+        self.__width = ShapeArray.allocate(count)
+        self.__height = ShapeArray.allocate(count)
+        ShapeArray.copyInto(self.__width, width)
+        ShapeArray.copyInto(self.__height, height)
+        ShapeArray.__init__(self, count, fill, border, borderWidth)
+    
+    def _setColumn(self, name, column):
+        if name == 'width':
+            self.__width = column
+        elif name == 'height':
+            self.__height = column
+        else:
+            ShapeArray._setColumn(self, name, column)
+    
+    def _drawShapes(self, canvas, palette, border, borderWidth):
+        draw = canvas.draw_polygon
+        values = ShapeArray.values
+        for x, y, width, height, fillIndex, shown in zip(values(self.x), values(self.y), values(self.__width), values(self.__height), values(self.fillIndex), values(self.visibleMask)):
+            if shown:
+                draw([(x, y), (x + width, y), (x + width, y + height), (x, y + height)], borderWidth, border, palette[fillIndex])
+    
     """d
-    The fill color of circle.
-    :type color, string
+    Finds every visible rectangle that contains the provided coordinate.
+    :param x :- The x value of the coordinate to check :- number
+    :param y :- The y value of the coordinate to check :- number
+    :return The indices of the rectangles containing the coordinate, in the order they are drawn :- list[int]
     """
-    fill = property(__getFill, __setFill)
+    def contains(self, x, y):
+        if numpy is not None:
+            offsetX = x - self.x
+            offsetY = y - self.y
+            return self._selected((offsetX * (offsetX - self.__width) <= 0) & (offsetY * (offsetY - self.__height) <= 0))
+        return self._selected([(x - rx) * (x - rx - width) <= 0 and (y - ry) * (y - ry - height) <= 0
+                               for rx, ry, width, height in zip(self.x, self.y, self.__width, self.__height)])
+    
+    def __getWidth(self):
+        return self.__width
+    def __setWidth(self, width):
+        ShapeArray.copyInto(self.__width, width)
+        self._moved()
+    def __getHeight(self):
+        return self.__height
+    def __setHeight(self, height):
+        ShapeArray.copyInto(self.__height, height)
+        self._moved()
+    def __bounds(self):
+        if len(self) == 0:
+            return (0, 0, 0, 0)
+        if numpy is not None:
+            endX = self.x + self.__width
+            endY = self.y + self.__height
+            return (float(numpy.minimum(self.x, endX).min()), float(numpy.minimum(self.y, endY).min()),
+                    float(numpy.maximum(self.x, endX).max()), float(numpy.maximum(self.y, endY).max()))
+        endX = [x + width for x, width in zip(self.x, self.__width)]
+        endY = [y + height for y, height in zip(self.y, self.__height)]
+        return (min(min(self.x), min(endX)), min(min(self.y), min(endY)), max(max(self.x), max(endX)), max(max(self.y), max(endY)))
+    
     """d
-    The color of the border of the circle.
-    :type color, string
+    The width of each rectangle.
+    :type numpy.ndarray, array.array
     """
-    border = property(__getBorder, __setBorder)
+    width = property(__getWidth, __setWidth)
     """d
-    The width of the border of the circle.
-    :type number
+    The height of each rectangle.
+    :type numpy.ndarray, array.array
     """
-    borderWidth = property(__getBorderWidth, __setBorderWidth)
+    height = property(__getHeight, __setHeight)
     """d
-    The area encased, or the number of pixels occupied, by this circle.
-    :type float
+    The bounding box of every rectangle in the array in format (minX, minY, maxX, maxY).
+    :type tuple
     """
-    area = property(__area)
-    
-    def __del__(self):
-        DrawScheduler.destroyShape(self.__id)
+    bounds = property(__bounds)
+
 """d
-Represents a polygon in the screenspace of the application window
+Represents a grid of equally sized cells that are each filled with one color, such as the board of a grid game or a heatmap. This is much faster and smaller than creating a Rect for each cell.
+The color of every cell is stored as an index into palette, and the cell at (column, row) is at index row * columns + column of cells.
+The grid is drawn in square chunks of chunkSize cells. Neighbouring cells of a row with the same color are merged into a single polygon,
+and a chunk is only tessellated again after one of its cells changed. Cells with a transparent color are not drawn.
 """
-class Polygon:
+class TileGrid(Shape):
+    __slots__ = ('__columns', '__rows', '__startX', '__startY', '__cellWidth', '__cellHeight', '__chunkSize', '__chunkColumns',
+                 '__cells', '__drawn', '__palette', '__paletteCSS', '__hidden', '__chunks', '__origins', '__stale')
+    
     """d
-    Constructs a polygon with the provided parameters.
-    :param points :- The points to describe the polygon :- list[tuple]
-    :param fill=App.defaultFill :- [Optional] The fill color of the rectangle :- color, string
-    :param border=None :- [Optional] The color of the border of the rectangle :- color, string
-    :param borderWidth=2 :- [Optional] The width of the border in pixels :- number
+    Constructs a grid with every cell filled with the provided color.
+    :param columns :- The number of cells in each row :- int
+    :param rows :- The number of cells in each column :- int
+    :param cellWidth :- The width of each cell in pixels :- number
+    :param cellHeight=None :- [Optional] The height of each cell in pixels. Defaults to the width :- number
+    :param startX=0 :- [Optional] The x-coordinate of the 'top-left' corner of the grid :- number
+    :param startY=0 :- [Optional] The y-coordinate of the 'top-left' corner of the grid :- number
+    :param fill=None :- [Optional] The starting color of every cell, which becomes palette[0] :- color, string
+    :param chunkSize=32 :- [Optional] The number of cells along each side of a chunk :- int
     """
-    def __init__(self, *args, fill=App.defaultFill, border=None, borderWidth=2):
-        self.__points = list(args)
-        
-        self.__fill = 'rgba(255, 255, 255, 0)' if fill == None else fill
-        self.__border = 'rgba(255, 255, 255, 0)' if border == None else border
-        self.borderWidth = borderWidth
+    def __init__(self, columns, rows, cellWidth, cellHeight=None, startX=0, startY=0, fill=None, chunkSize=32):
+        if columns <= 0 or rows <= 0:
+            raise ValueError("A TileGrid needs at least one column and one row")
+        self.__columns = columns
+        self.__rows = rows
+        self.__startX = startX
+        self.__startY = startY
+        self.__cellWidth = cellWidth
+        self.__cellHeight = cellWidth if cellHeight is None else cellHeight
+        self.__chunkSize = chunkSize
+        self.__chunkColumns = -(-columns // chunkSize)
         
-        self.visible = True
+        self.__cells = ShapeArray.allocate(columns * rows, 'i')
+        self.__drawn = self.__cells.copy() if numpy is not None else None
+        self.__palette = [Color.TRANSPARENT if fill == None else fill]
+        self.__paletteCSS = [Color.toCSS(self.__palette[0])]
+        self.__hidden = {css for css in self.__paletteCSS if TileGrid.__isTransparent(css)}
         
-        self.__calcProperties()
-
-        self.__id = DrawScheduler.registerShape(self.__draw)
+        chunkCount = self.__chunkColumns * -(-rows // chunkSize)
+        self.__chunks = [None] * chunkCount
+        self.__origins = [None] * chunkCount
+        self.__stale = bytearray(b'\x01' * chunkCount)
         
-    def __calcProperties(self):
-        centerX = 0
-        centerY = 0
-
-        xMinMax = [510,-10]
-        yMinMax = [510,-10]
-
-        l = len(self.__points)
-
-        for point in self.__points:
-            centerX += point[0]
-            centerY += point[1]
-
-            if point[0] > xMinMax[1]:
-                xMinMax[1] = point[0]
-            if point[0] < xMinMax[0]:
-                xMinMax[0] = point[0]
-
-            if point[1] > yMinMax[1]:
-                yMinMax[1] = point[1]
-            if point[1] < yMinMax[0]:
-                yMinMax[0] = point[1]
-
-        self.__centerX = int(centerX / l)
-        self.__centerY = int(centerY / l)
-
-        self.__xMinMax = xMinMax
-        self.__yMinMax = yMinMax
-    def __offsetPoints(self, newCenter):
-        for i in range(len(self.__points)):
-            offX, offY = self.__points[i][0] - self.__centerX, self.__points[i][1] - self.__centerY
-            self.__points[i] = (newCenter[0] + offX, newCenter[1] + offY)
-
-    def __draw(self, canvas):
-        if not self.visible:
-            return
-        canvas.draw_polygon(self.__points, self.borderWidth, str(self.border), str(self.fill))
-
+        self._register(self.__draw)
+    
     """d
-    Checks if the provided coordinate is contained within the polygon.
-    :param x :- The x value of the coordinate to check :- number
-    :param y :- The y value of the coordinate to check :- number
-    :return Whether or not the coordinate is contained within the polygon :- bool
+    Retrieves the index into palette of a color, adding the color to the palette if it is not in it yet.
+    :param color :- The color to look up :- color, string
+    :return The index of the color :- int
     """
-    def contains(self, x, y):
-        boundX = x >= self.__xMinMax[0] and x <= self.__xMinMax[1]
-        boundY = y >= self.__yMinMax[0] and y <= self.__yMinMax[1]
-        
-        # Major bounding box
-        if not (boundX and boundY):
-            return False
-        
-        hits = 0
-        for i in range(0, len(self.__points)):
-            a = self.__points[i]
-            b = self.__points[i-1]
-            
-            # Constraint on vertical position
-            if  y < min(a[1], b[1]) or y > max(a[1], b[1]):
-                continue
-                
-            rise = a[1] - b[1]
-            run = a[0] - b[0]
-            
-            # Vertical line case
-            if run == 0:
-                if a[0] < x:
-                    continue
-                hits += 1
-                continue
-                
-            # Horizontal line case
-            if rise == 0:
-                continue
-            
-            m = rise / run
-            
-            solvedX = ((y - a[1]) / m) + a[0]
-            if solvedX >= x:
-                hits += 1
-            
-        return (hits % 2) == 1
-            
-    def __getBorder(self):
-        return self.__border
-    def __setBorder(self, border):
-        self.__border = 'rgba(255, 255, 255, 0)' if border == None else border
-    def __getFill(self):
-        return self.__fill
-    def __setFill(self, fill):
-        self.__fill = 'rgba(255, 255, 255, 0)' if fill == None else fill
-    def __getBorderWidth(self):
-        return self.__borderWidth
-    def __setBorderWidth(self, width):
-        self.__borderWidth = width
-    def __getCenterX(self):
-        return self.__centerX
-    def __setCenterX(self, centerX):
-        self.__offsetPoints((centerX, self.__centerY))
-        self.__centerX = centerX
-    def __getCenterY(self):
-        return self.__centerY
-    def __setCenterY(self, centerY):
-        self.__offsetPoints((self.__centerX, centerY))
-        self.__centerY = centerY
-    def __getPoints(self):
-        return self.__points
-
+    def colorIndex(self, color):
+        color = Color.TRANSPARENT if color == None else color
+        css = Color.toCSS(color)
+        if css in self.__paletteCSS:
+            return self.__paletteCSS.index(css)
+        self.__palette.append(color)
+        self.__paletteCSS.append(css)
+        if TileGrid.__isTransparent(css):
+            self.__hidden.add(css)
+        return len(self.__palette) - 1
+    
     """d
-    The fill color of polygon.
-    :type color, string
+    Replaces the palette, keeping the index of every cell, so that cells can be recolored by writing into cells, such as with a table from Color.gradient().
+    :param colors :- The new colors. Must have an entry for every index in cells :- list
     """
-    fill = property(__getFill, __setFill)
+    def setPalette(self, colors):
+        if not colors:
+            raise ValueError("The palette needs at least one color")
+        self.__palette = [Color.TRANSPARENT if color == None else color for color in colors]
+        self.__paletteCSS = [Color.toCSS(color) for color in self.__palette]
+        self.__hidden = {css for css in self.__paletteCSS if TileGrid.__isTransparent(css)}
+        self.__markAll()
+    
     """d
-    The color of the border of the polygon.
-    :type color, string
+    Sets the color of one cell.
+    :param column :- The column of the cell :- int
+    :param row :- The row of the cell :- int
+    :param color :- The new color of the cell :- color, string
     """
-    border = property(__getBorder, __setBorder)
+    def setCell(self, column, row, color):
+        if not (0 <= column < self.__columns and 0 <= row < self.__rows):
+            raise IndexError(f"The cell ({column}, {row}) is outside of the {self.__columns}x{self.__rows} grid")
+        index = self.colorIndex(color)
+        position = (row * self.__columns) + column
+        if self.__cells[position] != index:
+            self.__cells[position] = index
+            self.__markCells(column, row, 1, 1)
     """d
-    The width of the border of the polygon.
-    :type number
+    Retrieves the color of one cell.
+    :param column :- The column of the cell :- int
+    :param row :- The row of the cell :- int
+    :return The color of the cell :- color, string
     """
-    borderWidth = property(__getBorderWidth, __setBorderWidth)
+    def getCell(self, column, row):
+        if not (0 <= column < self.__columns and 0 <= row < self.__rows):
+            raise IndexError(f"The cell ({column}, {row}) is outside of the {self.__columns}x{self.__rows} grid")
+        return self.__palette[self.__cells[(row * self.__columns) + column]]
+    
     """d
-    The x-coordinate of the center of the polygon.
-    :type number
+    Sets the color of every cell within a rectangle of cells. Cells of the rectangle outside of the grid are ignored.
+    :param column :- The column of the 'top-left' cell of the rectangle :- int
+    :param row :- The row of the 'top-left' cell of the rectangle :- int
+    :param width :- The number of columns in the rectangle :- int
+    :param height :- The number of rows in the rectangle :- int
+    :param color :- The new color of the cells :- color, string
     """
-    centerX = property(__getCenterX, __setCenterX)
+    def fillCells(self, column, row, width, height, color):
+        column0, row0 = max(column, 0), max(row, 0)
+        column1, row1 = min(column + width, self.__columns), min(row + height, self.__rows)
+        if column1 <= column0 or row1 <= row0:
+            return
+        index = self.colorIndex(color)
+        columns = self.__columns
+        if numpy is not None:
+            self.__cells.reshape(self.__rows, columns)[row0:row1, column0:column1] = index
+        else:
+            values = array.array('i', [index]) * (column1 - column0)
+            for cellRow in range(row0, row1):
+                self.__cells[(cellRow * columns) + column0:(cellRow * columns) + column1] = values
+        self.__markCells(column0, row0, column1 - column0, row1 - row0)
+    
     """d
-    The y-coordinate of the center of the polygon.
-    :type number
+    Finds the cell containing the provided coordinate.
+    :param x :- The x value of the coordinate to check :- number
+    :param y :- The y value of the coordinate to check :- number
+    :return The cell in format (column, row), or None if the coordinate is outside of the grid :- tuple
     """
-    centerY = property(__getCenterY, __setCenterY)
+    def cellAt(self, x, y):
+        column = int((x - self.__startX) // self.__cellWidth)
+        row = int((y - self.__startY) // self.__cellHeight)
+        if 0 <= column < self.__columns and 0 <= row < self.__rows:
+            return (column, row)
+        return None
+    
     """d
-    The points that describe the polygon.
-    :type list[tuple]
+    Marks cells as changed. Must be called after writing into cells directly. Without a rectangle of cells, the changed chunks are found
+    by comparing every cell against what was last drawn when NumPy is installed, and every chunk is tessellated again otherwise.
+    :param column=None :- [Optional] The column of the 'top-left' cell of the changed rectangle :- int
+    :param row=None :- [Optional] The row of the 'top-left' cell of the changed rectangle :- int
+    :param width=1 :- [Optional] The number of columns in the changed rectangle :- int
+    :param height=1 :- [Optional] The number of rows in the changed rectangle :- int
     """
-    points = property(__getPoints)
+    def markChanged(self, column=None, row=None, width=1, height=1):
+        if column is not None and row is not None:
+            self.__markCells(column, row, width, height)
+            return
+        if numpy is None:
+            self.__markAll()
+            return
+        changed = numpy.flatnonzero(self.__cells != self.__drawn)
+        if len(changed) == 0:
+            return
+        size = self.__chunkSize
+        chunks = numpy.unique(((changed // self.__columns) // size) * self.__chunkColumns + ((changed % self.__columns) // size))
+        for chunk in chunks.tolist():
+            self.__stale[chunk] = 1
+        self._changed()
     
-    def __del__(self):
-        DrawScheduler.destroyShape(self.__id)
-"""d
-Represents a string of text in the screenspace of the application window
-"""
-class Text:
     """d
-    Constructs a text object with the provided parameters.
-    :param text :- The text for this shape to display :- string
-    :param centerX :- The x-coordinate of the center of this shape :- number
-    :param centerY :- The y-coordinate of the center of this shape :- number
-    :param size :- The size of the font to render the text :- number
-    :param fill=App.defaultFill :- [Optional] The fill color of the rectangle :- color, string
+    Checks whether the provided coordinate is within the grid.
+    :param x :- The x value of the coordinate to check :- number
+    :param y :- The y value of the coordinate to check :- number
+    :return Whether or not the coordinate is within one of the cells :- bool
     """
-    def __init__(self, text, centerX, centerY, size, fill=App.defaultFill):
-        self.__text = text
-        self.__centerX = centerX
-        self.__centerY = centerY
-        self.__size = size
-        
-        self.__fill = 'rgba(255, 255, 255, 0)' if fill == None else fill
-        
-        self.__recalculatePoint()
-        
-        DrawScheduler.registerShape(self.__draw)
-        
-    def __draw(self, canvas):
-        canvas.draw_text(self.__text, self.__point, self.size, str(self.fill))
+    def contains(self, x, y):
+        return self.cellAt(x, y) is not None
     
-    def __recalculatePoint(self):
-        self.__point = (self.__centerX - (App.textSize(self.__text, self.__size) / 2.0), self.__centerY + (self.__size / 4.0))
+    def __isTransparent(css):
+        color = Color.parse(css)
+        return color is not None and getattr(color, 'a', 1.0) == 0
     
-    def __width(self):
-        return App.textSize(self.__text, self.size)
-    def __height(self):
-        return self.__size / 4
+    def __markCells(self, column, row, width, height):
+        size = self.__chunkSize
+        chunkColumns = self.__chunkColumns
+        column0, row0 = max(column, 0) // size, max(row, 0) // size
+        column1 = (min(column + width, self.__columns) - 1) // size
+        row1 = (min(row + height, self.__rows) - 1) // size
+        for chunkRow in range(row0, row1 + 1):
+            for chunkColumn in range(column0, column1 + 1):
+                self.__stale[(chunkRow * chunkColumns) + chunkColumn] = 1
+        self._changed()
     
-    def __getText(self):
-        return self.__text
-    def __setText(self, text):
-        self.__text = str(text)
-        self.__recalculatePoint()
-    def __getCenterX(self):
-        return self.__centerX
-    def __setCenterX(self, centerX):
-        self.__centerX = centerX
-        self.__recalculatePoint()
-    def __getCenterY(self):
-        return self.__centerY
-    def __setCenterY(self, centerY):
-        self.__centerY = centerY
-        self.__recalculatePoint()
-    def __getSize(self):
-        return self.__size
-    def __setSize(self, size):
-        self.__size = size
-        self.__recalculatePoint()
-    def __getFill(self):
-        return self.__fill
-    def __setFill(self, fill):
-        self.__fill = 'rgba(255, 255, 255, 0)' if fill == None else fill
+    def __markAll(self):
+        self.__stale[:] = b'\x01' * len(self.__stale)
+        self._changed()
+    
+    def __tessellate(self, chunk):
+        size = self.__chunkSize
+        columns = self.__columns
+        column0 = (chunk % self.__chunkColumns) * size
+        row0 = (chunk // self.__chunkColumns) * size
+        column1, row1 = min(column0 + size, columns), min(row0 + size, self.__rows)
+        if numpy is not None:
+            # Runs start wherever a cell differs from the one on its left, and end where the next run of the same row starts
+            block = self.__cells.reshape(self.__rows, columns)[row0:row1, column0:column1]
+            self.__drawn.reshape(self.__rows, columns)[row0:row1, column0:column1] = block
+            starts = numpy.ones(block.shape, dtype=bool)
+            starts[:, 1:] = block[:, 1:] != block[:, :-1]
+            runRows, runStarts = numpy.nonzero(starts)
+            runEnds = numpy.empty_like(runStarts)
+            runEnds[:-1] = numpy.where(runRows[1:] == runRows[:-1], runStarts[1:], column1 - column0)
+            runEnds[-1] = column1 - column0
+            runs = zip(runRows.tolist(), runStarts.tolist(), runEnds.tolist(), block[runRows, runStarts].tolist())
+        else:
+            runs = []
+            cells = self.__cells
+            for row in range(row1 - row0):
+                offset = ((row0 + row) * columns) + column0
+                start = 0
+                for column in range(1, column1 - column0 + 1):
+                    if column == column1 - column0 or cells[offset + column] != cells[offset + start]:
+                        runs.append((row, start, column, cells[offset + start]))
+                        start = column
+        paletteCSS = self.__paletteCSS
+        hidden = self.__hidden
+        width, height = self.__cellWidth, self.__cellHeight
+        startX, startY = self.__startX + (column0 * width), self.__startY + (row0 * height)
+        polygons = []
+        for row, start, end, index in runs:
+            css = paletteCSS[index]
+            if css in hidden:
+                continue
+            x0, x1 = startX + (start * width), startX + (end * width)
+            y0 = startY + (row * height)
+            polygons.append(([(x0, y0), (x1, y0), (x1, y0 + height), (x0, y0 + height)], css))
+        self.__chunks[chunk] = polygons
+        self.__origins[chunk] = (self.__startX, self.__startY)
+        self.__stale[chunk] = 0
+    
+    def __translate(self, chunk):
+        # Moving the grid only offsets the cached polygons of a chunk, the next time it is drawn, instead of finding its runs again
+        originX, originY = self.__origins[chunk]
+        dx, dy = self.__startX - originX, self.__startY - originY
+        self.__chunks[chunk] = [([(x + dx, y + dy) for x, y in points], css) for points, css in self.__chunks[chunk]]
+        self.__origins[chunk] = (self.__startX, self.__startY)
+    
+    def __draw(self, canvas):
+        if not self._visible:
+            return
+        size = self.__chunkSize
+        chunkColumns = self.__chunkColumns
+        column0, row0, column1, row1 = 0, 0, chunkColumns - 1, (len(self.__chunks) - 1) // chunkColumns
+        if DrawScheduler.culling:
+            # Only the chunks overlapping the view are drawn, and only those are tessellated
+            cameraX, cameraY = DrawScheduler.getCamera()
+            viewWidth, viewHeight = DrawScheduler.getViewport()
+            margin = DrawScheduler.cullMargin
+            chunkWidth, chunkHeight = size * self.__cellWidth, size * self.__cellHeight
+            column0 = max(column0, int((cameraX - margin - self.__startX) // chunkWidth))
+            row0 = max(row0, int((cameraY - margin - self.__startY) // chunkHeight))
+            column1 = min(column1, int((cameraX + viewWidth + margin - self.__startX) // chunkWidth))
+            row1 = min(row1, int((cameraY + viewHeight + margin - self.__startY) // chunkHeight))
+        draw = canvas.draw_polygon
+        chunks = self.__chunks
+        origins = self.__origins
+        origin = (self.__startX, self.__startY)
+        stale = self.__stale
+        for chunkRow in range(row0, row1 + 1):
+            for chunk in range((chunkRow * chunkColumns) + column0, (chunkRow * chunkColumns) + column1 + 1):
+                if stale[chunk]:
+                    self.__tessellate(chunk)
+                elif origins[chunk] != origin:
+                    self.__translate(chunk)
+                # The border is drawn in the fill color so that neighbouring runs meet without seams
+                for points, css in chunks[chunk]:
+                    draw(points, 1, css, css)
     
     """d
-    The text displayed by this shape.
-    :type string
+    Moves the grid by the provided offsets.
+    :param dx :- The offset along the x-axis :- number
+    :param dy :- The offset along the y-axis :- number
     """
-    text = property(__getText, __setText)
+    def move(self, dx, dy):
+        self.__startX += dx
+        self.__startY += dy
+        self._moved()
+    
+    def __getColumns(self):
+        return self.__columns
+    def __getRows(self):
+        return self.__rows
+    def __getStartX(self):
+        return self.__startX
+    def __setStartX(self, startX):
+        self.__startX = startX
+        self._moved()
+    def __getStartY(self):
+        return self.__startY
+    def __setStartY(self, startY):
+        self.__startY = startY
+        self._moved()
+    def __getCellWidth(self):
+        return self.__cellWidth
+    def __getCellHeight(self):
+        return self.__cellHeight
+    def __getCells(self):
+        return self.__cells
+    def __setCells(self, cells):
+        ShapeArray.copyInto(self.__cells, cells)
+        self.markChanged()
+    def __getPalette(self):
+        return tuple(self.__palette)
+    def __bounds(self):
+        return (self.__startX, self.__startY,
+                self.__startX + (self.__columns * self.__cellWidth), self.__startY + (self.__rows * self.__cellHeight))
+    
     """d
-    The x-coordinate of the center of this shape.
-    :type number
+    The number of cells in each row.
+    :type int
     """
-    centerX = property(__getCenterX, __setCenterX)
+    columns = property(__getColumns)
     """d
-    The y-coordinate of the center of this shape.
-    :type number
+    The number of cells in each column.
+    :type int
     """
-    centerY = property(__getCenterY, __setCenterY)
+    rows = property(__getRows)
     """d
-    The size of the font for the text.
+    The x-coordinate of the 'top-left' corner of the grid.
     :type number
     """
-    size = property(__getSize, __setSize)
+    startX = property(__getStartX, __setStartX)
     """d
-    The fill color of the text.
-    :type color, string
+    The y-coordinate of the 'top-left' corner of the grid.
+    :type number
     """
-    fill = property(__getFill, __setFill)
+    startY = property(__getStartY, __setStartY)
     """d
-    The width, or size along the x-axis, of the text.
+    The width of each cell in pixels.
     :type number
     """
-    width = property(__width)
+    cellWidth = property(__getCellWidth)
     """d
-    The height, or size along the y-axis, of the text.
+    The height of each cell in pixels.
     :type number
     """
-    height = property(__height)
+    cellHeight = property(__getCellHeight)
+    """d
+    The index into palette of the color of each cell, row by row. Call markChanged() after writing into it directly.
+    :type numpy.ndarray, array.array
+    """
+    cells = property(__getCells, __setCells)
+    """d
+    The colors used by the cells, indexed by cells. Add colors to it using colorIndex(), or replace it using setPalette().
+    :type tuple
+    """
+    palette = property(__getPalette)
+    """d
+    The bounding box of the grid in format (minX, minY, maxX, maxY).
+    :type tuple
+    """
+    bounds = property(__bounds)
+
+"""d
+Runs a physics kernel over a shape array in a pool of processes, each handling one partition of the shapes, so simulations can use every core.
+The columns of the array, plus any extra columns such as velocities, are moved into shared memory, so the workers write positions
+that are drawn directly without copying. Requires NumPy.
+The kernel is called as kernel(read, write, start, stop, dt), where read and write map column names to arrays. read holds the values
+from the start of the step and must not be changed, and write holds the live values, of which only the entries from start up to stop may be changed.
+It must be defined at the top level of a module so it can be sent to the worker processes.
+Workers are forked where the platform supports it, and otherwise import the module with CMU_HEADLESS set so that they never open a window.
+Call close(), or use the ParallelStep in a with statement, to stop the workers and free the shared memory once the simulation is done.
+"""
+class ParallelStep:
+    _kernel = None
+    _read = None
+    _write = None
+    _blocks = None
     
-    def contains(self, x, y):
-        raise NotImplementedError()
+    """d
+    Moves the columns of a shape array into shared memory and starts the worker processes.
+    :param shapes :- The shape array to simulate :- ShapeArray
+    :param kernel :- The function that advances one partition of the shapes by a step :- function
+    :param columns=('x', 'y') :- [Optional] The columns of the shape array to share with the kernel :- tuple
+    :param extra=('vx', 'vy') :- [Optional] The names of extra columns of floats to create for the kernel, starting at 0 :- tuple
+    :param workers=None :- [Optional] The number of worker processes. Defaults to the number of cores :- int
+    """
+    def __init__(self, shapes, kernel, columns=('x', 'y'), extra=('vx', 'vy'), workers=None):
+        self.__closed = False
+        self.__pool = None
+        self.__blocks = []
+        self.__shared = ()
+        self.read = {}
+        self.write = {}
+        if numpy is None:
+            raise ImportError("ParallelStep requires NumPy")
+        workers = workers or os.cpu_count() or 1
+        count = len(shapes)
+        self.__shapes = shapes
+        try:
+            self.__start(shapes, kernel, tuple(columns), tuple(extra), workers, count)
+        except BaseException:
+            self.close()
+            raise
+    
+    def __start(self, shapes, kernel, columns, extra, workers, count):
+        specs = []
+        for name in columns + extra:
+            dtype = getattr(shapes, name).dtype if name in columns else numpy.dtype('float64')
+            for side in (self.read, self.write):
+                block = shared_memory.SharedMemory(create=True, size=max(1, count * dtype.itemsize))
+                self.__blocks.append(block)
+                side[name] = numpy.ndarray(count, dtype=dtype, buffer=block.buf)
+                side[name][:] = 0
+                specs.append((side is self.read, name, block.name, dtype.str))
+            if name in columns:
+                shapes.bindColumn(name, self.write[name])
+                self.__shared += (name,)
+        bounds = numpy.linspace(0, count, workers + 1).astype('int64').tolist()
+        self.__partitions = [(start, stop) for start, stop in zip(bounds, bounds[1:]) if stop > start]
+        # Under the spawn and forkserver start methods every worker imports this module again, which must not open a window
+        context = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else None)
+        headless = os.environ.get('CMU_HEADLESS')
+        os.environ['CMU_HEADLESS'] = '1'
+        try:
+            self.__pool = context.Pool(workers, initializer=ParallelStep._attach, initargs=(kernel, specs, count))
+        finally:
+            if headless is None:
+                del os.environ['CMU_HEADLESS']
+            else:
+                os.environ['CMU_HEADLESS'] = headless
+    
+    def _attach(kernel, specs, count):
+        ParallelStep._kernel = kernel
+        ParallelStep._read = {}
+        ParallelStep._write = {}
+        ParallelStep._blocks = []
+        for isRead, name, blockName, dtype in specs:
+            block = shared_memory.SharedMemory(name=blockName)
+            ParallelStep._blocks.append(block)
+            side = ParallelStep._read if isRead else ParallelStep._write
+            side[name] = numpy.ndarray(count, dtype=numpy.dtype(dtype), buffer=block.buf)
+    
+    def _run(start, stop, dt):
+        ParallelStep._kernel(ParallelStep._read, ParallelStep._write, start, stop, dt)
+    
+    """d
+    Advances every shape by one step, running the kernel over every partition in parallel and waiting for all of them. Can be passed directly to App.onTick().
+    :param dt :- The time to advance by, passed on to the kernel :- float
+    """
+    def step(self, dt):
+        for name, column in self.write.items():
+            self.read[name][:] = column
+        self.__pool.starmap(ParallelStep._run, [(start, stop, dt) for start, stop in self.__partitions])
+        self.__shapes.markChanged()
     
+    """d
+    Stops the worker processes and frees the shared memory. The shape array keeps its current values in memory of its own.
+    """
+    def close(self):
+        if self.__closed:
+            return
+        self.__closed = True
+        if self.__pool is not None:
+            self.__pool.close()
+            self.__pool.join()
+        for name in self.__shared:
+            typecode = {dtype: code for code, dtype in ShapeArray.TYPECODES.items()}[getattr(self.__shapes, name).dtype.name]
+            self.__shapes.bindColumn(name, ShapeArray.allocate(len(self.__shapes), typecode))
+        self.read = {}
+        self.write = {}
+        for block in self.__blocks:
+            block.close()
+            block.unlink()
+        self.__blocks = []
+    
+    def __enter__(self):
+        return self
+    def __exit__(self, *exception):
+        self.close()
     def __del__(self):
-        DrawScheduler.destroyShape(self.__id)
+        self.close()
+
 """d
-Represents a line in the screenspace of the application window
+Draws a group of shapes by replaying their canvas commands, compiled once, instead of running every shape's drawer every frame.
+Consecutive commands of the same kind are stored together so replaying them looks up each canvas method only once.
+The group is drawn where its back-most shape was in the draw order when it was frozen, and is recompiled whenever one of its shapes changes.
 """
-class Line:
-    def __init__(self, startX, startY, endX, endY, lineWidth, fill=App.defaultFill):
-        self.startX = startX
-        self.startY = startY
-        self.endX = endX
-        self.endY = endY
-        
-        self.lineWidth = lineWidth
-        
-        self.fill = 'rgba(255, 255, 255, 0)' if fill == None else fill
-        
-        self.__id = DrawScheduler.registerShape(self.__draw)
-        
+class DisplayList:
+    """d
+    Compiles the provided shapes into a display list. Usually created using App.freeze().
+    :param shapes :- The shapes to draw through the list :- list
+    """
+    def __init__(self, shapes):
+        self.__shapes = []
+        for shape in shapes:
+            if shape._displayList is not None:
+                raise ValueError(f"{type(shape).__name__} is already frozen in another display list")
+            shape._displayList = self
+            self.__shapes.append(shape)
+            DrawScheduler.detach(shape._handle)
+        self.__runs = []
+        self.__stale = True
+        self.compiles = 0
+        self.__id = DrawScheduler.registerShape(DisplayList.__draw, False, self)
+        if self.__shapes:
+            back = min(self.__shapes, key=DisplayList.__drawKey)
+            DrawScheduler.matchOrder(self.__id, back._handle)
+    
+    def __drawKey(shape):
+        return DrawScheduler.drawKey(shape._handle)
+    
+    """d
+    Marks the list as needing to be compiled again before it is next drawn. Called automatically when a frozen shape changes.
+    """
+    def markStale(self):
+        if not self.__stale:
+            self.__stale = True
+            DrawScheduler.markDirty()
+    
+    def __compile(self):
+        commands = []
+        recorder = CommandRecorder(HeadlessCanvas(), commands)
+        self.__shapes.sort(key=DisplayList.__drawKey)
+        for shape in self.__shapes:
+            DrawScheduler.getDrawer(shape._handle)(recorder)
+        runs = []
+        for name, args in commands:
+            if runs and runs[-1][0] == name:
+                runs[-1][1].append(args)
+            else:
+                runs.append((name, [args]))
+        self.__runs = runs
+        self.__stale = False
+        self.compiles += 1
+    
     def __draw(self, canvas):
-        canvas.draw_line((self.startX, self.startY), (self.endX, self.endY), self.lineWidth, self.fill)
-
-    def __del__(self):
+        if self.__stale:
+            self.__compile()
+        for name, calls in self.__runs:
+            method = getattr(canvas, name)
+            for args in calls:
+                method(*args)
+    
+    """d
+    Takes a shape out of the list, so it is drawn normally again. Shapes that are not in the list are ignored.
+    :param shape :- The shape to take out :- shape
+    """
+    def discard(self, shape):
+        if shape._displayList is not self:
+            return
+        self.__shapes.remove(shape)
+        shape._displayList = None
+        DrawScheduler.attach(shape._handle)
+        self.markStale()
+    
+    """d
+    Stops drawing the shapes through the list and draws each of them normally again.
+    """
+    def release(self):
+        for shape in self.__shapes:
+            shape._displayList = None
+            DrawScheduler.attach(shape._handle)
+        self.__shapes = []
+        self.__runs = []
         DrawScheduler.destroyShape(self.__id)
-        
+    
+    def __len__(self):
+        return len(self.__shapes)
+
 App.initialize()
\ No newline at end of file
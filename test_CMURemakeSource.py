@@ -0,0 +1,990 @@
+import gc
+import json
+import random
+import math
+import os
+import pickle
+import time
+import unittest
+from unittest import mock
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+os.environ.setdefault('CMU_HEADLESS', '1')
+
+import CMURemakeSource
+from CMURemakeSource import (App, Color, RGB, RGBA, HSL, HSLA, DrawOrder, DrawScheduler, SpatialIndex, Collisions, Tweens, InputLog, TextMetrics,
+                             HeadlessBackend, TaskScheduler, Shape, Rect, Circle, Polygon, Line, Text, CircleArray, RectArray, TileGrid, ParallelStep)
+
+"""d
+Regression tests for the library, run on the headless backend with: python -m unittest (or python -m pytest).
+"""
+
+def drift(read, write, start, stop, dt):
+    write['x'][start:stop] = read['x'][start:stop] + (read['vx'][start:stop] * dt)
+    write['headless'][start:stop] = os.environ.get('CMU_HEADLESS') == '1'
+
+class HeadlessTestCase(unittest.TestCase):
+    def setUp(self):
+        DrawScheduler.clear()
+        self.frame = App.initialize(HeadlessBackend)
+    def tearDown(self):
+        DrawScheduler.clear()
+
+class BackendTests(HeadlessTestCase):
+    class Window:
+        def create_frame(title, width, height, control_width=200):
+            frame = HeadlessBackend.create_frame(title, width, height)
+            frame.title = 'window'
+            return frame
+    def backendFor(self, value):
+        with mock.patch.object(CMURemakeSource, 'simplegui', BackendTests.Window), mock.patch.dict(os.environ, {'CMU_HEADLESS': value}):
+            return App.initialize().title
+    def test_headless_values(self):
+        for value in ('1', 'true', 'yes'):
+            self.assertEqual(self.backendFor(value), 'Test')
+    def test_windowed_values(self):
+        for value in ('', '0', 'false', 'False'):
+            self.assertEqual(self.backendFor(value), 'window')
+
+class ProfilingTests(HeadlessTestCase):
+    def tearDown(self):
+        App.disableProfiling()
+        HeadlessTestCase.tearDown(self)
+    def test_frame_stats(self):
+        Rect(0, 0, 10, 10)
+        App.enableProfiling(shapeTypes=True)
+        self.frame.step(5)
+        stats = App.frameStats()
+        self.assertEqual(stats['frames'], 5)
+        self.assertLessEqual(stats['p50'], stats['p95'])
+        self.assertLessEqual(stats['p95'], stats['max'])
+        self.assertEqual(set(stats['phases']), {'keys', 'ticks', 'timers', 'update', 'tweens', 'collisions', 'tasks', 'draw'})
+        self.assertEqual(list(stats['shapeTypes']), ['Rect'])
+        exported = json.loads(App.exportFrameStats())
+        self.assertEqual(len(exported['frames']), 5)
+        self.assertEqual(exported['stats']['frames'], 5)
+    def test_capacity_and_disabling(self):
+        App.enableProfiling(capacity=3)
+        self.frame.step(5)
+        App.disableProfiling()
+        self.frame.step(5)
+        self.assertEqual(App.frameStats()['frames'], 3)
+        App.enableProfiling()
+        self.assertEqual(App.frameStats()['frames'], 0)
+    def test_dropped_frames(self):
+        budget = App.frameBudget
+        App.frameBudget = -1
+        try:
+            App.enableProfiling()
+            self.frame.step(4)
+            self.assertEqual(App.frameStats()['droppedFrames'], 4)
+        finally:
+            App.frameBudget = budget
+
+class ColorTests(HeadlessTestCase):
+    def test_percentage_rgb(self):
+        self.assertIs(Color.parse('rgb(100%, 0%, 0%)'), RGB(255, 0, 0))
+        self.assertIs(Color.parse('rgb(50%, 50%, 50%)'), RGB(128, 128, 128))
+    def test_percentage_alpha(self):
+        self.assertIs(Color.parse('rgba(255,0,0,50%)'), RGBA(255, 0, 0, 0.5))
+        self.assertIs(Color.parse('hsla(120, 50%, 50%, 25%)'), HSLA(120, 50, 50, 0.25))
+    def test_percentage_hue_is_not_parsed(self):
+        self.assertIsNone(Color.parse('hsl(10%, 5%, 5%)'))
+        self.assertEqual(Color.toCSS('hsl(10%, 5%, 5%)'), 'hsl(10%, 5%, 5%)')
+    def test_colors_are_interned_and_immutable(self):
+        red = RGB(255, 0, 0)
+        self.assertIs(RGB(300, 0, 0), red)
+        self.assertEqual(red.css, 'rgb(255, 0, 0)')
+        self.assertEqual(str(red), red.css)
+        with self.assertRaises(AttributeError):
+            red.r = 0
+        self.assertIs(pickle.loads(pickle.dumps(red)), red)
+    def test_transparent_is_canonical(self):
+        self.assertEqual(Color.toCSS(Color.TRANSPARENT), Color.TRANSPARENT)
+        self.assertEqual(Color.toCSS(None), Color.TRANSPARENT)
+
+class ColorConversionTests(unittest.TestCase):
+    def conversions(self):
+        r, g, b = [255, 0, 12, 128, 200], [0, 255, 200, 128, 30], [0, 0, 99, 128, 250]
+        h, s, l = Color.rgbToHsl(r, g, b)
+        return (r, g, b), (list(h), list(s), list(l)), [list(channel) for channel in Color.hslToRgb(h, s, l)]
+    def check(self):
+        rgb, hsl, back = self.conversions()
+        for i in range(5):
+            self.assertEqual([round(value, 6) for value in Color.components(RGB(*(channel[i] for channel in rgb)), HSL)], [round(channel[i], 6) for channel in hsl])
+            for channel, original in zip(back, rgb):
+                self.assertAlmostEqual(channel[i], original[i])
+    def test_bulk_conversion(self):
+        self.check()
+    def test_bulk_conversion_without_numpy(self):
+        with mock.patch.object(CMURemakeSource, 'numpy', None):
+            self.check()
+    def test_lerp(self):
+        self.assertIs(Color.lerp('black', RGB(200, 100, 50), 0.5), RGB(100, 50, 25))
+        self.assertEqual(Color.lerp(HSL(350, 100, 50), HSL(10, 100, 50), 0.5).h, 0)
+        self.assertIs(Color.lerp(RGBA(0, 0, 0, 0), RGBA(0, 0, 0, 1), 0.25), RGBA(0, 0, 0, 0.25))
+    def test_blend(self):
+        self.assertIs(Color.blend('white', RGBA(255, 0, 0, 0.5)), RGB(255, 128, 128))
+        self.assertIs(Color.blend(RGBA(0, 0, 255, 0.5), RGBA(255, 0, 0, 0.5)), RGBA(170, 0, 85, 0.75))
+        self.assertIs(Color.blend(None, None), RGBA(0, 0, 0, 0))
+    def test_gradient(self):
+        table = Color.gradient(['black', 'white'], 3)
+        self.assertEqual(table, ['rgb(0, 0, 0)', 'rgb(128, 128, 128)', 'rgb(255, 255, 255)'])
+        self.assertIs(Color.gradient(['black', 'white'], 3), table)
+        self.assertEqual(Color.gradient([HSL(350, 100, 50), HSL(10, 100, 50)], 3, HSL)[1], 'hsl(0, 100.0%, 50.0%)')
+        self.assertEqual(len(Color.gradient('viridis')), 256)
+        with self.assertRaises(ValueError):
+            Color.gradient([])
+    def test_gradient_without_numpy(self):
+        expected = Color.gradient('coolwarm', 50)
+        with mock.patch.object(CMURemakeSource, 'numpy', None):
+            self.assertEqual(Color.gradient('coolwarm', 50, RGBA), [css.replace('rgb(', 'rgba(').replace(')', ', 1.0)') for css in expected])
+    def test_quantize(self):
+        self.assertEqual(list(Color.quantize([-1, 0.5, 2, 0.2], 3)), [0, 1, 2, 0])
+        self.assertEqual(list(Color.quantize([5, 15], 11, 5, 15)), [0, 10])
+
+class TileGridTests(HeadlessTestCase):
+    def polygonCount(self):
+        return self.frame.step().frameCalls
+    def test_transparent_cells_are_not_drawn(self):
+        grid = TileGrid(4, 4, 10)
+        self.assertEqual(self.polygonCount(), 0)
+        grid.setCell(1, 1, 'red')
+        grid.setCell(2, 2, 'transparent')
+        grid.setCell(3, 3, RGBA(0, 0, 255, 0))
+        self.assertEqual(self.polygonCount(), 1)
+    def test_runs_are_merged(self):
+        grid = TileGrid(8, 2, 10, fill='red')
+        grid.setCell(4, 1, 'blue')
+        self.assertEqual(self.polygonCount(), 4)
+    def test_shapes_at(self):
+        grid = TileGrid(10, 10, 10, fill='red')
+        self.assertEqual(App.shapesAt(5, 5), [grid])
+        self.assertEqual(App.shapesAt(150, 5), [])
+        self.assertEqual(grid.cellAt(25, 95), (2, 9))
+    def drawnPolygons(self, grid):
+        self.frame.canvas.record = True
+        try:
+            return [args[0] for name, args in self.frame.step().commands]
+        finally:
+            self.frame.canvas.record = False
+    def test_moved_chunks_are_translated(self):
+        grid = TileGrid(40, 40, 10, fill='red', chunkSize=8)
+        grid.fillCells(3, 3, 20, 20, 'blue')
+        self.drawnPolygons(grid)
+        grid.move(-35, 12)
+        grid.startY -= 2
+        grid.setCell(10, 0, 'green')
+        moved = self.drawnPolygons(grid)
+        grid.remove()
+        fresh = TileGrid(40, 40, 10, startX=-35, startY=10, fill='red', chunkSize=8)
+        fresh.fillCells(3, 3, 20, 20, 'blue')
+        fresh.setCell(10, 0, 'green')
+        self.assertEqual(sorted(moved), sorted(self.drawnPolygons(fresh)))
+
+class PolygonTests(HeadlessTestCase):
+    def star(self):
+        return Polygon(*[(100 + 50 * math.cos(math.radians(-90 + 144 * i)), 100 + 50 * math.sin(math.radians(-90 + 144 * i))) for i in range(5)])
+    def test_pentagram_is_not_convex(self):
+        self.assertFalse(self.star().convex)
+        self.assertTrue(Polygon((0, 0), (10, 0), (10, 10), (0, 10)).convex)
+    def test_pentagram_contains_its_tips(self):
+        star = self.star()
+        self.assertTrue(star.contains(100, 55))
+        self.assertEqual(star.containsMany([(100, 55), (0, 0)]), [True, False])
+    def test_contains_many_matches_contains(self):
+        random.seed(10)
+        points = [(random.uniform(40, 160), random.uniform(40, 160)) for _ in range(500)]
+        for polygon in (self.star(), Polygon((50, 50), (150, 60), (140, 150), (60, 140))):
+            expected = [polygon.contains(x, y) for x, y in points]
+            self.assertEqual(list(polygon.containsMany(points)), expected)
+            with mock.patch.object(CMURemakeSource, 'numpy', None):
+                self.assertEqual(polygon.containsMany(points), expected)
+            self.assertTrue(0 < expected.count(True) < len(points))
+    def assertPoints(self, polygon, points):
+        for actual, expected in zip(polygon.points, points):
+            self.assertAlmostEqual(actual[0], expected[0])
+            self.assertAlmostEqual(actual[1], expected[1])
+        self.assertEqual(len(polygon.points), len(points))
+    def test_rotate_and_scale_around_center(self):
+        square = Polygon((0, 0), (20, 0), (20, 20), (0, 20))
+        square.rotateAngle = 90
+        self.assertPoints(square, [(20, 0), (20, 20), (0, 20), (0, 0)])
+        square.rotateAngle = 0
+        square.scale = 2
+        self.assertPoints(square, [(-10, -10), (30, -10), (30, 30), (-10, 30)])
+        self.assertEqual(square.area, 1600)
+        self.assertTrue(square.contains(25, 25))
+        self.assertFalse(Polygon((0, 0), (20, 0), (20, 20), (0, 20)).contains(25, 25))
+    def test_move_keeps_rotation_and_scale(self):
+        triangle = Polygon((0, 0), (30, 0), (0, 30))
+        triangle.rotateAngle = 45
+        triangle.scale = 0.5
+        before = triangle.points
+        area = triangle.area
+        centroid = triangle.centroid
+        triangle.move(100, -50)
+        self.assertPoints(triangle, [(x + 100, y - 50) for x, y in before])
+        self.assertEqual((triangle.centerX, triangle.centerY), (110, -40))
+        self.assertAlmostEqual(triangle.area, area)
+        self.assertEqual(triangle.containsMany([centroid, (centroid[0] + 100, centroid[1] - 50)]), [False, True])
+    def test_moved_polygon_is_reindexed(self):
+        triangle = Polygon((0, 0), (30, 0), (0, 30))
+        self.assertIn(triangle, App.shapesAt(5, 5))
+        triangle.move(200, 0)
+        self.assertNotIn(triangle, App.shapesAt(5, 5))
+        self.assertIn(triangle, App.shapesAt(205, 5))
+        triangle.rotateAngle = 180
+        self.assertNotIn(triangle, App.shapesAt(205, 5))
+        self.assertIn(triangle, App.shapesAt(215, 15))
+
+class CollisionTests(HeadlessTestCase):
+    def lShape(self):
+        return Polygon((0, 0), (30, 0), (30, 10), (10, 10), (10, 30), (0, 30))
+    def test_rects(self):
+        self.assertTrue(Collisions.overlaps(Rect(0, 0, 10, 10), Rect(5, 5, 10, 10)))
+        self.assertFalse(Collisions.overlaps(Rect(0, 0, 10, 10), Rect(11, 0, 5, 5)))
+    def test_circles(self):
+        self.assertTrue(Collisions.overlaps(Circle(0, 0, 5), Circle(9, 0, 4)))
+        self.assertFalse(Collisions.overlaps(Circle(0, 0, 5), Circle(10, 0, 4)))
+    def test_circle_misses_rect_corner(self):
+        self.assertFalse(Collisions.overlaps(Circle(0, 0, 5), Rect(4, 4, 10, 10)))
+        self.assertTrue(Collisions.overlaps(Rect(4, 4, 10, 10), Circle(0, 0, 6)))
+    def test_convex_polygons(self):
+        triangle = Polygon((0, 0), (10, 0), (0, 10))
+        self.assertFalse(Collisions.overlaps(triangle, Rect(6, 6, 4, 4)))
+        self.assertTrue(Collisions.overlaps(triangle, Rect(4, 4, 4, 4)))
+        self.assertFalse(Collisions.overlaps(triangle, Circle(9, 9, 2)))
+        self.assertTrue(Collisions.overlaps(Line(0, 0, 20, 20, 1), triangle))
+        self.assertFalse(Collisions.overlaps(Line(0, 20, 20, 0, 1), triangle))
+    def test_concave_polygons(self):
+        self.assertFalse(Collisions.overlaps(self.lShape(), Rect(15, 15, 10, 10)))
+        self.assertTrue(Collisions.overlaps(self.lShape(), Rect(20, 5, 5, 10)))
+        self.assertFalse(Collisions.overlaps(self.lShape(), Circle(20, 20, 5)))
+        self.assertTrue(Collisions.overlaps(self.lShape(), Circle(20, 20, 12)))
+        self.assertTrue(Collisions.overlaps(self.lShape(), Rect(2, 2, 2, 2)))
+    def test_shape_handlers(self):
+        calls = []
+        a, b, far = Rect(0, 0, 10, 10), Circle(12, 5, 4), Rect(100, 100, 10, 10)
+        App.onCollision(a, b, lambda *pair : calls.append(pair))
+        App.onCollision(a, far, lambda *pair : calls.append(pair))
+        self.frame.step()
+        self.assertEqual(calls, [(a, b)])
+        b.visible = False
+        self.frame.step()
+        self.assertEqual(len(calls), 1)
+        b.visible = True
+        b.remove()
+        self.frame.step()
+        self.assertEqual(len(calls), 1)
+    def test_groups_and_masks(self):
+        calls = []
+        player = Rect(0, 0, 10, 10)
+        player.collisionGroup = 'player'
+        coin = Circle(5, 5, 2)
+        coin.collisionGroup = 'coins'
+        wall = Rect(5, 0, 10, 10)
+        wall.collisionGroup = 'walls'
+        App.onCollision('player', 'coins', lambda a, b : calls.append((a, b)))
+        App.onCollision('walls', 'player', lambda a, b : calls.append((a, b)))
+        self.frame.step()
+        self.assertEqual(set(calls), {(player, coin), (wall, player)})
+        del calls[:]
+        player.collisionMask = ['coins']
+        self.assertEqual(player.collisionMask, ('coins',))
+        self.frame.step()
+        self.assertEqual(calls, [(player, coin)])
+
+class SpatialIndexTests(HeadlessTestCase):
+    def test_shapes_at_checks_exact_shape(self):
+        circle = Circle(50, 50, 10)
+        rect = Rect(40, 40, 20, 20)
+        self.assertEqual(App.shapesAt(50, 50), [circle, rect])
+        self.assertEqual(App.shapesAt(41, 41), [rect])
+        self.assertEqual(App.shapesAt(100, 100), [])
+    def test_shapes_at_finds_lines(self):
+        line = Line(0, 0, 100, 100, 4)
+        self.assertEqual(App.shapesAt(50, 51), [line])
+        self.assertEqual(App.shapesAt(50, 60), [])
+        self.assertEqual(App.shapesAt(101, 101), [line])
+        self.assertEqual(App.shapesAt(103, 103), [])
+    def test_moved_shapes_are_rebucketed(self):
+        rect = Rect(0, 0, 10, 10)
+        self.assertEqual(App.shapesAt(5, 5), [rect])
+        rect.startX = 300
+        self.assertEqual(App.shapesAt(5, 5), [])
+        self.assertEqual(App.shapesAt(305, 5), [rect])
+    def test_hidden_and_removed_shapes_are_skipped(self):
+        hidden = Rect(0, 0, 10, 10)
+        hidden.visible = False
+        removed = Rect(0, 0, 10, 10)
+        removed.remove()
+        self.assertEqual(App.shapesAt(5, 5), [])
+        self.assertEqual(App.shapesInRect(0, 0, 10, 10), [])
+    def test_oversized_shapes(self):
+        background = Rect(-5000, -5000, 20000, 20000)
+        self.assertEqual(App.shapesAt(123, 456), [background])
+        self.assertEqual(App.shapesInRect(-10, -10, 5, 5), [background])
+    def test_shapes_in_rect(self):
+        inside = Circle(20, 20, 5)
+        edge = Rect(48, 0, 10, 10)
+        Rect(100, 100, 10, 10)
+        self.assertEqual(App.shapesInRect(50, 50, -50, -50), [inside, edge])
+        self.assertEqual(App.shapesInRect(0, 0, 10, 10), [])
+
+class DrawSchedulerTests(HeadlessTestCase):
+    def test_destroyed_slots_are_reused(self):
+        drawer = lambda canvas : None
+        first = DrawScheduler.registerShape(drawer)
+        second = DrawScheduler.registerShape(drawer)
+        self.assertTrue(DrawScheduler.destroyShape(first))
+        third = DrawScheduler.registerShape(drawer)
+        self.assertEqual(third & DrawScheduler.SLOT_MASK, first & DrawScheduler.SLOT_MASK)
+        self.assertNotEqual(third, first)
+        self.assertEqual(DrawScheduler.count(), 2)
+        self.assertTrue(DrawScheduler.isAlive(second))
+        self.assertTrue(DrawScheduler.isAlive(third))
+    def test_stale_handles_are_ignored(self):
+        rect = Rect(0, 0, 10, 10)
+        stale = rect._handle
+        rect.remove()
+        replacement = Circle(0, 0, 5)
+        self.assertFalse(DrawScheduler.isAlive(stale))
+        self.assertFalse(DrawScheduler.destroyShape(stale))
+        self.assertIsNone(DrawScheduler.getOwner(stale))
+        self.assertIsNone(DrawScheduler.getDrawer(stale))
+        self.assertIs(DrawScheduler.getOwner(replacement._handle), replacement)
+        self.assertEqual(self.frame.step().frameCalls, 1)
+    def test_clean_frames_replay_the_last_frame(self):
+        Rect(0, 0, 10, 10)
+        self.frame.step()
+        cleanFrames = DrawScheduler.cleanFrames
+        self.assertEqual(self.frame.step().frameCalls, 1)
+        self.assertEqual(DrawScheduler.cleanFrames, cleanFrames + 1)
+    def test_unowned_drawers_run_every_frame(self):
+        calls = []
+        shapeID = DrawScheduler.registerShape(calls.append)
+        Rect(0, 0, 10, 10)
+        self.frame.step(3)
+        self.assertEqual(len(calls), 3)
+        DrawScheduler.destroyShape(shapeID)
+        self.frame.step()
+        cleanFrames = DrawScheduler.cleanFrames
+        self.frame.step()
+        self.assertEqual(DrawScheduler.cleanFrames, cleanFrames + 1)
+    def test_clear_while_drawing(self):
+        rect = Rect(0, 0, 10, 10)
+        rect.collisionGroup = 'walls'
+        DrawScheduler.registerShape(lambda canvas : DrawScheduler.clear())
+        self.frame.step()
+        self.assertEqual(DrawScheduler.count(), 0)
+        self.assertEqual(App.shapesAt(5, 5), [])
+        self.assertIsNone(rect.collisionGroup)
+
+class DrawOrderTests(unittest.TestCase):
+    def test_keys_stay_sorted_across_blocks(self):
+        order = DrawOrder()
+        keys = [(0, 0, sequence, sequence) for sequence in range(DrawOrder.BLOCK_SIZE * 5)]
+        shuffled = random.Random(1).sample(keys, len(keys))
+        for key in shuffled:
+            order.insert(key, key[2])
+        self.assertEqual(list(order.keys()), keys)
+        self.assertEqual([drawer for block in order.blocks() for drawer in block], list(range(len(keys))))
+        self.assertGreater(len(order.blocks()), 1)
+        for key in shuffled[::2]:
+            order.remove(key)
+        self.assertEqual(list(order.keys()), sorted(shuffled[1::2]))
+        self.assertEqual(len(order), len(keys) // 2)
+    def test_remove_missing_key(self):
+        order = DrawOrder()
+        with self.assertRaises(KeyError):
+            order.remove((0, 0, 1, 1))
+        order.insert((0, 0, 1, 1), None)
+        for key in ((0, 0, 0, 0), (0, 0, 2, 2), (5,)):
+            with self.assertRaises(KeyError):
+                order.remove(key)
+        self.assertEqual(len(order), 1)
+    def test_before_and_after(self):
+        order = DrawOrder()
+        for key in ((0, 0, 1, 1), (0, 5, 2, 2), (3, 0, 3, 3)):
+            order.insert(key, None)
+        self.assertEqual(order.before((0, math.inf)), (0, 5, 2, 2))
+        self.assertEqual(order.after((3,)), (3, 0, 3, 3))
+        self.assertIsNone(order.before((0,)))
+        self.assertIsNone(order.after((4,)))
+
+class LayerTests(HeadlessTestCase):
+    def setUp(self):
+        HeadlessTestCase.setUp(self)
+        if 'ui' not in DrawScheduler.getLayers():
+            App.addLayer('ui', 10)
+        self.frame.canvas.record = True
+    def tearDown(self):
+        self.frame.canvas.record = False
+        HeadlessTestCase.tearDown(self)
+    def assertDrawn(self, *fills):
+        self.assertEqual([args[3] for name, args in self.frame.step().commands], [Color.toCSS(fill) for fill in fills])
+    def test_shapes_draw_in_creation_order(self):
+        Rect(0, 0, 10, 10, fill='red')
+        Rect(0, 0, 10, 10, fill='blue')
+        self.assertDrawn('red', 'blue')
+    def test_layers_draw_in_front(self):
+        red = Rect(0, 0, 10, 10, fill='red')
+        blue = Rect(0, 0, 10, 10, fill='blue')
+        red.layer = 'ui'
+        blue.zIndex = 100
+        self.assertDrawn('blue', 'red')
+        self.assertEqual((red.layer, red.zIndex), ('ui', 0))
+        self.assertEqual(App.shapesAt(5, 5), [blue, red])
+    def test_z_index_and_to_front_or_back(self):
+        red = Rect(0, 0, 10, 10, fill='red')
+        blue = Rect(0, 0, 10, 10, fill='blue')
+        green = Rect(0, 0, 10, 10, fill='green')
+        red.zIndex = 1
+        self.assertDrawn('blue', 'green', 'red')
+        blue.toFront()
+        self.assertDrawn('green', 'red', 'blue')
+        self.assertEqual(blue.zIndex, 1)
+        red.toBack()
+        self.assertDrawn('red', 'green', 'blue')
+    def test_layer_names_and_orders_are_unique(self):
+        with self.assertRaises(ValueError):
+            App.addLayer('ui', 11)
+        with self.assertRaises(ValueError):
+            App.addLayer('other', 10)
+        self.assertEqual(DrawScheduler.getLayers()[-1], 'ui')
+
+class KeyTests(HeadlessTestCase):
+    def setUp(self):
+        HeadlessTestCase.setUp(self)
+        self.calls = []
+        self.handlers = []
+    def tearDown(self):
+        for function in self.handlers:
+            App.removeKeyHandler(function)
+        for key in list(App.heldKeys):
+            self.frame.keyUp(key)
+        self.frame.step()
+        HeadlessTestCase.tearDown(self)
+    def record(self, name):
+        function = lambda *key : self.calls.append((name,) + key)
+        self.handlers.append(function)
+        return function
+    def test_events_are_queued_until_the_next_frame(self):
+        a, b = App.KEY_MAP['a'], App.KEY_MAP['b']
+        App.onKeyDown(self.record('down'))
+        App.onKeyUp(self.record('up'), 'a')
+        self.frame.keyDown(a)
+        self.frame.keyDown(b)
+        self.frame.keyUp(a)
+        self.assertEqual(self.calls, [])
+        self.assertFalse(App.isKeyDown('a'))
+        self.frame.step()
+        self.assertEqual(self.calls, [('down', a), ('down', b), ('up', a)])
+        self.assertFalse(App.isKeyDown('a'))
+        self.assertTrue(App.isKeyDown('b'))
+        self.assertTrue(App.isKeyDown(b))
+    def test_held_keys_fire_every_frame(self):
+        App.whileKeyDown('left', self.record('left'))
+        App.whileKeyDown('right', self.record('right'))
+        self.frame.keyDown(App.KEY_MAP['left'])
+        for _ in range(3):
+            self.frame.step()
+        self.frame.keyUp(App.KEY_MAP['left'])
+        self.frame.step()
+        self.assertEqual(self.calls, [('left',)] * 3)
+        self.assertEqual(App.heldKeys, set())
+    def test_remove_key_handler(self):
+        down = self.record('down')
+        App.onKeyDown(down, 'a')
+        App.whileKeyDown('a', down)
+        App.removeKeyHandler(down)
+        self.frame.keyDown(App.KEY_MAP['a'])
+        self.frame.step()
+        self.assertEqual(self.calls, [])
+
+class CameraTests(HeadlessTestCase):
+    def setUp(self):
+        HeadlessTestCase.setUp(self)
+        self.viewport = DrawScheduler.getViewport()
+        DrawScheduler.setViewport(100, 100)
+        self.frame.canvas.record = True
+    def tearDown(self):
+        self.frame.canvas.record = False
+        App.setCamera(0, 0)
+        DrawScheduler.setViewport(*self.viewport)
+        App.onMouseClick(lambda pos : None)
+        HeadlessTestCase.tearDown(self)
+    def test_offscreen_shapes_are_culled(self):
+        Rect(10, 10, 10, 10, fill='red')
+        Rect(110, 10, 10, 10, fill='green')
+        Rect(200, 200, 10, 10, fill='blue')
+        Line(-100, 50, -50, 50, 2)
+        canvas = self.frame.step()
+        self.assertEqual(App.cullCounts(), {'drawn': 2, 'culled': 2})
+        self.assertEqual([args[3] for name, args in canvas.commands], [Color.toCSS('red'), Color.toCSS('green')])
+        DrawScheduler.culling = False
+        try:
+            App.setCamera(1, 0)
+            self.assertEqual(len(self.frame.step().commands), 4)
+        finally:
+            DrawScheduler.culling = True
+    def test_camera_shifts_drawing(self):
+        Rect(110, 60, 10, 10)
+        Circle(0, 0, 5)
+        App.setCamera(100, 50)
+        self.assertEqual(App.getCamera(), (100, 50))
+        canvas = self.frame.step()
+        self.assertEqual(App.cullCounts(), {'drawn': 1, 'culled': 1})
+        self.assertEqual(canvas.commands[0][1][0], [(10, 10), (20, 10), (20, 20), (10, 20)])
+    def test_clicks_use_world_coordinates(self):
+        clicks = []
+        App.onMouseClick(clicks.append)
+        App.setCamera(100, 50)
+        self.frame.click((10, 10))
+        self.assertEqual(clicks, [(110, 60)])
+
+class TextTests(HeadlessTestCase):
+    def setUp(self):
+        HeadlessTestCase.setUp(self)
+        self.measured = mock.patch.object(self.frame, 'get_canvas_textwidth', wraps=self.frame.get_canvas_textwidth)
+        self.textWidth = self.measured.start()
+    def tearDown(self):
+        self.measured.stop()
+        TextMetrics.estimateMisses = False
+        HeadlessTestCase.tearDown(self)
+    def test_widths_are_cached(self):
+        self.assertEqual(TextMetrics.measure('hello', 20), 55)
+        self.assertEqual(TextMetrics.measure('hello', 20), 55)
+        TextMetrics.measure('hello', 20, 'monospace')
+        self.assertEqual(self.textWidth.call_count, 2)
+    def test_oldest_widths_are_evicted(self):
+        with mock.patch.object(TextMetrics, 'CACHE_SIZE', 2):
+            for text in ('a', 'b', 'a', 'c', 'a', 'b'):
+                TextMetrics.measure(text, 10)
+        self.assertEqual(self.textWidth.call_count, 4)
+    def test_estimated_misses_measure_each_glyph_once(self):
+        TextMetrics.estimateMisses = True
+        self.assertEqual(TextMetrics.measure('abba', 10), 22)
+        self.assertEqual(TextMetrics.measure('baab', 20), 44)
+        self.assertEqual(self.textWidth.call_count, 2)
+    def test_multiline_layout(self):
+        text = Text('ab\nabcd', 100, 100, 10)
+        self.assertEqual(text.width, 22)
+        self.assertAlmostEqual(text.height, 22)
+        self.frame.canvas.record = True
+        try:
+            commands = self.frame.step().commands
+        finally:
+            self.frame.canvas.record = False
+        self.assertEqual([(args[0], args[1][0]) for name, args in commands], [('ab', 94.5), ('abcd', 89.0)])
+        calls = self.textWidth.call_count
+        text.text = 'ab\nabcd'
+        text.centerX = 0
+        self.assertEqual(self.textWidth.call_count, calls)
+        self.assertEqual(text.bounds, (-11.0, 89.0, 11.0, 111.0))
+
+class AreaTests(HeadlessTestCase):
+    def test_areas(self):
+        self.assertEqual(Rect(0, 0, 4, 5).area, 20)
+        self.assertAlmostEqual(Circle(0, 0, 2).area, 4 * math.pi)
+        self.assertEqual(Polygon((0, 0), (4, 0), (4, 5)).area, 10)
+
+class SlotsTests(HeadlessTestCase):
+    def shapes(self):
+        return [Rect(0, 0, 10, 10), Circle(0, 0, 5), Polygon((0, 0), (10, 0), (0, 10)), Line(0, 0, 10, 10, 2), Text('slots', 0, 0, 12),
+                RGB(1, 2, 3), RGBA(1, 2, 3, 0.5), HSLA(1, 2, 3, 0.5)]
+    def test_no_instance_dict(self):
+        for shape in self.shapes():
+            self.assertFalse(hasattr(shape, '__dict__'), type(shape).__name__)
+    def test_unknown_attributes_raise(self):
+        for shape in self.shapes():
+            with self.assertRaises(AttributeError):
+                shape.radiuss = 5
+    def test_memory_benchmark(self):
+        import CMURemakeBenchmark
+        result = CMURemakeBenchmark.memory('Rect', 200)
+        self.assertEqual((result['shape'], result['count']), ('Rect', 200))
+        self.assertGreater(result['bytesPerShape'], 0)
+        self.assertGreaterEqual(result['bytesPerShapeDrawn'], result['bytesPerShape'])
+
+class GeometryTests(HeadlessTestCase):
+    def test_set_updates_once(self):
+        rect = Rect(0, 0, 10, 10)
+        with mock.patch.object(SpatialIndex, 'touch', wraps=SpatialIndex.touch) as touch:
+            rect.set(startX=5, width=20, height=30)
+        self.assertEqual(touch.call_count, 1)
+        self.assertEqual((rect.startX, rect.startY, rect.width, rect.height), (5, 0, 20, 30))
+        self.assertEqual(rect.points, [(5, 0), (25, 0), (25, 30), (5, 30)])
+        self.assertEqual(App.shapesAt(20, 25), [rect])
+    def test_points_follow_changes(self):
+        rect = Rect(0, 0, 10, 10)
+        self.assertEqual(rect.points, [(0, 0), (10, 0), (10, 10), (0, 10)])
+        rect.move(5, -5)
+        self.assertEqual(rect.points, [(5, -5), (15, -5), (15, 5), (5, 5)])
+        rect.width = -20
+        self.assertEqual(rect.bounds, (-15, -5, 5, 5))
+        self.assertTrue(rect.contains(-10, 0))
+        self.assertFalse(rect.contains(10, 0))
+    def test_move_shifts_every_shape(self):
+        for shape in (Rect(0, 0, 10, 10), Circle(5, 5, 5), Line(0, 0, 10, 10, 2), Text('move', 5, 5, 12), Polygon((0, 0), (10, 0), (0, 10))):
+            minX, minY, maxX, maxY = shape.bounds
+            shape.move(100, 50)
+            for actual, expected in zip(shape.bounds, (minX + 100, minY + 50, maxX + 100, maxY + 50)):
+                self.assertAlmostEqual(actual, expected)
+            self.assertIn(shape, App.shapesAt((minX + maxX) / 2 + 100, (minY + maxY) / 2 + 50))
+
+class ShapeLifetimeTests(HeadlessTestCase):
+    def test_unreferenced_shape_is_drawn(self):
+        Rect(0, 0, 10, 10)
+        gc.collect()
+        self.assertEqual(self.frame.step().frameCalls, 1)
+    def test_remove_stops_drawing(self):
+        rect = Rect(0, 0, 10, 10)
+        rect.remove()
+        rect.remove()
+        self.assertFalse(rect.alive)
+        self.assertEqual(DrawScheduler.count(), 0)
+        self.assertEqual(self.frame.step().frameCalls, 0)
+        self.assertEqual(App.shapesAt(5, 5), [])
+    def test_weak_owners_are_collected(self):
+        DrawScheduler.weakOwners = True
+        try:
+            Rect(0, 0, 10, 10)
+            kept = Rect(0, 0, 10, 10)
+        finally:
+            DrawScheduler.weakOwners = False
+        gc.collect()
+        self.assertEqual(DrawScheduler.count(), 1)
+        self.assertEqual(App.shapesAt(5, 5), [kept])
+    def test_live_shape_report(self):
+        DrawScheduler.trackSites = True
+        try:
+            Rect(0, 0, 10, 10)
+            Rect(0, 0, 10, 10)
+        finally:
+            DrawScheduler.trackSites = False
+        Circle(0, 0, 5)
+        report = DrawScheduler.liveShapes()
+        self.assertEqual(report['Rect']['count'], 2)
+        self.assertEqual(sum(report['Rect']['sites'].values()), 2)
+        self.assertIn(__file__, next(iter(report['Rect']['sites'])))
+        self.assertEqual(report['Circle'], {'count': 1, 'sites': {}})
+    def test_leak_report(self):
+        App.trackAllocations()
+        try:
+            circles = [Circle(0, 0, 5) for _ in range(3)]
+            Rect(0, 0, 10, 10)
+            Rect(0, 0, 10, 10).remove()
+        finally:
+            App.trackAllocations(False)
+        DrawScheduler.weakOwners = True
+        try:
+            Line(0, 0, 10, 10, 2)
+        finally:
+            DrawScheduler.weakOwners = False
+        report = App.leakReport(top=1)
+        self.assertEqual(report['total'], 4)
+        self.assertEqual(list(report['types']), ['Circle', 'Rect'])
+        self.assertEqual(report['types']['Circle']['count'], 3)
+        self.assertEqual(len(report['types']['Circle']['sites']), 1)
+        self.assertEqual(report['types']['Circle']['sites'][0][1], 3)
+        self.assertEqual(report['types']['Rect']['count'], 1)
+        for circle in circles:
+            circle.remove()
+        self.assertEqual(App.leakReport()['total'], 1)
+    def test_unregistered_shape_can_be_collected(self):
+        Shape.__del__(Rect.__new__(Rect))
+
+class DisplayListTests(HeadlessTestCase):
+    def test_frozen_shapes_compile_once(self):
+        rects = [Rect(i * 20, 0, 10, 10) for i in range(3)]
+        frozen = App.freeze(rects)
+        self.assertEqual(len(frozen), 3)
+        self.assertEqual(self.frame.step().frameCalls, 3)
+        DrawScheduler.markDirty()
+        self.assertEqual(self.frame.step().frameCalls, 3)
+        self.assertEqual(frozen.compiles, 1)
+        rects[0].startX = 100
+        self.frame.step()
+        self.assertEqual(frozen.compiles, 2)
+    def test_shapes_can_only_be_frozen_once(self):
+        rect = Rect(0, 0, 10, 10)
+        App.freeze([rect])
+        with self.assertRaises(ValueError):
+            App.freeze([rect])
+    def test_release_draws_shapes_normally(self):
+        rect = Rect(0, 0, 10, 10)
+        frozen = App.freeze([rect, Rect(20, 0, 10, 10)])
+        frozen.discard(rect)
+        self.assertEqual(len(frozen), 1)
+        frozen.release()
+        self.assertEqual(DrawScheduler.count(), 2)
+        self.assertEqual(self.frame.step().frameCalls, 2)
+    def test_reorder_frozen_shape_alone_on_layer(self):
+        if 'frozenTop' not in DrawScheduler.getLayers():
+            App.addLayer('frozenTop', 50)
+        rect = Rect(0, 0, 10, 10)
+        frozen = App.freeze([rect])
+        rect.layer = 'frozenTop'
+        rect.toBack()
+        rect.toFront()
+        self.assertEqual((rect.layer, rect.zIndex), ('frozenTop', 0))
+        other = Rect(0, 0, 10, 10)
+        other.zIndex = 7
+        rect.toFront()
+        self.assertEqual(rect.zIndex, 0)
+        frozen.release()
+        self.assertEqual(App.shapesAt(5, 5), [other, rect])
+
+class ShapeArrayTests(HeadlessTestCase):
+    def test_circle_array(self):
+        circles = CircleArray(3, radius=5)
+        circles.x = [0, 20, 40]
+        circles.y = [0, 0, 10]
+        self.assertEqual(circles.bounds, (-5.0, -5.0, 45.0, 15.0))
+        self.assertEqual(circles.contains(21, 1), [1])
+        self.assertEqual(App.shapesAt(21, 1), [circles])
+        circles.setVisible(False, 1)
+        self.assertEqual(circles.contains(21, 1), [])
+        self.assertEqual(self.frame.step().frameCalls, 2)
+    def test_rect_array(self):
+        rects = RectArray(2, width=10, height=10)
+        rects.x = [0, 50]
+        rects.width = [10, -10]
+        self.assertEqual(rects.contains(45, 5), [1])
+        self.assertEqual(rects.bounds, (0.0, 0.0, 50.0, 10.0))
+        rects.move(100, [0, 5])
+        self.assertEqual(list(rects.x), [100.0, 150.0])
+        self.assertEqual(list(rects.y), [0.0, 5.0])
+        self.assertEqual(App.shapesAt(105, 5), [rects])
+    def test_fill_palette(self):
+        circles = CircleArray(3, fill='red')
+        circles.setFill('blue', [0, 2])
+        circles.setFill('red', 2)
+        self.assertEqual(circles.palette, ('red', 'blue'))
+        self.assertEqual(list(circles.fillIndex), [1, 0, 0])
+        self.frame.canvas.record = True
+        try:
+            self.assertEqual([args[4] for name, args in self.frame.step().commands], [Color.toCSS('blue'), Color.toCSS('red'), Color.toCSS('red')])
+        finally:
+            self.frame.canvas.record = False
+
+@unittest.skipIf(numpy is None, "ParallelStep requires NumPy")
+class ParallelStepTests(HeadlessTestCase):
+    def test_step_runs_kernel_over_every_partition(self):
+        shapes = CircleArray(10)
+        shapes.x = list(range(10))
+        with ParallelStep(shapes, drift, extra=('vx', 'headless'), workers=3) as parallel:
+            parallel.write['vx'][:] = 10
+            parallel.step(0.5)
+            self.assertEqual(parallel.write['headless'].tolist(), [1.0] * 10)
+        self.assertEqual(list(shapes.x), [x + 5.0 for x in range(10)])
+        shapes.x = [0] * 10
+        self.assertEqual(list(shapes.x), [0.0] * 10)
+    def test_environment_is_restored(self):
+        headless = os.environ.get('CMU_HEADLESS')
+        parallel = ParallelStep(CircleArray(2), drift, workers=1)
+        self.assertEqual(os.environ.get('CMU_HEADLESS'), headless)
+        parallel.close()
+        parallel.close()
+    def test_failed_start_frees_columns(self):
+        shapes = CircleArray(4)
+        shapes.x = [1, 2, 3, 4]
+        with self.assertRaises(AttributeError):
+            ParallelStep(shapes, drift, columns=('x', 'missing'), workers=1)
+        self.assertEqual(list(shapes.x), [1.0, 2.0, 3.0, 4.0])
+        self.assertNotIsInstance(shapes.x.base, memoryview)
+
+class ClockTestCase(HeadlessTestCase):
+    def setUp(self):
+        HeadlessTestCase.setUp(self)
+        self.now = 100.0
+        App.clock = lambda : self.now
+    def tearDown(self):
+        App.clock = time.perf_counter
+        App.onTick(None)
+        HeadlessTestCase.tearDown(self)
+
+class TickTests(ClockTestCase):
+    def test_fixed_rate_with_alpha(self):
+        ticks = []
+        App.onTick(ticks.append, 4)
+        self.frame.step()
+        self.assertEqual(ticks, [])
+        self.now += 0.125
+        self.frame.step()
+        self.assertEqual(ticks, [])
+        self.assertEqual(App.getTickAlpha(), 0.5)
+        self.now += 0.625
+        self.frame.step()
+        self.assertEqual(ticks, [0.25, 0.25, 0.25])
+        self.assertEqual(App.getTickAlpha(), 0)
+    def test_ticks_run_before_update(self):
+        calls = []
+        App.onTick(lambda dt : calls.append('tick'), 4)
+        App.onUpdate(lambda : calls.append('update'))
+        try:
+            self.frame.step()
+            self.now += 0.25
+            self.frame.step()
+        finally:
+            App.onUpdate(lambda : None)
+        self.assertEqual(calls, ['update', 'tick', 'update'])
+    def test_slow_frames_drop_ticks(self):
+        ticks = []
+        dropped = App.droppedTicks
+        App.onTick(ticks.append, 4)
+        self.frame.step()
+        self.now += 2.125
+        self.frame.step()
+        self.assertEqual(len(ticks), App.maxTicksPerFrame)
+        self.assertEqual(App.droppedTicks - dropped, 8 - App.maxTicksPerFrame)
+        self.assertEqual(App.getTickAlpha(), 0.5)
+
+class ReplayTests(ClockTestCase):
+    def test_replay_runs_the_recorded_ticks(self):
+        ticks = []
+        App.onTick(ticks.append, 60)
+        self.frame.step()
+        App.startRecording()
+        for _ in range(60):
+            self.now += 1 / 60
+            self.frame.step()
+        data = App.stopRecording()
+        recorded = len(ticks)
+        self.assertGreater(recorded, 50)
+        for _ in range(2):
+            del ticks[:]
+            InputLog.replay(data)
+            self.assertEqual(len(ticks), recorded)
+            self.assertIs(App.getFrame(), self.frame)
+        del ticks[:]
+        self.now += 1 / 60
+        self.frame.step()
+        self.assertEqual(len(ticks), 1)
+
+class TimerTests(ClockTestCase):
+    def test_after_zero_runs_next_frame(self):
+        calls = []
+        def again():
+            calls.append(self.now)
+            App.after(0, again)
+        App.after(0, again)
+        self.frame.step()
+        self.assertEqual(len(calls), 1)
+        self.now += 1 / 60
+        self.frame.step()
+        self.assertEqual(len(calls), 2)
+    def test_every_skips_missed_calls(self):
+        calls = []
+        App.every(10, lambda : calls.append(self.now))
+        self.now += 1
+        self.frame.step()
+        self.assertEqual(len(calls), 1)
+
+    def test_cancelled_timers_do_not_run(self):
+        calls = []
+        timer = App.after(10, lambda : calls.append('after'))
+        App.every(10, lambda : calls.append('every')).cancel()
+        self.assertEqual(TaskScheduler.count(), {'timers': 1, 'tasks': 0})
+        timer.cancel()
+        self.now += 1
+        self.frame.step()
+        self.assertEqual(calls, [])
+        self.assertEqual(TaskScheduler.count(), {'timers': 0, 'tasks': 0})
+    def test_tasks_take_turns_within_the_budget(self):
+        steps = []
+        def counter(name, count):
+            for i in range(count):
+                steps.append((name, i))
+                yield
+            return name
+        async def waiter():
+            steps.append(('waiter', 0))
+            await App.pause()
+            steps.append(('waiter', 1))
+            return 'waited'
+        budget = App.taskBudget
+        App.taskBudget = 0
+        try:
+            first = App.spawn(counter('first', 2))
+            second = App.spawn(waiter())
+            self.frame.step()
+            self.assertEqual(steps, [('first', 0)])
+            self.frame.step(3)
+        finally:
+            App.taskBudget = budget
+        self.assertEqual(steps, [('first', 0), ('waiter', 0), ('first', 1), ('waiter', 1)])
+        self.assertFalse(first.done)
+        self.frame.step()
+        self.assertEqual((first.done, first.result, second.done, second.result), (True, 'first', True, 'waited'))
+    def test_cancelled_task_stops(self):
+        steps = []
+        def forever():
+            while True:
+                steps.append(len(steps))
+                yield
+        task = App.spawn(forever())
+        self.frame.step()
+        ran = len(steps)
+        task.cancel()
+        self.frame.step(2)
+        self.assertEqual(len(steps), ran)
+        self.assertTrue(task.done)
+        self.assertIsNone(task.result)
+        self.assertEqual(TaskScheduler.count()['tasks'], 0)
+
+class TweenTests(ClockTestCase):
+    def tearDown(self):
+        Tweens.clear()
+        ClockTestCase.tearDown(self)
+    def test_batched_writes_move_shapes(self):
+        self.frame.step()
+        circle = Circle(0, 0, 5)
+        rect = Rect(0, 0, 10, 10)
+        App.animate(circle, 1000, centerX=200, centerY=100)
+        App.animate(rect, 1000, startX=300, startY=100)
+        self.now += 0.5
+        self.frame.step()
+        self.assertAlmostEqual(circle.centerX, 100, delta=1)
+        self.assertAlmostEqual(rect.startX, 150, delta=1)
+        self.assertEqual(rect.points[0], (rect.startX, rect.startY))
+        self.assertEqual(App.shapesAt(circle.centerX, circle.centerY), [circle])
+        self.assertEqual(App.shapesAt(rect.centerX, rect.centerY), [rect])
+        self.assertEqual(App.shapesAt(0, 0), [])
+    def test_each_shape_is_notified_once_per_step(self):
+        self.frame.step()
+        circle = Circle(0, 0, 5)
+        rect = Rect(0, 0, 10, 10)
+        App.animate(circle, 1000, centerX=200, centerY=100, radius=10)
+        App.animate(rect, 1000, startX=300, startY=100)
+        self.now += 0.5
+        with mock.patch.object(SpatialIndex, 'touch', wraps=SpatialIndex.touch) as touch:
+            self.frame.step()
+        self.assertEqual(sorted(call.args[0] for call in touch.call_args_list), sorted([circle._handle, rect._handle]))
+    def test_failed_write_releases_moves(self):
+        class Exploding:
+            def __getX(self):
+                return 0
+            def __setX(self, x):
+                raise ValueError(x)
+            x = property(__getX, __setX)
+        self.frame.step()
+        App.animate(Exploding(), 1000, x=10)
+        self.now += 0.5
+        with self.assertRaises(ValueError):
+            Tweens.step()
+        Tweens.clear()
+        circle = Circle(0, 0, 5)
+        with mock.patch.object(SpatialIndex, 'touch', wraps=SpatialIndex.touch) as touch:
+            circle.centerX = 100
+        self.assertEqual(touch.call_count, 1)
+        self.assertEqual(App.shapesAt(100, 0), [circle])
+
+if __name__ == '__main__':
+    unittest.main()